@@ -60,35 +60,55 @@ CREATE TABLE operations.production_run (
 );
 
 -- Table: Inspection_Event
-CREATE TABLE operations.inspection_event (
-    id SERIAL PRIMARY KEY,
-    lot_id BIGINT NOT NULL,
-    inspector_id INTEGER NOT NULL,
-    defect_type_id INTEGER, -- Links to defect_type.id (Surrogate Key)
-    inspection_timestamp TIMESTAMP NOT NULL,
-    qty_checked INTEGER NOT NULL DEFAULT 0,
-    qty_defects INTEGER NOT NULL DEFAULT 0,
-    disposition VARCHAR(50), 
-    notes TEXT,
-
-    -- Data Integrity Checks
-    CONSTRAINT chk_insp_defects_positive CHECK (qty_defects >= 0),
-    CONSTRAINT chk_insp_checked_positive CHECK (qty_checked >= 0),
-    CONSTRAINT chk_defects_lte_checked CHECK (qty_defects <= qty_checked),
-
-    -- FKs with Cascade
-    CONSTRAINT fk_insp_lot_id FOREIGN KEY (lot_id) 
-        REFERENCES operations.lot(id) 
-        ON DELETE CASCADE,
-        
-    CONSTRAINT fk_insp_inspector_id FOREIGN KEY (inspector_id) 
-        REFERENCES operations.inspector(id) 
-        ON DELETE CASCADE,
-        
-    CONSTRAINT fk_insp_defect_id FOREIGN KEY (defect_type_id) 
-        REFERENCES operations.defect_type(id) 
-        ON DELETE CASCADE
-);
+-- Optionally range-partitioned by month on inspection_timestamp: run the
+-- script with steelworks.partition_inspections = 'monthly' set in the same
+-- transaction (poetry run init-db --partitioned). Partitioned, the primary
+-- key must include the partition column, and rows outside every month
+-- partition land in inspection_event_default until
+-- operations.ensure_inspection_partitions (section 4c) creates their month.
+DO $$
+DECLARE
+    monthly BOOLEAN := COALESCE(current_setting('steelworks.partition_inspections', true), '') = 'monthly';
+BEGIN
+    EXECUTE '
+    CREATE TABLE operations.inspection_event (
+        id SERIAL,
+        lot_id BIGINT NOT NULL,
+        inspector_id INTEGER NOT NULL,
+        defect_type_id INTEGER,
+        inspection_timestamp TIMESTAMP NOT NULL,
+        qty_checked INTEGER NOT NULL DEFAULT 0,
+        qty_defects INTEGER NOT NULL DEFAULT 0,
+        disposition VARCHAR(50),
+        notes TEXT,
+
+        CONSTRAINT inspection_event_pkey PRIMARY KEY (id'
+            || CASE WHEN monthly THEN ', inspection_timestamp' ELSE '' END || '),
+
+        -- Data Integrity Checks
+        CONSTRAINT chk_insp_defects_positive CHECK (qty_defects >= 0),
+        CONSTRAINT chk_insp_checked_positive CHECK (qty_checked >= 0),
+        CONSTRAINT chk_defects_lte_checked CHECK (qty_defects <= qty_checked),
+
+        -- FKs with Cascade (defect_type_id links to defect_type.id, the surrogate key)
+        CONSTRAINT fk_insp_lot_id FOREIGN KEY (lot_id)
+            REFERENCES operations.lot(id)
+            ON DELETE CASCADE,
+
+        CONSTRAINT fk_insp_inspector_id FOREIGN KEY (inspector_id)
+            REFERENCES operations.inspector(id)
+            ON DELETE CASCADE,
+
+        CONSTRAINT fk_insp_defect_id FOREIGN KEY (defect_type_id)
+            REFERENCES operations.defect_type(id)
+            ON DELETE CASCADE
+    )' || CASE WHEN monthly THEN ' PARTITION BY RANGE (inspection_timestamp)' ELSE '' END;
+
+    IF monthly THEN
+        CREATE TABLE operations.inspection_event_default PARTITION OF operations.inspection_event DEFAULT;
+    END IF;
+END;
+$$;
 
 -- Table: Shipment
 CREATE TABLE operations.shipment (
@@ -114,45 +134,416 @@ CREATE INDEX idx_prod_lot_id ON operations.production_run(lot_id);
 CREATE INDEX idx_insp_lot_id ON operations.inspection_event(lot_id);
 CREATE INDEX idx_ship_lot_id ON operations.shipment(lot_id);
 CREATE INDEX idx_insp_date ON operations.inspection_event(inspection_timestamp);
+-- Defect occurrences only (the AC3 filter every analysis query applies),
+-- in per-defect timestamp order. Partial, so zero-defect inspections (the
+-- majority of rows) cost nothing here; INCLUDE makes the rollup recompute
+-- and db.fetch_lot_impact index-only. Backs per-defect drill-down and paging.
+CREATE INDEX idx_insp_defect_occ ON operations.inspection_event(defect_type_id, inspection_timestamp)
+    INCLUDE (lot_id, qty_defects)
+    WHERE qty_defects > 0;
+-- Defect occurrences in a date window across all codes (filtered views and
+-- reports), again skipping zero-defect inspections.
+CREATE INDEX idx_insp_occ_ts ON operations.inspection_event(inspection_timestamp) WHERE qty_defects > 0;
+-- Support filtered classification (db.DefectFilters): each dimension
+-- narrows to lots or inspectors first, then joins inspections by key.
+CREATE INDEX idx_lot_part_number ON operations.lot(part_number);
+CREATE INDEX idx_prod_line_lot ON operations.production_run(line_id, lot_id);
+CREATE INDEX idx_prod_shift_lot ON operations.production_run(shift, lot_id);
+CREATE INDEX idx_insp_inspector_ts ON operations.inspection_event(inspector_id, inspection_timestamp);
+-- Natural keys let the bulk loader (loader.py) upsert re-delivered exports.
+CREATE UNIQUE INDEX uq_insp_natural_key
+    ON operations.inspection_event(lot_id, inspector_id, inspection_timestamp, (COALESCE(defect_type_id, 0)));
+CREATE UNIQUE INDEX uq_ship_natural_key
+    ON operations.shipment(lot_id, (COALESCE(sales_order, '')), (COALESCE(bol_number, '')));
 
 -- ==========================================
--- 5. User Story Implementation (View)
+-- 4b. Weekly Defect Rollup (trigger-maintained)
 -- ==========================================
 
-CREATE OR REPLACE VIEW operations.vw_recurring_defect_analysis AS
-WITH DefectStats AS (
-    SELECT 
-        dt.defect_id, -- Updated from defect_code
+-- W-MON week bucket (Tuesday..Monday) of a timestamp, matching pandas
+-- to_period("W-MON") and analysis._week_ordinals.
+CREATE FUNCTION operations.defect_week_start(ts TIMESTAMP) RETURNS DATE
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    AS $$ SELECT (date_trunc('week', ts - INTERVAL '1 day') + INTERVAL '1 day')::date $$;
+
+-- One row per (defect type, week, lot) with defect occurrences
+-- (qty_defects > 0). Consumed by analysis-side rollup classification
+-- (rollup.classify_rollup) in place of raw inspection events.
+CREATE TABLE operations.defect_week_rollup (
+    defect_type_id INTEGER NOT NULL,
+    week_start DATE NOT NULL,
+    lot_id BIGINT NOT NULL,
+    qty_defects BIGINT NOT NULL,
+    event_count INTEGER NOT NULL,
+    first_detected TIMESTAMP NOT NULL,
+    last_detected TIMESTAMP NOT NULL,
+
+    CONSTRAINT pk_defect_week_rollup PRIMARY KEY (defect_type_id, week_start, lot_id),
+    CONSTRAINT fk_rollup_defect_id FOREIGN KEY (defect_type_id)
+        REFERENCES operations.defect_type(id)
+        ON DELETE CASCADE,
+    CONSTRAINT fk_rollup_lot_id FOREIGN KEY (lot_id)
+        REFERENCES operations.lot(id)
+        ON DELETE CASCADE
+);
+
+-- Recompute the given rollup cells from inspection_event. Recomputing
+-- (rather than adding deltas) keeps first/last_detected exact under updates
+-- and deletes, and is idempotent.
+CREATE FUNCTION operations.recompute_defect_week_rollup(defect_type_ids INTEGER[], week_starts DATE[], lot_ids BIGINT[])
+    RETURNS VOID LANGUAGE sql
+    AS $$
+    DELETE FROM operations.defect_week_rollup r
+    USING unnest(defect_type_ids, week_starts, lot_ids) AS c(defect_type_id, week_start, lot_id)
+    WHERE r.defect_type_id = c.defect_type_id AND r.week_start = c.week_start AND r.lot_id = c.lot_id;
+
+    INSERT INTO operations.defect_week_rollup
+        (defect_type_id, week_start, lot_id, qty_defects, event_count, first_detected, last_detected)
+    SELECT
+        ie.defect_type_id,
+        c.week_start,
+        ie.lot_id,
+        SUM(ie.qty_defects),
+        COUNT(*),
+        MIN(ie.inspection_timestamp),
+        MAX(ie.inspection_timestamp)
+    FROM (SELECT DISTINCT * FROM unnest(defect_type_ids, week_starts, lot_ids)) AS c(defect_type_id, week_start, lot_id)
+    JOIN operations.inspection_event ie
+        ON ie.lot_id = c.lot_id
+        AND ie.defect_type_id = c.defect_type_id
+        AND ie.inspection_timestamp >= c.week_start
+        AND ie.inspection_timestamp < c.week_start + 7
+    WHERE ie.qty_defects > 0
+    GROUP BY ie.defect_type_id, c.week_start, ie.lot_id;
+    $$;
+
+-- Statement-level triggers see every changed row once through transition
+-- tables, so a bulk upsert recomputes each touched cell once rather than
+-- once per row. Postgres allows one event per transition-table trigger,
+-- hence one function per operation.
+CREATE FUNCTION operations.rollup_after_insert() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM operations.recompute_defect_week_rollup(
+        array_agg(defect_type_id), array_agg(week_start), array_agg(lot_id))
+    FROM (
+        SELECT DISTINCT defect_type_id, operations.defect_week_start(inspection_timestamp) AS week_start, lot_id
+        FROM new_rows WHERE defect_type_id IS NOT NULL AND qty_defects > 0
+    ) cells
+    HAVING COUNT(*) > 0;
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION operations.rollup_after_update() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM operations.recompute_defect_week_rollup(
+        array_agg(defect_type_id), array_agg(week_start), array_agg(lot_id))
+    FROM (
+        SELECT defect_type_id, operations.defect_week_start(inspection_timestamp) AS week_start, lot_id
+        FROM new_rows WHERE defect_type_id IS NOT NULL AND qty_defects > 0
+        UNION
+        SELECT defect_type_id, operations.defect_week_start(inspection_timestamp), lot_id
+        FROM old_rows WHERE defect_type_id IS NOT NULL AND qty_defects > 0
+    ) cells
+    HAVING COUNT(*) > 0;
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION operations.rollup_after_delete() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM operations.recompute_defect_week_rollup(
+        array_agg(defect_type_id), array_agg(week_start), array_agg(lot_id))
+    FROM (
+        SELECT DISTINCT defect_type_id, operations.defect_week_start(inspection_timestamp) AS week_start, lot_id
+        FROM old_rows WHERE defect_type_id IS NOT NULL AND qty_defects > 0
+    ) cells
+    HAVING COUNT(*) > 0;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_rollup_insert AFTER INSERT ON operations.inspection_event
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION operations.rollup_after_insert();
+CREATE TRIGGER trg_rollup_update AFTER UPDATE ON operations.inspection_event
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION operations.rollup_after_update();
+CREATE TRIGGER trg_rollup_delete AFTER DELETE ON operations.inspection_event
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION operations.rollup_after_delete();
+
+-- ==========================================
+-- 4c. Monthly Inspection Partitions (optional, see Inspection_Event)
+-- ==========================================
+
+-- Create the month partitions covering [first_ts, last_ts]; returns how many
+-- were created. Rows already in the default partition for a new month are
+-- moved into it first (ATTACH would fail otherwise); deleting from the
+-- partition directly does not fire the rollup triggers, which is correct
+-- because the rows only move. A no-op when inspection_event is not
+-- partitioned, so the bulk loader can call it unconditionally.
+CREATE FUNCTION operations.ensure_inspection_partitions(first_ts TIMESTAMP, last_ts TIMESTAMP)
+    RETURNS INTEGER LANGUAGE plpgsql AS $$
+DECLARE
+    month_start TIMESTAMP;
+    month_end TIMESTAMP;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    IF first_ts IS NULL OR last_ts IS NULL
+        OR (SELECT relkind FROM pg_class WHERE oid = 'operations.inspection_event'::regclass) <> 'p' THEN
+        RETURN 0;
+    END IF;
+    FOR month_start IN
+        SELECT generate_series(date_trunc('month', first_ts), date_trunc('month', last_ts), INTERVAL '1 month')
+    LOOP
+        partition_name := 'inspection_event_' || to_char(month_start, 'YYYY_MM');
+        CONTINUE WHEN to_regclass('operations.' || partition_name) IS NOT NULL;
+        month_end := month_start + INTERVAL '1 month';
+        EXECUTE 'CREATE TABLE operations.' || partition_name
+            || ' (LIKE operations.inspection_event INCLUDING DEFAULTS INCLUDING CONSTRAINTS)';
+        EXECUTE 'WITH moved AS (DELETE FROM operations.inspection_event_default'
+            || ' WHERE inspection_timestamp >= $1 AND inspection_timestamp < $2 RETURNING *)'
+            || ' INSERT INTO operations.' || partition_name || ' SELECT * FROM moved'
+            USING month_start, month_end;
+        EXECUTE 'ALTER TABLE operations.inspection_event ATTACH PARTITION operations.' || partition_name
+            || ' FOR VALUES FROM (' || quote_literal(month_start) || ') TO (' || quote_literal(month_end) || ')';
+        created := created + 1;
+    END LOOP;
+    RETURN created;
+END;
+$$;
+
+-- ==========================================
+-- 4d. Data Version (change notification)
+-- ==========================================
+
+-- Single-row counter bumped by every write statement on the tables the
+-- dashboard reads (db.get_data_version). Each bump also sends NOTIFY on
+-- channel steelworks_data_version with the new version as payload;
+-- notifications are delivered on commit, so listeners never see versions of
+-- rolled-back loads. Updating one row serializes concurrent writers until
+-- commit, which is fine for batch loads.
+--
+-- rewrite_version moves only when rows already stored change (updated
+-- values, deletes, truncates), not on appends. Incremental readers keyed on
+-- an inspection_event.id watermark (the incremental summary, the Parquet
+-- snapshot) rebuild when it moves (db.get_rewrite_version).
+CREATE TABLE operations.data_version (
+    singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+    version BIGINT NOT NULL,
+    rewrite_version BIGINT NOT NULL DEFAULT 0,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+INSERT INTO operations.data_version (version) VALUES (0);
+
+-- Bump the version and notify. Also called directly by writes that fire no
+-- trigger, such as the materialized view refresh (db.refresh_defect_summary).
+CREATE FUNCTION operations.next_data_version() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    new_version BIGINT;
+BEGIN
+    UPDATE operations.data_version
+    SET version = version + 1, changed_at = now()
+    RETURNING version INTO new_version;
+    PERFORM pg_notify('steelworks_data_version', new_version::text);
+    RETURN new_version;
+END;
+$$;
+
+-- Statement-level, so a COPY-and-upsert load bumps once per statement rather
+-- than once per row. Direct DML on a partition (the row moves in
+-- ensure_inspection_partitions) does not fire the parent's trigger.
+CREATE FUNCTION operations.bump_data_version() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM operations.next_data_version();
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_data_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON operations.inspection_event
+    FOR EACH STATEMENT EXECUTE FUNCTION operations.bump_data_version();
+CREATE TRIGGER trg_data_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON operations.lot
+    FOR EACH STATEMENT EXECUTE FUNCTION operations.bump_data_version();
+CREATE TRIGGER trg_data_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON operations.production_run
+    FOR EACH STATEMENT EXECUTE FUNCTION operations.bump_data_version();
+CREATE TRIGGER trg_data_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON operations.shipment
+    FOR EACH STATEMENT EXECUTE FUNCTION operations.bump_data_version();
+CREATE TRIGGER trg_data_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON operations.defect_type
+    FOR EACH STATEMENT EXECUTE FUNCTION operations.bump_data_version();
+CREATE TRIGGER trg_data_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON operations.inspector
+    FOR EACH STATEMENT EXECUTE FUNCTION operations.bump_data_version();
+
+-- ON CONFLICT DO UPDATE fires the UPDATE trigger for every upsert statement,
+-- and re-delivered exports rewrite rows with identical values, so UPDATE
+-- counts only rows whose values changed (EXCEPT compares NULLs as equal).
+-- A production run inserted for a lot that already has inspections changes
+-- their line and shift, so it counts too.
+CREATE FUNCTION operations.bump_rewrite_version() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF NOT EXISTS (SELECT * FROM old_rows EXCEPT SELECT * FROM new_rows) THEN
+            RETURN NULL;
+        END IF;
+    ELSIF TG_OP = 'DELETE' THEN
+        IF NOT EXISTS (SELECT 1 FROM old_rows) THEN
+            RETURN NULL;
+        END IF;
+    ELSIF TG_OP = 'INSERT' THEN
+        IF NOT EXISTS (
+            SELECT 1 FROM new_rows n JOIN operations.inspection_event ie ON ie.lot_id = n.lot_id
+        ) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    UPDATE operations.data_version SET rewrite_version = rewrite_version + 1;
+    RETURN NULL;
+END;
+$$;
+
+-- The tables behind db.fetch_inspection_events. Transition tables allow one
+-- event per trigger, hence three triggers per table.
+DO $$
+DECLARE
+    target TEXT;
+BEGIN
+    FOREACH target IN ARRAY ARRAY['inspection_event', 'lot', 'inspector', 'defect_type', 'production_run'] LOOP
+        EXECUTE format(
+            'CREATE TRIGGER trg_rewrite_update AFTER UPDATE ON operations.%I
+                REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION operations.bump_rewrite_version()', target);
+        EXECUTE format(
+            'CREATE TRIGGER trg_rewrite_delete AFTER DELETE ON operations.%I
+                REFERENCING OLD TABLE AS old_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION operations.bump_rewrite_version()', target);
+        EXECUTE format(
+            'CREATE TRIGGER trg_rewrite_truncate AFTER TRUNCATE ON operations.%I
+                FOR EACH STATEMENT EXECUTE FUNCTION operations.bump_rewrite_version()', target);
+    END LOOP;
+END;
+$$;
+
+CREATE TRIGGER trg_rewrite_insert AFTER INSERT ON operations.production_run
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION operations.bump_rewrite_version();
+
+-- ==========================================
+-- 5. User Story Implementation (Materialized View + View)
+-- ==========================================
+
+-- Materialized per-defect aggregates consumed by the dashboard list view.
+-- Week buckets match pandas "W-MON" periods (Tuesday..Monday): shifting back
+-- one day moves date_trunc's Monday boundary onto Tuesday.
+-- Refresh after loads with: poetry run refresh-summary
+CREATE MATERIALIZED VIEW operations.mv_defect_summary AS
+WITH DefectEvents AS (
+    SELECT
+        dt.defect_id,
         dt.severity,
-        COUNT(DISTINCT ie.lot_id) AS impacted_lot_count,
-        MIN(ie.inspection_timestamp) AS first_detected,
-        MAX(ie.inspection_timestamp) AS last_detected,
-        SUM(ie.qty_defects) AS total_defects,
-        EXTRACT(DAY FROM (MAX(ie.inspection_timestamp) - MIN(ie.inspection_timestamp))) AS days_span
-    FROM 
+        ie.lot_id,
+        ie.inspection_timestamp,
+        ie.qty_defects,
+        (date_trunc('week', ie.inspection_timestamp - INTERVAL '1 day') + INTERVAL '1 day')::date AS week_start
+    FROM
         operations.inspection_event ie
-    JOIN 
+    JOIN
         operations.defect_type dt ON ie.defect_type_id = dt.id
-    WHERE 
-        ie.qty_defects > 0 
-    GROUP BY 
-        dt.defect_id, dt.severity
+    WHERE
+        ie.qty_defects > 0
 )
-SELECT 
-    *,
-    CASE 
-        WHEN impacted_lot_count > 1 AND days_span >= 7 THEN 'Recurring - Critical'
-        WHEN impacted_lot_count > 1 AND days_span < 7 THEN 'Recurring - High Frequency'
+SELECT
+    defect_id,
+    severity,
+    COUNT(DISTINCT lot_id) AS impacted_lot_count,
+    COUNT(DISTINCT week_start) AS weeks_with_defects,
+    MIN(inspection_timestamp) AS first_detected,
+    MAX(inspection_timestamp) AS last_detected,
+    SUM(qty_defects) AS total_defects,
+    ARRAY_AGG(DISTINCT week_start ORDER BY week_start) AS week_starts
+FROM
+    DefectEvents
+GROUP BY
+    defect_id, severity
+WITH DATA;
+
+-- Unique index enables REFRESH MATERIALIZED VIEW CONCURRENTLY.
+CREATE UNIQUE INDEX uq_mv_defect_summary_defect_id ON operations.mv_defect_summary(defect_id);
+
+-- Classification mirrors analysis.classify_defects (AC1/AC2/AC4/AC9).
+CREATE OR REPLACE VIEW operations.vw_recurring_defect_analysis AS
+SELECT
+    defect_id,
+    severity,
+    impacted_lot_count,
+    weeks_with_defects,
+    first_detected,
+    last_detected,
+    total_defects,
+    EXTRACT(DAY FROM (last_detected - first_detected)) AS days_span,
+    CASE
+        WHEN impacted_lot_count >= 2 AND weeks_with_defects >= 2 AND severity = 'Critical' THEN 'Recurring - Critical'
+        WHEN impacted_lot_count >= 2 AND weeks_with_defects >= 2 THEN 'Recurring - High Frequency'
         WHEN impacted_lot_count = 1 THEN 'Isolated Incident'
-        ELSE 'Insufficient Data' 
+        ELSE 'Insufficient Data'
     END AS trend_classification
-FROM 
-    DefectStats
+FROM
+    operations.mv_defect_summary
 WHERE
-    impacted_lot_count > 1 
-ORDER BY 
+    impacted_lot_count > 1
+ORDER BY
+    CASE
+        WHEN impacted_lot_count >= 2 AND weeks_with_defects >= 2 AND severity = 'Critical' THEN 0
+        WHEN impacted_lot_count >= 2 AND weeks_with_defects >= 2 THEN 1
+        WHEN impacted_lot_count = 1 THEN 2
+        ELSE 3
+    END,
     impacted_lot_count DESC,
-    last_detected DESC;
+    last_detected DESC,
+    total_defects DESC;
+
+-- ==========================================
+-- 5b. Batch Report Results (poetry run defect-report --format postgres)
+-- ==========================================
+
+-- One row per headless report run; summary and drill-down rows reference it,
+-- so consumers read the latest run and old runs can be pruned by run_id.
+CREATE TABLE operations.defect_report_run (
+    run_id BIGSERIAL PRIMARY KEY,
+    generated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    window_start DATE,
+    window_end DATE,
+    event_rows BIGINT NOT NULL,
+    elapsed_seconds DOUBLE PRECISION NOT NULL
+);
+
+CREATE TABLE operations.defect_report_summary (
+    run_id BIGINT NOT NULL REFERENCES operations.defect_report_run(run_id) ON DELETE CASCADE,
+    defect_id VARCHAR(20) NOT NULL,
+    severity VARCHAR(20),
+    impacted_lot_count INTEGER NOT NULL,
+    weeks_with_defects INTEGER NOT NULL,
+    first_detected TIMESTAMP,
+    last_detected TIMESTAMP,
+    total_defects BIGINT NOT NULL,
+    days_span INTEGER NOT NULL,
+    trend_classification VARCHAR(50) NOT NULL,
+    missing_periods TEXT[] NOT NULL,
+    drill_down_message TEXT,
+    PRIMARY KEY (run_id, defect_id)
+);
+
+CREATE TABLE operations.defect_report_drill_down (
+    run_id BIGINT NOT NULL REFERENCES operations.defect_report_run(run_id) ON DELETE CASCADE,
+    event_id INTEGER NOT NULL,
+    defect_id VARCHAR(20) NOT NULL,
+    severity VARCHAR(20),
+    normalized_lot_id VARCHAR(50) NOT NULL,
+    inspection_timestamp TIMESTAMP NOT NULL,
+    qty_defects INTEGER NOT NULL,
+    PRIMARY KEY (run_id, event_id)
+);
 
 -- ==========================================
 -- 6. Reference Data Initialization
@@ -7,10 +7,16 @@ requiring a database or UI runtime.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable
+from typing import TYPE_CHECKING
 
+import numpy as np
 import pandas as pd
 
+from steelworks_defect.instrumentation import stage
+
+if TYPE_CHECKING:
+    from steelworks_defect.event_store import EventStore
+
 
 # Ranking used by default sorting (AC9).
 _STATUS_PRIORITY = {
@@ -20,6 +26,26 @@ _STATUS_PRIORITY = {
     "Insufficient Data": 3,
 }
 
+# Column order of the list-view summary returned by classify_defects (AC5).
+_SUMMARY_COLUMNS = [
+    "defect_id",
+    "severity",
+    "impacted_lot_count",
+    "weeks_with_defects",
+    "first_detected",
+    "last_detected",
+    "total_defects",
+    "days_span",
+    "trend_classification",
+    "missing_periods",
+]
+
+# Day number (days since 1970-01-01) of a Tuesday. pandas "W-MON" periods end
+# on Monday, so every week bucket starts on a Tuesday.
+_WEEK_ANCHOR_DAY = 5
+# Day number of a Monday, the anchor date pd.date_range(freq="W-MON") emits.
+_MONDAY_ANCHOR_DAY = 4
+
 
 @dataclass(frozen=True)
 class DefectDrillDownResult:
@@ -38,11 +64,68 @@ class DefectDrillDownResult:
     missing_weeks: list[str]
 
 
-def _normalize_analysis_frame(events: pd.DataFrame) -> pd.DataFrame:
-    """Return a normalized DataFrame with guaranteed required columns.
+@dataclass(frozen=True)
+class DefectExplanation:
+    """Precomputed drill-down explainability for one defect code.
 
-    Time complexity: O(n), where n is input row count.
-    Space complexity: O(n), because a copy is created for safe transformation.
+    Attributes:
+        missing_weeks: ISO-like year-week labels absent between min and max week.
+        distinct_lots: Lots with non-zero defects.
+        distinct_weeks: Weeks with non-zero defects.
+        message: Human-readable explanation, as returned by ``drill_down_defect``.
+        start: First row of the defect in ``DrillDownIndex.records``.
+        stop: One past its last row.
+
+    Space complexity: O(w), where w is missing weeks.
+    """
+
+    missing_weeks: list[str]
+    distinct_lots: int
+    distinct_weeks: int
+    message: str
+    start: int
+    stop: int
+
+
+@dataclass(frozen=True)
+class DrillDownIndex:
+    """Drill-down artifact emitted by ``classify_defects_explained``.
+
+    Attributes:
+        records: Normalized defect rows (qty_defects > 0), sorted by defect_id
+            and then in drill-down order, so each defect is one contiguous
+            slice. Treat as read-only.
+        explanations: Per-defect explainability and row range, by defect_id.
+
+    Space complexity: O(n + g + c), where n is defect rows, g defects and c
+    missing weeks.
+    """
+
+    records: pd.DataFrame
+    explanations: dict[str, DefectExplanation]
+
+    def drill_down(self, defect_id: str) -> DefectDrillDownResult:
+        """Return the same result as ``drill_down_defect`` without recomputing it.
+
+        Time complexity: O(1) lookup plus O(k + w) to slice k rows and copy w labels.
+        Space complexity: O(k + w).
+        """
+        explanation = self.explanations.get(defect_id)
+        if explanation is None:
+            return DefectDrillDownResult(
+                records=self.records.iloc[0:0], message=_empty_drill_down_message(defect_id), missing_weeks=[]
+            )
+        records = self.records.iloc[explanation.start : explanation.stop].reset_index(drop=True)
+        return DefectDrillDownResult(
+            records=records, message=explanation.message, missing_weeks=list(explanation.missing_weeks)
+        )
+
+
+def _require_analysis_columns(events: pd.DataFrame) -> None:
+    """Raise ValueError when required analysis columns are missing.
+
+    Time complexity: O(c), where c is column count.
+    Space complexity: O(1).
     """
     required_columns = {
         "defect_id",
@@ -56,6 +139,15 @@ def _normalize_analysis_frame(events: pd.DataFrame) -> pd.DataFrame:
         missing_str = ", ".join(sorted(missing_columns))
         raise ValueError(f"Input events are missing required columns: {missing_str}")
 
+
+def _normalize_analysis_frame(events: pd.DataFrame) -> pd.DataFrame:
+    """Return a normalized DataFrame with guaranteed required columns.
+
+    Time complexity: O(n), where n is input row count.
+    Space complexity: O(n), because a copy is created for safe transformation.
+    """
+    _require_analysis_columns(events)
+
     frame = events.copy()
     frame["inspection_timestamp"] = pd.to_datetime(frame["inspection_timestamp"], errors="coerce")
     frame["qty_defects"] = pd.to_numeric(frame["qty_defects"], errors="coerce").fillna(0).astype(int)
@@ -65,40 +157,170 @@ def _normalize_analysis_frame(events: pd.DataFrame) -> pd.DataFrame:
     return frame
 
 
-def _to_year_week_labels(weeks: Iterable[pd.Timestamp]) -> list[str]:
-    """Convert week timestamps to deterministic year-week string labels.
+def _week_ordinals(timestamps: pd.Series) -> pd.Series:
+    """Map timestamps to integer ``W-MON`` week ordinals.
 
-    Time complexity: O(w), where w is number of weeks.
-    Space complexity: O(w).
+    Ordinal 0 is the bucket starting Tuesday 1970-01-06; ``W-MON`` periods run
+    Tuesday through Monday, so this matches ``to_period("W-MON")`` exactly.
+    Null timestamps map to ``<NA>``.
+
+    Time complexity: O(n), where n is timestamp count.
+    Space complexity: O(n).
+    """
+    valid = timestamps.notna().to_numpy()
+    days = timestamps.to_numpy(dtype="datetime64[D]").astype(np.int64)
+    # Floor division keeps pre-1970 timestamps in the correct bucket.
+    ordinals = np.where(valid, (days - _WEEK_ANCHOR_DAY) // 7, 0)
+    return pd.Series(pd.arrays.IntegerArray(ordinals, ~valid), index=timestamps.index)
+
+
+def _day_numbers_to_week_labels(days: np.ndarray) -> np.ndarray:
+    """Convert day numbers (days since epoch) to ISO year-week string labels.
+
+    Each distinct day is formatted once and broadcast back to all positions.
+
+    Time complexity: O(m + u), where m is input size and u is distinct days.
+    Space complexity: O(m + u).
     """
-    labels: list[str] = []
-    for week_start in weeks:
-        iso = week_start.isocalendar()
-        labels.append(f"{iso.year}-W{iso.week:02d}")
-    return labels
+    if days.size == 0:
+        return np.array([], dtype=object)
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    iso = pd.DatetimeIndex(unique_days.astype("datetime64[D]")).isocalendar()
+    labels = (iso["year"].astype(str) + "-W" + iso["week"].astype(str).str.zfill(2)).to_numpy(dtype=object)
+    return labels[inverse]
+
+
+def _missing_weeks_by_group(group_codes: np.ndarray, week_ordinals: np.ndarray, group_count: int) -> list[list[str]]:
+    """Compute missing-week labels for every group in one columnar pass.
+
+    ``group_codes`` and ``week_ordinals`` are parallel arrays of observed
+    (group, week) pairs; duplicates are allowed. For each group, candidate weeks
+    are the ``W-MON`` anchor dates (Mondays) between the first and last observed
+    bucket start, minus any observed bucket start, matching the behavior of the
+    original per-group ``pd.date_range`` implementation.
+
+    Time complexity: O(p + c), where p is observed pairs and c is candidate
+    weeks summed across groups.
+    Space complexity: O(p + c).
+    """
+    if group_count == 0:
+        return []
+    if group_codes.size == 0:
+        return [[] for _ in range(group_count)]
+
+    codes = group_codes.astype(np.int64)
+    starts = week_ordinals.astype(np.int64) * 7 + _WEEK_ANCHOR_DAY
+
+    # Per-group first/last observed bucket start without a Python-level loop.
+    first = np.full(group_count, np.iinfo(np.int64).max, dtype=np.int64)
+    last = np.full(group_count, np.iinfo(np.int64).min, dtype=np.int64)
+    np.minimum.at(first, codes, starts)
+    np.maximum.at(last, codes, starts)
+    present = np.zeros(group_count, dtype=bool)
+    present[codes] = True
+
+    # Candidate anchors are every Monday in [first, last].
+    first_monday = np.where(present, first + (_MONDAY_ANCHOR_DAY - first) % 7, 0)
+    counts = np.where(present, np.maximum((last - first_monday) // 7 + 1, 0), 0)
+    candidate_group = np.repeat(np.arange(group_count, dtype=np.int64), counts)
+    group_offsets = np.cumsum(counts) - counts
+    position = np.arange(candidate_group.size, dtype=np.int64) - np.repeat(group_offsets, counts)
+    candidate_day = first_monday[candidate_group] + 7 * position
+
+    # Anti-join candidates against observed (group, bucket start) pairs using a
+    # packed integer key so the membership test is a single vectorized call.
+    base = int(min(starts.min(), candidate_day.min())) if candidate_day.size else int(starts.min())
+    span = int(max(starts.max(), candidate_day.max() if candidate_day.size else starts.max())) - base + 1
+    observed_key = codes * span + (starts - base)
+    candidate_key = candidate_group * span + (candidate_day - base)
+    keep = ~np.isin(candidate_key, observed_key)
+
+    labels = _day_numbers_to_week_labels(candidate_day[keep])
+    kept_counts = np.bincount(candidate_group[keep], minlength=group_count)
+    return [chunk.tolist() for chunk in np.split(labels, np.cumsum(kept_counts)[:-1])]
 
 
 def _compute_missing_weeks(timestamps: pd.Series) -> list[str]:
     """Find missing week buckets between first and last observation.
 
-    Time complexity: O(w) where w is number of weeks in the covered range.
-    Space complexity: O(w).
+    Time complexity: O(n + w), where n is timestamp count and w is number of
+    weeks in the covered range.
+    Space complexity: O(n + w).
     """
-    # Remove null timestamps because they cannot be assigned to a calendar week.
-    valid_ts = timestamps.dropna()
-    if valid_ts.empty:
+    # Null timestamps cannot be assigned to a calendar week.
+    ordinals = _week_ordinals(timestamps).dropna().to_numpy(dtype=np.int64)
+    if ordinals.size == 0:
         return []
+    return _missing_weeks_by_group(np.zeros(ordinals.size, dtype=np.int64), ordinals, 1)[0]
+
+
+def _empty_summary() -> pd.DataFrame:
+    """Return an empty summary frame with the stable list-view columns.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    return pd.DataFrame(columns=_SUMMARY_COLUMNS)
+
+
+def _classify_status(lots: np.ndarray, weeks: np.ndarray, undated: np.ndarray, critical: np.ndarray) -> np.ndarray:
+    """Apply the AC1/AC2/AC4 status rules to parallel aggregate arrays.
+
+    Shared by the all-time summary and the rolling timeline so both engines
+    classify identical evidence identically.
+
+    Time complexity: O(g), where g is array length.
+    Space complexity: O(g).
+    """
+    # AC1: recurring requires multi-lot and multi-week evidence.
+    recurring = (lots >= 2) & (weeks >= 2)
+
+    # np.select evaluates conditions in order, mirroring the original if/elif
+    # chain. AC4: multi-lot rows with sparse weeks fall through to the default.
+    return np.select(
+        [undated, recurring & critical, recurring, lots == 1],
+        ["Insufficient Data", "Recurring - Critical", "Recurring - High Frequency", "Isolated Incident"],
+        default="Insufficient Data",
+    )
+
+
+def _finalize_summary(grouped: pd.DataFrame, missing_periods: list[list[str]]) -> pd.DataFrame:
+    """Classify and sort per-defect aggregates into the list-view summary.
+
+    ``grouped`` holds one row per (defect_id, severity) with the aggregate
+    columns produced by ``classify_defects``; ``missing_periods`` is aligned to
+    its rows. Shared by every engine that produces those aggregates so the
+    classification rules live in one place.
+
+    Time complexity: O(g log g), where g is grouped row count.
+    Space complexity: O(g).
+    """
+    grouped = grouped.reset_index(drop=True)
+
+    # Days span helps distinguish long-running defects from short-lived spikes.
+    grouped["days_span"] = (grouped["last_detected"] - grouped["first_detected"]).dt.days
+
+    classification = _classify_status(
+        grouped["impacted_lot_count"].to_numpy(),
+        grouped["weeks_with_defects"].to_numpy(),
+        (grouped["first_detected"].isna() | grouped["last_detected"].isna()).to_numpy(),
+        grouped["severity"].eq("Critical").fillna(False).to_numpy(dtype=bool),
+    )
+    grouped["trend_classification"] = pd.Series(classification, index=grouped.index, dtype=object)
+    grouped["missing_periods"] = pd.Series(missing_periods, index=grouped.index, dtype=object)
+
+    # AC9: deterministic default sorting and prioritization.
+    grouped["_priority"] = grouped["trend_classification"].map(_STATUS_PRIORITY).fillna(99)
+    grouped = grouped.sort_values(
+        by=["_priority", "impacted_lot_count", "last_detected", "total_defects"],
+        ascending=[True, False, False, False],
+        kind="mergesort",
+    ).drop(columns=["_priority"])
 
-    # Normalize to week-start timestamps to compare periods consistently.
-    observed_weeks = pd.to_datetime(valid_ts.dt.to_period("W-MON").dt.start_time).drop_duplicates().sort_values()
-    # Build complete week range from first to last observed week.
-    all_weeks = pd.date_range(start=observed_weeks.iloc[0], end=observed_weeks.iloc[-1], freq="W-MON")
-    # Use set difference to identify gaps in temporal coverage.
-    missing = [week for week in all_weeks if week not in set(observed_weeks.tolist())]
-    return _to_year_week_labels(missing)
+    return grouped.reset_index(drop=True)
 
 
-def classify_defects(events: pd.DataFrame) -> pd.DataFrame:
+def classify_defects(events: pd.DataFrame | EventStore) -> pd.DataFrame:
     """Classify defects into recurring, isolated, or insufficient-data statuses.
 
     Acceptance criteria mapping:
@@ -109,93 +331,197 @@ def classify_defects(events: pd.DataFrame) -> pd.DataFrame:
       - AC5: output schema includes required list/table fields.
       - AC9: output is default-sorted with recurring defects prioritized.
 
-    Time complexity: O(n + g log g), where n is event count and g is number of
-    grouped defect buckets (sorting dominates on grouped output).
-    Space complexity: O(g).
+    The engine is fully columnar: timestamps become integer week ordinals, one
+    groupby yields every aggregate plus group codes, missing weeks are derived
+    for all groups at once, and classification uses ``np.select``. An
+    ``EventStore`` skips normalization and is read without copying.
+
+    Time complexity: O(n + c + g log g), where n is event count, c is weeks
+    spanned summed across groups, and g is number of grouped defect buckets.
+    Space complexity: O(n + c).
     """
-    frame = _normalize_analysis_frame(events)
+    return _classify(events)[0]
 
-    # AC3: Exclude non-defect rows from trend counting.
-    non_zero = frame[(frame["qty_defects"] > 0) & (frame["defect_id"].notna())]
 
-    # If no qualifying defects exist, return an empty frame with stable columns.
-    if non_zero.empty:
-        return pd.DataFrame(
-            columns=[
-                "defect_id",
-                "severity",
-                "impacted_lot_count",
-                "weeks_with_defects",
-                "first_detected",
-                "last_detected",
-                "total_defects",
-                "days_span",
-                "trend_classification",
-                "missing_periods",
-            ]
-        )
+def classify_defects_explained(events: pd.DataFrame | EventStore) -> tuple[pd.DataFrame, DrillDownIndex]:
+    """Classify like ``classify_defects`` and also return the drill-down index.
 
-    enriched = non_zero.copy()
-    # Store week-start buckets for multi-week logic in AC1.
-    enriched["week_start"] = pd.to_datetime(
-        enriched["inspection_timestamp"].dt.to_period("W-MON").dt.start_time,
-        errors="coerce",
-    )
+    The index reuses the run's lot/week counts and missing periods and adds
+    one defect-major sort of the defect rows, so every later drill-down is a
+    dictionary lookup plus a slice (``DrillDownIndex.drill_down``).
+
+    Time complexity: O(n log n + c + g log g).
+    Space complexity: O(n + c), for the sorted copy of the defect rows.
+    """
+    summary, enriched, grouped, missing_periods = _classify(events)
+    return summary, _build_drill_down_index(events, enriched, grouped, missing_periods)
+
+
+def _classify(
+    events: pd.DataFrame | EventStore,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame | None, list[list[str]] | None]:
+    """Shared body of ``classify_defects`` and ``classify_defects_explained``.
+
+    Returns the summary plus the intermediates the drill-down index reuses:
+    the defect rows with week ordinals, the unsorted per-group aggregates and
+    their missing periods (both None when there are no defect rows).
+
+    Time complexity: O(n + c + g log g).
+    Space complexity: O(n + c).
+    """
+    with stage("classify.normalize", rows=len(events)):
+        if isinstance(events, pd.DataFrame):
+            frame = _normalize_analysis_frame(events)
+            # AC3: Exclude non-defect rows from trend counting.
+            non_zero = frame[(frame["qty_defects"] > 0) & (frame["defect_id"].notna())]
+            # Integer week ordinals drive multi-week logic in AC1 and gap detection.
+            enriched = non_zero.assign(week_ordinal=_week_ordinals(non_zero["inspection_timestamp"]))
+        else:
+            # EventStore rows are already normalized with week ordinals attached.
+            frame = events.frame
+            enriched = frame[(frame["qty_defects"] > 0) & (frame["defect_id"].notna())]
 
-    grouped = (
-        enriched.groupby(["defect_id", "severity"], dropna=False)
-        .agg(
+    # If no qualifying defects exist, return an empty frame with stable columns.
+    if enriched.empty:
+        return _empty_summary(), enriched, None, None
+
+    with stage("classify.groupby", rows=len(enriched)) as timing:
+        # observed=True keeps categorical keys from expanding to every category pair.
+        groups = enriched.groupby(["defect_id", "severity"], dropna=False, observed=True)
+        grouped = groups.agg(
             impacted_lot_count=("normalized_lot_id", "nunique"),
-            weeks_with_defects=("week_start", "nunique"),
+            weeks_with_defects=("week_ordinal", "nunique"),
             first_detected=("inspection_timestamp", "min"),
             last_detected=("inspection_timestamp", "max"),
             total_defects=("qty_defects", "sum"),
+        ).reset_index()
+        grouped = grouped.astype({"defect_id": "string", "severity": "string", "total_defects": np.int64})
+        # ngroup() numbers rows in the same order as the aggregated output.
+        group_codes = groups.ngroup().to_numpy()
+        timing.rows = len(grouped)
+
+    with stage("classify.missing_weeks", rows=len(grouped)):
+        week_ordinals = enriched["week_ordinal"]
+        dated = week_ordinals.notna().to_numpy()
+        missing_periods = _missing_weeks_by_group(
+            group_codes[dated],
+            week_ordinals[dated].to_numpy(dtype=np.int64),
+            len(grouped),
         )
-        .reset_index()
-    )
 
-    # Days span helps distinguish long-running defects from short-lived spikes.
-    grouped["days_span"] = (grouped["last_detected"] - grouped["first_detected"]).dt.days
+    with stage("classify.finalize", rows=len(grouped)):
+        # _finalize_summary resets the index, leaving ``grouped`` itself unsorted.
+        return _finalize_summary(grouped, missing_periods), enriched, grouped, missing_periods
 
-    missing_periods_map: dict[tuple[str, str], list[str]] = {}
-    for (defect_id, severity), defect_events in enriched.groupby(["defect_id", "severity"], dropna=False):
-        missing_periods_map[(str(defect_id), str(severity))] = _compute_missing_weeks(defect_events["inspection_timestamp"])
 
-    def classify_row(row: pd.Series) -> str:
-        """Classify one grouped defect record.
+def _build_drill_down_index(
+    events: pd.DataFrame | EventStore,
+    enriched: pd.DataFrame,
+    grouped: pd.DataFrame | None = None,
+    missing_periods: list[list[str]] | None = None,
+) -> DrillDownIndex:
+    """Sort defect rows defect-major and attach per-defect explanations.
 
-        Time complexity: O(1).
-        Space complexity: O(1).
-        """
-        if pd.isna(row["first_detected"]) or pd.isna(row["last_detected"]):
-            return "Insufficient Data"
-        if row["impacted_lot_count"] >= 2 and row["weeks_with_defects"] >= 2:
-            if str(row["severity"]) == "Critical":
-                return "Recurring - Critical"
-            return "Recurring - High Frequency"
-        if row["impacted_lot_count"] == 1:
-            return "Isolated Incident"
-        return "Insufficient Data"
-
-    grouped["trend_classification"] = grouped.apply(classify_row, axis=1)
-    grouped["missing_periods"] = grouped.apply(
-        lambda row: missing_periods_map.get((str(row["defect_id"]), str(row["severity"])), []),
-        axis=1,
+    ``grouped`` and ``missing_periods`` are the classification aggregates;
+    they are reused when each defect_id has a single severity (one group per
+    defect) and recomputed per defect_id otherwise.
+
+    Time complexity: O(n log n + c).
+    Space complexity: O(n + c).
+    """
+    with stage("classify.drill_down_index", rows=len(enriched)):
+        # Within a defect this is drill_down_defect's order; the multi-key sort
+        # is stable, so ties keep input order there too.
+        ordered = enriched.sort_values(
+            by=["defect_id", "inspection_timestamp", "normalized_lot_id"], ascending=[True, False, True]
+        )
+        if isinstance(events, pd.DataFrame):
+            records = ordered.drop(columns=["week_ordinal"]).reset_index(drop=True)
+        else:
+            # Same shape and dtypes as drill_down_defect builds from select_defect.
+            records = _normalize_analysis_frame(events._restore(ordered))
+
+        # Sorted, so each defect's codes form one contiguous run.
+        codes, defect_ids = pd.factorize(ordered["defect_id"].astype("string"))
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if codes.size else codes
+        stops = np.r_[starts[1:], codes.size].astype(np.int64)
+
+        if grouped is not None and missing_periods is not None and grouped["defect_id"].is_unique:
+            position = pd.Index(grouped["defect_id"]).get_indexer(defect_ids)
+            lots = grouped["impacted_lot_count"].to_numpy()[position]
+            weeks = grouped["weeks_with_defects"].to_numpy()[position]
+            missing = [missing_periods[group] for group in position]
+        else:
+            counts = ordered.groupby(codes).agg(
+                lots=("normalized_lot_id", "nunique"), weeks=("week_ordinal", "nunique")
+            )
+            lots, weeks = counts["lots"].to_numpy(), counts["weeks"].to_numpy()
+            dated = ordered["week_ordinal"].notna().to_numpy()
+            missing = _missing_weeks_by_group(
+                codes[dated], ordered["week_ordinal"][dated].to_numpy(dtype=np.int64), len(defect_ids)
+            )
+
+        explanations = {
+            str(defect_id): DefectExplanation(
+                missing_weeks=missing[code],
+                distinct_lots=int(lots[code]),
+                distinct_weeks=int(weeks[code]),
+                message=_drill_down_message(int(lots[code]), int(weeks[code]), missing[code]),
+                start=int(starts[code]),
+                stop=int(stops[code]),
+            )
+            for code, defect_id in enumerate(defect_ids)
+        }
+    return DrillDownIndex(records=records, explanations=explanations)
+
+
+def classify_defect_summary(aggregates: pd.DataFrame) -> pd.DataFrame:
+    """Classify pre-aggregated per-defect rows from ``db.fetch_defect_summary``.
+
+    The SQL materialized view already computed lot/week counts, min/max and
+    sums, so this only derives missing periods from ``week_starts`` and applies
+    the same AC1-AC9 rules as ``classify_defects``.
+
+    Time complexity: O(g log g + c), where g is defect rows and c is weeks
+    spanned summed across defects.
+    Space complexity: O(g + c).
+    """
+    if aggregates.empty:
+        return _empty_summary()
+
+    # Match classify_defects' groupby key order so AC9 ties break identically.
+    ordered = aggregates.assign(
+        defect_id=aggregates["defect_id"].astype("string"),
+        severity=aggregates["severity"].astype("string"),
+    ).sort_values(by=["defect_id", "severity"], na_position="last", kind="mergesort")
+    ordered = ordered.reset_index(drop=True)
+
+    exploded = ordered["week_starts"].explode().dropna()
+    week_ordinals = _week_ordinals(pd.to_datetime(exploded)).to_numpy(dtype=np.int64)
+    missing_periods = _missing_weeks_by_group(exploded.index.to_numpy(dtype=np.int64), week_ordinals, len(ordered))
+
+    grouped = pd.DataFrame(
+        {
+            "defect_id": ordered["defect_id"],
+            "severity": ordered["severity"],
+            "impacted_lot_count": ordered["impacted_lot_count"].astype(np.int64),
+            "weeks_with_defects": ordered["weeks_with_defects"].astype(np.int64),
+            "first_detected": ordered["first_detected"],
+            "last_detected": ordered["last_detected"],
+            "total_defects": ordered["total_defects"].astype(np.int64),
+        }
     )
+    return _finalize_summary(grouped, missing_periods)
 
-    # AC4: Mark sparse temporal evidence as insufficient.
-    sparse_mask = (grouped["impacted_lot_count"] >= 2) & (grouped["weeks_with_defects"] < 2)
-    grouped.loc[sparse_mask, "trend_classification"] = "Insufficient Data"
 
-    # AC9: deterministic default sorting and prioritization.
-    grouped["_priority"] = grouped["trend_classification"].map(_STATUS_PRIORITY).fillna(99)
-    grouped = grouped.sort_values(
-        by=["_priority", "impacted_lot_count", "last_detected", "total_defects"],
-        ascending=[True, False, False, False],
-        kind="mergesort",
-    ).drop(columns=["_priority"])
+def recurring_mask(summary: pd.DataFrame) -> np.ndarray:
+    """Return a boolean array marking recurring rows (AC6).
 
-    return grouped.reset_index(drop=True)
+    Time complexity: O(g), where g is grouped row count.
+    Space complexity: O(g).
+    """
+    recurring_values = ["Recurring - Critical", "Recurring - High Frequency"]
+    return summary["trend_classification"].isin(recurring_values).to_numpy(dtype=bool)
 
 
 def filter_recurring_only(summary: pd.DataFrame) -> pd.DataFrame:
@@ -204,46 +530,113 @@ def filter_recurring_only(summary: pd.DataFrame) -> pd.DataFrame:
     Time complexity: O(g), where g is grouped row count.
     Space complexity: O(g) in the worst case.
     """
-    recurring_values = {"Recurring - Critical", "Recurring - High Frequency"}
-    return summary[summary["trend_classification"].isin(recurring_values)].reset_index(drop=True)
+    return summary[recurring_mask(summary)].reset_index(drop=True)
+
+
+@dataclass(frozen=True)
+class FramePage:
+    """One page of an already sorted frame.
+
+    Attributes:
+        rows: The page's rows (index reset).
+        page: Zero-based page number, clamped to the valid range.
+        page_size: Maximum rows per page.
+        total_rows: Rows across all pages.
+
+    Space complexity: O(page_size).
+    """
+
+    rows: pd.DataFrame
+    page: int
+    page_size: int
+    total_rows: int
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages (at least 1, so an empty result has one empty page).
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        return max(-(-self.total_rows // self.page_size), 1)
+
+
+def paginate_frame(frame: pd.DataFrame, page: int, page_size: int) -> FramePage:
+    """Slice page ``page`` (zero-based) from ``frame`` without reordering it.
+
+    Callers pass frames already in display order (e.g. the AC9-sorted
+    summary), so pages are stable across reruns. Out-of-range pages clamp to
+    the first or last page.
+
+    Time complexity: O(page_size).
+    Space complexity: O(page_size).
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    page_count = max(-(-len(frame) // page_size), 1)
+    page = min(max(page, 0), page_count - 1)
+    rows = frame.iloc[page * page_size : (page + 1) * page_size].reset_index(drop=True)
+    return FramePage(rows=rows, page=page, page_size=page_size, total_rows=len(frame))
 
 
-def drill_down_defect(events: pd.DataFrame, defect_id: str) -> DefectDrillDownResult:
+def drill_down_defect(events: pd.DataFrame | EventStore, defect_id: str) -> DefectDrillDownResult:
     """Return event-level details and explainability for one defect code.
 
     Acceptance criteria mapping:
       - AC7: returns detailed records for the selected defect code.
       - AC8: includes missing-period messaging when week coverage has gaps.
 
+    ``events`` may be the full history or only the defect's rows as returned by
+    ``db.fetch_defect_events``; only the selected rows are normalized, so the
+    full history is never copied. An ``EventStore`` matches on category codes.
+
     Time complexity: O(n + k log k), where n is all events and k is selected rows.
     Space complexity: O(k).
     """
-    frame = _normalize_analysis_frame(events)
-    # AC3 consistency: drill-down view reflects true defect occurrences only.
-    filtered = frame[(frame["qty_defects"] > 0) & (frame["defect_id"] == defect_id)].copy()
+    with stage("drill_down.select", rows=len(events)):
+        if isinstance(events, pd.DataFrame):
+            _require_analysis_columns(events)
+            selected = events[events["defect_id"].astype("string").eq(defect_id).fillna(False).to_numpy(dtype=bool)]
+        else:
+            selected = events.select_defect(defect_id)
+        frame = _normalize_analysis_frame(selected)
+        # AC3 consistency: drill-down view reflects true defect occurrences only.
+        filtered = frame[frame["qty_defects"] > 0]
 
     if filtered.empty:
-        empty_message = (
-            "Insufficient data: no defect events with qty_defects > 0 were found "
-            f"for defect code {defect_id}."
-        )
-        return DefectDrillDownResult(records=filtered, message=empty_message, missing_weeks=[])
+        return DefectDrillDownResult(records=filtered, message=_empty_drill_down_message(defect_id), missing_weeks=[])
 
     filtered = filtered.sort_values(by=["inspection_timestamp", "normalized_lot_id"], ascending=[False, True]).reset_index(drop=True)
-    missing_weeks = _compute_missing_weeks(filtered["inspection_timestamp"])
+    with stage("drill_down.missing_weeks", rows=len(filtered)):
+        missing_weeks = _compute_missing_weeks(filtered["inspection_timestamp"])
 
     distinct_lots = int(filtered["normalized_lot_id"].nunique())
-    distinct_weeks = int(filtered["inspection_timestamp"].dt.to_period("W-MON").nunique())
+    distinct_weeks = int(_week_ordinals(filtered["inspection_timestamp"]).nunique())
+    message = _drill_down_message(distinct_lots, distinct_weeks, missing_weeks)
+    return DefectDrillDownResult(records=filtered, message=message, missing_weeks=missing_weeks)
+
 
+def _empty_drill_down_message(defect_id: str) -> str:
+    """Return the drill-down message for a defect with no qualifying events.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    return f"Insufficient data: no defect events with qty_defects > 0 were found for defect code {defect_id}."
+
+
+def _drill_down_message(distinct_lots: int, distinct_weeks: int, missing_weeks: list[str]) -> str:
+    """Return the AC8 explanation for one defect's lot/week evidence.
+
+    Time complexity: O(w), where w is missing weeks.
+    Space complexity: O(w).
+    """
     if distinct_lots < 2 or distinct_weeks < 2:
-        message = (
+        return (
             "Insufficient data: recurring classification requires at least 2 lots "
             "and 2 weeks with non-zero defects."
         )
-    elif missing_weeks:
+    if missing_weeks:
         joined = ", ".join(missing_weeks)
-        message = f"Recurring signal detected with missing periods: {joined}."
-    else:
-        message = "Recurring signal detected with continuous weekly coverage in observed range."
-
-    return DefectDrillDownResult(records=filtered, message=message, missing_weeks=missing_weeks)
+        return f"Recurring signal detected with missing periods: {joined}."
+    return "Recurring signal detected with continuous weekly coverage in observed range."
@@ -6,11 +6,78 @@ Run with:
 
 from __future__ import annotations
 
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+import numpy as np
+import pandas as pd
 import streamlit as st
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from steelworks_defect.analysis import (
+    DefectDrillDownResult,
+    DrillDownIndex,
+    classify_defect_summary,
+    classify_defects_explained,
+    drill_down_defect,
+    filter_recurring_only,
+    paginate_frame,
+    recurring_mask,
+)
+from steelworks_defect.async_db import (
+    AsyncDataGateway,
+    fetch_defect_events_page_async,
+    fetch_defect_occurrences_async,
+    fetch_defect_summary_async,
+    fetch_defect_week_rollup_async,
+    fetch_filter_options_async,
+    fetch_filtered_defect_events_async,
+    fetch_lot_impact_async,
+)
+from steelworks_defect.cache import DashboardCache, get_shared_engine
+from steelworks_defect.config import (
+    get_async_db_enabled,
+    get_cache_max_entries,
+    get_cache_ttl_seconds,
+    get_data_version_source,
+    get_database_url,
+    get_db_max_overflow,
+    get_db_pool_size,
+    get_default_recurring_filter,
+    get_lot_count_error,
+    get_lot_count_mode,
+    get_page_size,
+    get_profile_mode,
+    get_recurrence_window_weeks,
+    get_snapshot_dir,
+    get_stream_chunk_size,
+    get_summary_source,
+)
+from steelworks_defect.db import (
+    DefectFilters,
+    EventCursor,
+    fetch_defect_events_page,
+    fetch_defect_occurrences,
+    fetch_defect_summary,
+    fetch_defect_week_rollup,
+    fetch_filter_options,
+    fetch_filtered_defect_events,
+    fetch_lot_impact,
+)
+from steelworks_defect.impact import summarize_exposure
+from steelworks_defect.incremental import DefectAggregateState
+from steelworks_defect.instrumentation import PerformanceRecorder, stage
+from steelworks_defect.notify import DataVersionListener, data_version_probe
+from steelworks_defect.rolling import rolling_recurrence, status_transitions
+from steelworks_defect.rollup import classify_rollup
+from steelworks_defect.sketch import classify_defects_approximate
+from steelworks_defect.snapshot import EventSnapshot
 
-from steelworks_defect.analysis import classify_defects, drill_down_defect, filter_recurring_only
-from steelworks_defect.config import get_database_url, get_default_recurring_filter
-from steelworks_defect.db import create_db_engine, fetch_inspection_events
+
+T = TypeVar("T")
 
 
 def _render_header() -> None:
@@ -26,54 +93,450 @@ def _render_header() -> None:
     )
 
 
-def _highlight_recurring(row: dict) -> list[str]:
-    """Apply visual highlighting for recurring defects (AC6).
+# AC6 highlight for recurring rows.
+_RECURRING_STYLE = "background-color: rgba(255, 215, 0, 0.25)"
+
+
+def _recurring_styles(page: pd.DataFrame) -> pd.DataFrame:
+    """Return per-cell CSS highlighting recurring rows (AC6), for ``Styler.apply(axis=None)``.
+
+    One vectorized mask per page replaces a Python call per row.
+
+    Time complexity: O(r * c) for r rows and c columns on the page.
+    Space complexity: O(r * c).
+    """
+    css = np.where(recurring_mask(page), _RECURRING_STYLE, "")
+    return pd.DataFrame(np.repeat(css[:, None], page.shape[1], axis=1), index=page.index, columns=page.columns)
+
+
+@st.cache_resource
+def _data_version_listener() -> DataVersionListener | None:
+    """Return the process-wide LISTEN thread when ``DATA_VERSION_SOURCE=notify``.
 
     Time complexity: O(1).
     Space complexity: O(1).
     """
-    classification = row.get("trend_classification", "")
-    if classification in {"Recurring - Critical", "Recurring - High Frequency"}:
-        return ["background-color: rgba(255, 215, 0, 0.25)"] * len(row)
-    return [""] * len(row)
+    if get_data_version_source() != "notify":
+        return None
+    return DataVersionListener(get_database_url()).start()
 
 
-def main() -> None:
-    """Entry point for dashboard execution.
+@st.cache_resource
+def _dashboard_cache() -> DashboardCache:
+    """Return the process-wide result cache shared by all sessions.
+
+    With a listener, results of older versions are dropped as soon as a load
+    commits instead of waiting for LRU/TTL eviction.
+
+    Time complexity: O(1).
+    Space complexity: O(max_entries).
+    """
+    listener = _data_version_listener()
+    cache = DashboardCache(
+        ttl_seconds=get_cache_ttl_seconds(),
+        max_entries=get_cache_max_entries(),
+        probe=data_version_probe(get_data_version_source(), listener),
+    )
+    if listener is not None:
+        listener.subscribe(lambda version: cache.clear())
+    return cache
+
+
+@st.cache_resource
+def _async_gateway() -> AsyncDataGateway:
+    """Return the process-wide async gateway (one pool and loop for all sessions).
+
+    Time complexity: O(1).
+    Space complexity: O(max_entries) plus the pool.
+    """
+    listener = _data_version_listener()
+    gateway = AsyncDataGateway(
+        get_database_url(),
+        pool_size=get_db_pool_size(),
+        max_overflow=get_db_max_overflow(),
+        ttl_seconds=get_cache_ttl_seconds(),
+        max_entries=get_cache_max_entries(),
+        data_version_source=get_data_version_source(),
+        listener=listener,
+    )
+    if listener is not None:
+        listener.subscribe(lambda version: gateway.clear())
+    return gateway
+
+
+def _load(
+    name: Hashable,
+    engine: Engine,
+    loader: Callable[[Engine], T],
+    async_loader: Callable[[AsyncEngine], Awaitable[T]] | None = None,
+) -> T:
+    """Load a cached result through the async gateway (``ASYNC_DB``) or the sync cache.
+
+    In async mode, concurrent sessions missing the same (name, data version)
+    share one in-flight query. Loaders without an async form (the
+    incremental fold) always use the sync cache.
+
+    Time complexity: O(1) on a hit plus the version probe; loader cost on a miss.
+    Space complexity: O(size of loaded result).
+    """
+    if async_loader is not None and get_async_db_enabled():
+        return _async_gateway().get_or_load(name, async_loader)
+    return _dashboard_cache().get_or_load(name, engine, loader)
+
+
+@st.cache_resource
+def _incremental_state() -> tuple[DefectAggregateState, threading.Lock]:
+    """Return the process-wide incremental state and the lock guarding it.
+
+    Time complexity: O(1).
+    Space complexity: O(g) for the held aggregates.
+    """
+    return DefectAggregateState(), threading.Lock()
+
 
-    Time complexity: O(n + g log g) dominated by classification in analysis.
-    Space complexity: O(n + g).
+def _load_incremental_summary(engine: Engine) -> pd.DataFrame:
+    """Fold newly loaded inspection rows into the shared state and summarize.
+
+    Only defect rows above the stored ``inspection_event.id`` watermark are
+    streamed, in bounded chunks, so loads after the first cost O(new rows)
+    and the first load never materializes the full history. Loads that
+    changed stored rows in place rebuild the state (``DefectAggregateState.sync``).
+    With ``SNAPSHOT_DIR`` set, a cold start seeds the state from the local
+    Parquet snapshot and Postgres serves only rows newer than the snapshot.
+
+    Time complexity: O(m + g log g), where m is new row count; O(n) after a rewrite.
+    Space complexity: O(chunk + g), or O(n) for the cold-start snapshot read.
+    """
+    state, lock = _incremental_state()
+    snapshot_dir = get_snapshot_dir()
+    snapshot = EventSnapshot(snapshot_dir) if snapshot_dir is not None else None
+    with lock:
+        state.sync(engine, chunksize=get_stream_chunk_size(), snapshot=snapshot)
+        return state.summary()
+
+
+def _load_materialized_summary(engine: Engine) -> pd.DataFrame:
+    """Classify pre-aggregated rows from the materialized defect summary.
+
+    Time complexity: O(g log g + c).
+    Space complexity: O(g + c).
+    """
+    return classify_defect_summary(fetch_defect_summary(engine))
+
+
+async def _load_materialized_summary_async(engine: AsyncEngine) -> pd.DataFrame:
+    """Async ``_load_materialized_summary``; classification runs off the event loop.
+
+    Time complexity: O(g log g + c).
+    Space complexity: O(g + c).
+    """
+    return await asyncio.to_thread(classify_defect_summary, await fetch_defect_summary_async(engine))
+
+
+def _classify_events(events: pd.DataFrame) -> tuple[pd.DataFrame, DrillDownIndex | None]:
+    """Classify events, counting lots exactly or with sketches per ``LOT_COUNT_MODE``.
+
+    Exact classification also returns the drill-down index, so drill-downs
+    under the same filters need no further query; approximate returns None.
+
+    Time complexity: O(n log n) exact; O(n + g * m) approximate.
+    Space complexity: O(n).
+    """
+    if get_lot_count_mode() == "approximate":
+        return classify_defects_approximate(events, relative_error=get_lot_count_error()), None
+    return classify_defects_explained(events)
+
+
+def _load_rollup_summary(engine: Engine) -> pd.DataFrame:
+    """Classify the trigger-maintained (defect, week, lot) rollup cells.
+
+    Time complexity: O(c + g log g), where c is rollup cells.
+    Space complexity: O(c).
+    """
+    return classify_rollup(fetch_defect_week_rollup(engine))
+
+
+async def _load_rollup_summary_async(engine: AsyncEngine) -> pd.DataFrame:
+    """Async ``_load_rollup_summary``; classification runs off the event loop.
+
+    Time complexity: O(c + g log g), where c is rollup cells.
+    Space complexity: O(c).
+    """
+    return await asyncio.to_thread(classify_rollup, await fetch_defect_week_rollup_async(engine))
+
+
+# Sidebar sentinel meaning "do not filter on this dimension".
+_ALL = "All"
+
+
+def _render_filters(options: dict[str, list[str]]) -> DefectFilters:
+    """Render sidebar filter controls and return the selected ``DefectFilters``.
+
+    Time complexity: O(d), where d is distinct option values.
+    Space complexity: O(d).
+    """
+    st.sidebar.subheader("Filters")
+    window = st.sidebar.date_input("Inspection window", value=())
+    # A range picker returns 0, 1 or 2 dates while the user is still choosing.
+    start = window[0] if len(window) >= 1 else None
+    end = window[1] if len(window) == 2 else None
+
+    def choose(label: str, key: str) -> str | None:
+        value = st.sidebar.selectbox(label, options=[_ALL, *options.get(key, [])])
+        return None if value == _ALL else value
+
+    return DefectFilters(
+        start=start,
+        end=end,
+        line_id=choose("Line", "line_id"),
+        part_number=choose("Part number", "part_number"),
+        shift=choose("Shift", "shift"),
+        inspector_name=choose("Inspector", "inspector_name"),
+    )
+
+
+def _load_lot_impact(engine: Engine, summary: pd.DataFrame, filters: DefectFilters) -> pd.DataFrame:
+    """Load affected lots, runs and shipments of every recurring defect in one query.
+
+    The list view's exposure table and the drill-down's lot table both
+    slice this one cached frame, so neither issues per-lot lookups.
+
+    Time complexity: O(k log n + a + s) on a miss (see ``db.fetch_lot_impact``).
+    Space complexity: O(a + s).
+    """
+    codes = tuple(sorted(summary.loc[recurring_mask(summary), "defect_id"].dropna().astype(str)))
+    filter_arg = None if filters.is_empty() else filters
+    with stage("load.lot_impact") as timing:
+        impact = _load(
+            ("lot_impact", codes, filters),
+            engine,
+            lambda connection_engine: fetch_lot_impact(connection_engine, list(codes), filter_arg),
+            lambda async_engine: fetch_lot_impact_async(async_engine, list(codes), filter_arg),
+        )
+        timing.rows = len(impact)
+    return impact
+
+
+def _render_event_pages(
+    engine: Engine,
+    defect_id: str,
+    filters: DefectFilters,
+    page_size: int,
+    total_rows: int,
+) -> None:
+    """Render one keyset page of the selected defect's events with prev/next controls.
+
+    The cursors of pages already visited are kept in session state, so
+    "Previous" returns to an exact page without OFFSET scans.
+
+    Time complexity: O(log n + page_size) per page fetch.
+    Space complexity: O(page_size + p), where p is pages visited.
+    """
+    state_key = f"event_cursors::{defect_id}::{filters}::{page_size}"
+    cursors: list[EventCursor | None] = st.session_state.setdefault(state_key, [None])
+    after = cursors[-1]
+    filter_arg = None if filters.is_empty() else filters
+
+    with stage("load.drill_down_page") as timing:
+        page, next_cursor = _load(
+            ("drill_down_page", defect_id, filters, page_size, after),
+            engine,
+            lambda connection_engine: fetch_defect_events_page(
+                connection_engine, defect_id, page_size=page_size, after=after, filters=filter_arg
+            ),
+            lambda async_engine: fetch_defect_events_page_async(
+                async_engine, defect_id, page_size=page_size, after=after, filters=filter_arg
+            ),
+        )
+        timing.rows = len(page)
+
+    st.caption(f"Page {len(cursors)} of {max(-(-total_rows // page_size), 1)} ({total_rows} defect events).")
+    st.dataframe(page, use_container_width=True, hide_index=True)
+
+    previous_column, next_column = st.columns(2)
+    if previous_column.button("Previous page", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    if next_column.button("Next page", disabled=next_cursor is None):
+        cursors.append(next_cursor)
+        st.rerun()
+
+
+def _render_dashboard() -> None:
+    """Render the list view and drill-down.
+
+    Results are cached per data version (and filter combination), so repeat
+    interactions cost one version probe (none with DATA_VERSION_SOURCE=notify);
+    a new load costs O(m + g log g + k log k), where m is newly loaded or
+    filtered rows and k is rows for the selected defect.
+    Space complexity: O(g + k) per cached entry.
     """
     _render_header()
 
-    # Build engine once per rerun; Streamlit reruns script on interaction.
-    database_url = get_database_url()
-    engine = create_db_engine(database_url)
+    # One engine and connection pool per process, not per Streamlit rerun.
+    engine = get_shared_engine(get_database_url())
+    cache = _dashboard_cache()
+
+    if st.sidebar.button("Refresh data"):
+        cache.clear()
+        _incremental_state.clear()
+        if get_async_db_enabled():
+            _async_gateway().clear()
+
+    with stage("load.filter_options"):
+        filter_options = _load(("filter_options",), engine, fetch_filter_options, fetch_filter_options_async)
+    filters = _render_filters(filter_options)
 
     # Close DB resources promptly after loading data by using helper function
     # that internally employs context-managed connections.
-    events = fetch_inspection_events(engine)
-    summary = classify_defects(events)
+    summary_source = get_summary_source()
+    # Only filtered views classify events here; other sources drill down by query.
+    drill_down_index: DrillDownIndex | None = None
+    with stage("load.summary") as timing:
+        if not filters.is_empty():
+            # Filtered views push predicates into SQL and classify only the slice.
+            async def load_filtered_async(async_engine: AsyncEngine) -> tuple[pd.DataFrame, DrillDownIndex | None]:
+                events = await fetch_filtered_defect_events_async(async_engine, filters)
+                return await asyncio.to_thread(_classify_events, events)
+
+            summary, drill_down_index = _load(
+                ("summary", filters),
+                engine,
+                lambda connection_engine: _classify_events(fetch_filtered_defect_events(connection_engine, filters)),
+                load_filtered_async,
+            )
+        elif summary_source == "materialized":
+            # List view reads O(g) pre-aggregated rows instead of every event.
+            summary = _load(
+                ("summary", summary_source), engine, _load_materialized_summary, _load_materialized_summary_async
+            )
+        elif summary_source == "rollup":
+            # Always current (trigger-maintained) and O(cells) rather than O(events).
+            summary = _load(("summary", summary_source), engine, _load_rollup_summary, _load_rollup_summary_async)
+        else:
+            summary = _load(("summary", summary_source), engine, _load_incremental_summary)
+        timing.rows = len(summary)
 
     # AC6: User control to filter recurring defects in list view.
     recurring_only = st.checkbox("Show recurring defects only", value=get_default_recurring_filter())
     visible = filter_recurring_only(summary) if recurring_only else summary
 
     st.subheader("Defect Trend List")
-    st.dataframe(
-        visible.style.apply(_highlight_recurring, axis=1),
-        use_container_width=True,
-        hide_index=True,
-    )
+    page_size = get_page_size()
+    page_count = paginate_frame(visible, 0, page_size).page_count
+    page_number = st.number_input("List page", min_value=1, max_value=page_count, value=1, step=1)
+    list_page = paginate_frame(visible, int(page_number) - 1, page_size)
+    st.caption(f"Page {list_page.page + 1} of {list_page.page_count} ({list_page.total_rows} defect rows).")
+    # Only one page is styled and shipped; the Styler runs during serialization.
+    with stage("render.summary_table", rows=len(list_page.rows)):
+        st.dataframe(
+            list_page.rows.style.apply(_recurring_styles, axis=None),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+    st.subheader("Shipment Exposure")
+    impact = _load_lot_impact(engine, summary, filters)
+    if impact.empty:
+        st.caption("No recurring defects affect any lot.")
+    else:
+        st.caption("Recurring defects: affected lots already shipped to customers versus still containable.")
+        st.dataframe(summarize_exposure(impact), use_container_width=True, hide_index=True)
 
     st.subheader("Drill-down by Defect Code")
     available_defects = sorted([value for value in summary["defect_id"].dropna().astype(str).unique().tolist()])
     selected_defect = st.selectbox("Defect code", options=available_defects)
 
     if selected_defect:
-        detail = drill_down_defect(events, selected_defect)
+        window_weeks = st.slider(
+            "Recurrence window (weeks)", min_value=1, max_value=52, value=min(get_recurrence_window_weeks(), 52)
+        )
+
+        filter_arg = None if filters.is_empty() else filters
+
+        def with_timeline(detail: DefectDrillDownResult) -> tuple[DefectDrillDownResult, pd.DataFrame]:
+            # The timeline reuses the drill-down rows, so it costs no extra query.
+            with stage("rolling_recurrence", rows=len(detail.records)):
+                timeline = rolling_recurrence(detail.records, window_weeks=window_weeks)
+            return detail, timeline
+
+        def load_detail(connection_engine: Engine) -> tuple[DefectDrillDownResult, pd.DataFrame]:
+            if drill_down_index is not None:
+                # The filtered classification already explained this defect: a lookup plus a slice.
+                return with_timeline(drill_down_index.drill_down(selected_defect))
+            # Indexed per-defect query of the analysis columns only; full rows
+            # are fetched a page at a time below.
+            events = fetch_defect_occurrences(connection_engine, selected_defect, filter_arg)
+            return with_timeline(drill_down_defect(events, selected_defect))
+
+        async def load_detail_async(async_engine: AsyncEngine) -> tuple[DefectDrillDownResult, pd.DataFrame]:
+            if drill_down_index is not None:
+                return await asyncio.to_thread(with_timeline, drill_down_index.drill_down(selected_defect))
+            events = await fetch_defect_occurrences_async(async_engine, selected_defect, filter_arg)
+            return await asyncio.to_thread(lambda: with_timeline(drill_down_defect(events, selected_defect)))
+
+        with stage("load.drill_down") as timing:
+            detail, timeline = _load(
+                ("drill_down", selected_defect, filters, window_weeks), engine, load_detail, load_detail_async
+            )
+            timing.rows = len(detail.records)
         st.info(detail.message)
-        st.dataframe(detail.records, use_container_width=True, hide_index=True)
+        _render_event_pages(engine, selected_defect, filters, page_size, total_rows=len(detail.records))
+
+        affected_lots = impact[impact["defect_id"] == selected_defect]
+        if not affected_lots.empty:
+            st.subheader("Affected Lots and Shipments")
+            st.dataframe(affected_lots.drop(columns=["defect_id", "severity"]), use_container_width=True, hide_index=True)
+
+        st.subheader("Recurrence Timeline")
+        if timeline.empty:
+            st.caption("No dated defect occurrences to plot.")
+        else:
+            st.caption(f"Lots and weeks with defects in the trailing {window_weeks}-week window.")
+            st.line_chart(timeline.set_index("week_start")[["impacted_lot_count", "weeks_with_defects"]])
+            transitions = status_transitions(timeline)[["week_start", "previous_classification", "trend_classification"]]
+            st.dataframe(transitions, use_container_width=True, hide_index=True)
+
+
+def _render_performance_panel(recorder: PerformanceRecorder) -> None:
+    """Show the finished run's stage breakdown in a collapsed expander.
+
+    Stages served from the result cache appear only as their fast
+    ``load.*`` wrapper; use "Refresh data" to time a cold load.
+
+    Time complexity: O(s), where s is recorded stages.
+    Space complexity: O(s).
+    """
+    with st.expander("Performance"):
+        st.caption(f"Last run: {recorder.total_seconds * 1000:.1f} ms total (profile mode: {recorder.profile_mode}).")
+        breakdown = recorder.breakdown()
+        # Indent nested stages so the hierarchy reads like a call tree.
+        breakdown["stage"] = ["\u2003" * depth + name for depth, name in zip(breakdown["depth"], breakdown["stage"])]
+        breakdown["ms"] = breakdown["seconds"] * 1000
+        st.dataframe(
+            breakdown[["stage", "ms", "share", "rows", "peak_bytes"]],
+            use_container_width=True,
+            hide_index=True,
+        )
+        if recorder.profile_text:
+            st.code(recorder.profile_text, language="text")
+
+
+def main() -> None:
+    """Entry point for dashboard execution.
+
+    Each run is timed stage by stage; the breakdown is logged as one JSON
+    line on ``steelworks_defect.performance`` and shown in the performance
+    panel.
+
+    Time complexity: O(dashboard run + s).
+    Space complexity: O(dashboard run + s).
+    """
+    recorder = PerformanceRecorder(profile_mode=get_profile_mode())
+    with recorder.activate():
+        _render_dashboard()
+    recorder.log()
+    _render_performance_panel(recorder)
 
 
 if __name__ == "__main__":
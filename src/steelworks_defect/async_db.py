@@ -0,0 +1,412 @@
+"""Async database access for concurrent dashboard sessions.
+
+Blocking reads tie up one Streamlit script thread and one pooled connection
+per session for the whole query, so a shift change with dozens of sessions
+queues on both. This module runs the same queries as ``db.py`` on
+SQLAlchemy's asyncio engine (psycopg in async mode) behind one shared,
+bounded pool, and coalesces identical concurrent loads: every session asking
+for the same result at the same data version awaits one in-flight query
+(single-flight) instead of issuing its own.
+
+``AsyncDataGateway`` owns a dedicated event-loop thread, so synchronous
+callers such as Streamlit scripts use it through ``get_or_load``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Coroutine, Hashable
+from typing import Any, TypeVar
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.sql.elements import TextClause
+
+from steelworks_defect.cache import TTLCache
+from steelworks_defect.db import (
+    _DATA_VERSION_COUNTER_QUERY,
+    _DEFECT_SUMMARY_QUERY,
+    _DEFECT_WEEK_ROLLUP_QUERY,
+    _DRILL_DOWN_ORDER,
+    _EVENT_SELECT,
+    _FILTER_OPTION_QUERIES,
+    _OCCURRENCE_SELECT,
+    LOT_IMPACT_COLUMNS,
+    DataVersion,
+    DefectFilters,
+    EventCursor,
+    _coerce_defect_summary,
+    _coerce_defect_week_rollup,
+    _coerce_event_frame,
+    _coerce_lot_impact,
+    _data_version_from_row,
+    _data_version_query,
+    _defect_predicates,
+    _event_page_clauses,
+    _filtered_event_clauses,
+    _has_data_version_table,
+    _inspection_event_clauses,
+    _lot_impact_query,
+    _split_event_page,
+)
+from steelworks_defect.instrumentation import stage
+from steelworks_defect.notify import DATA_VERSION_SOURCES, DataVersionListener
+
+
+T = TypeVar("T")
+
+
+def create_async_db_engine(database_url: str, pool_size: int = 10, max_overflow: int = 20) -> AsyncEngine:
+    """Create an asyncio engine with a bounded connection pool.
+
+    ``postgresql+psycopg://`` URLs select psycopg's async driver
+    automatically. At most ``pool_size + max_overflow`` connections are open
+    at once; further checkouts wait for a free connection.
+
+    Time complexity: O(1) for object construction.
+    Space complexity: O(1).
+    """
+    if pool_size < 1 or max_overflow < 0:
+        raise ValueError("pool_size must be at least 1 and max_overflow non-negative")
+    # pool_pre_ping matches create_db_engine; recycle avoids server-side idle timeouts.
+    return create_async_engine(
+        database_url,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=1800,
+    )
+
+
+async def _read_frame(engine: AsyncEngine, query: str | TextClause, params: dict[str, object]) -> pd.DataFrame:
+    """Run one SELECT and return all rows as a DataFrame (``read_sql_query`` equivalent).
+
+    Time complexity: O(k) where k is rows returned.
+    Space complexity: O(k).
+    """
+    statement = text(query) if isinstance(query, str) else query
+    async with engine.connect() as connection:
+        result = await connection.execute(statement, params)
+        rows = result.fetchall()
+        return pd.DataFrame.from_records(rows, columns=list(result.keys()), coerce_float=True)
+
+
+async def _read_events_async(
+    engine: AsyncEngine,
+    clauses: str,
+    params: dict[str, object],
+    stage_name: str,
+    select: str = _EVENT_SELECT,
+) -> pd.DataFrame:
+    """Async counterpart of ``db._read_events``.
+
+    Time complexity: O(k) where k is rows returned.
+    Space complexity: O(k).
+    """
+    with stage(stage_name) as timing:
+        frame = _coerce_event_frame(await _read_frame(engine, select + clauses, params))
+        timing.rows = len(frame)
+    return frame
+
+
+async def fetch_inspection_events_async(engine: AsyncEngine, after_id: int | None = None) -> pd.DataFrame:
+    """Async ``db.fetch_inspection_events``.
+
+    Time complexity: O(n) where n is inspection rows returned.
+    Space complexity: O(n).
+    """
+    clauses, params = _inspection_event_clauses(after_id)
+    return await _read_events_async(engine, clauses, params, "fetch.inspection_events")
+
+
+async def fetch_filtered_defect_events_async(
+    engine: AsyncEngine,
+    filters: DefectFilters,
+    defect_id: str | None = None,
+) -> pd.DataFrame:
+    """Async ``db.fetch_filtered_defect_events``.
+
+    Time complexity: O(k log n) where k is matching rows.
+    Space complexity: O(k).
+    """
+    clauses, params = _filtered_event_clauses(filters, defect_id)
+    return await _read_events_async(engine, clauses, params, "fetch.filtered_events")
+
+
+async def fetch_defect_occurrences_async(
+    engine: AsyncEngine,
+    defect_id: str,
+    filters: DefectFilters | None = None,
+) -> pd.DataFrame:
+    """Async ``db.fetch_defect_occurrences``.
+
+    Time complexity: O(k log n) where k is rows for the defect.
+    Space complexity: O(k).
+    """
+    predicates, params = _defect_predicates(defect_id, filters)
+    clauses = "WHERE " + " AND ".join(predicates) + _DRILL_DOWN_ORDER
+    return await _read_events_async(engine, clauses, params, "fetch.defect_occurrences", select=_OCCURRENCE_SELECT)
+
+
+async def fetch_defect_events_page_async(
+    engine: AsyncEngine,
+    defect_id: str,
+    page_size: int = 100,
+    after: EventCursor | None = None,
+    filters: DefectFilters | None = None,
+) -> tuple[pd.DataFrame, EventCursor | None]:
+    """Async ``db.fetch_defect_events_page`` (keyset pagination).
+
+    Time complexity: O(log n + page_size).
+    Space complexity: O(page_size).
+    """
+    clauses, params = _event_page_clauses(defect_id, page_size, after, filters)
+    frame = await _read_events_async(engine, clauses, params, "fetch.defect_events_page")
+    return _split_event_page(frame, page_size)
+
+
+async def fetch_lot_impact_async(
+    engine: AsyncEngine,
+    defect_ids: list[str],
+    filters: DefectFilters | None = None,
+) -> pd.DataFrame:
+    """Async ``db.fetch_lot_impact``.
+
+    Time complexity: O(k log n + a + s).
+    Space complexity: O(a + s).
+    """
+    with stage("fetch.lot_impact") as timing:
+        if not defect_ids:
+            frame = pd.DataFrame(columns=LOT_IMPACT_COLUMNS)
+        else:
+            query, params = _lot_impact_query(defect_ids, filters)
+            frame = await _read_frame(engine, query, params)
+        frame = _coerce_lot_impact(frame)
+        timing.rows = len(frame)
+    return frame
+
+
+async def fetch_filter_options_async(engine: AsyncEngine) -> dict[str, list[str]]:
+    """Async ``db.fetch_filter_options``.
+
+    Time complexity: O(l + r + i) over lots, production runs and inspectors.
+    Space complexity: O(d), where d is distinct values.
+    """
+    async with engine.connect() as connection:
+        options = {}
+        for name, query in _FILTER_OPTION_QUERIES.items():
+            result = await connection.execute(text(query))
+            options[name] = sorted(str(row.value) for row in result)
+        return options
+
+
+async def fetch_defect_summary_async(engine: AsyncEngine) -> pd.DataFrame:
+    """Async ``db.fetch_defect_summary`` (materialized view rows).
+
+    Time complexity: O(g + c).
+    Space complexity: O(g + c).
+    """
+    with stage("fetch.defect_summary") as timing:
+        frame = await _read_frame(engine, _DEFECT_SUMMARY_QUERY, {})
+        timing.rows = len(frame)
+    return _coerce_defect_summary(frame)
+
+
+async def fetch_defect_week_rollup_async(engine: AsyncEngine) -> pd.DataFrame:
+    """Async ``db.fetch_defect_week_rollup``.
+
+    Time complexity: O(c), where c is rollup cells.
+    Space complexity: O(c).
+    """
+    with stage("fetch.defect_week_rollup") as timing:
+        frame = await _read_frame(engine, _DEFECT_WEEK_ROLLUP_QUERY, {})
+        timing.rows = len(frame)
+    return _coerce_defect_week_rollup(frame)
+
+
+async def probe_data_version_async(engine: AsyncEngine) -> DataVersion:
+    """Async ``db.probe_data_version``.
+
+    Time complexity: O(log n) plus the COUNT scan in Postgres.
+    Space complexity: O(1).
+    """
+    async with engine.connect() as connection:
+        has_counter = await connection.run_sync(_has_data_version_table)
+        row = (await connection.execute(text(_data_version_query(has_counter)))).one()
+    return _data_version_from_row(row)
+
+
+async def get_data_version_async(engine: AsyncEngine) -> int:
+    """Async ``db.get_data_version``.
+
+    Time complexity: O(1) round trip.
+    Space complexity: O(1).
+    """
+    async with engine.connect() as connection:
+        return int((await connection.execute(text(_DATA_VERSION_COUNTER_QUERY))).scalar_one())
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one running task.
+
+    The first caller for a key starts the work; callers arriving while it
+    runs await the same task. Nothing is remembered after completion
+    (results and errors alike), so caching stays the caller's decision.
+
+    Space complexity: O(k) for k keys currently in flight.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty flight table.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        self._calls: dict[Hashable, asyncio.Task[Any]] = {}
+        self.started = 0
+        self.joined = 0
+
+    def __len__(self) -> int:
+        """Return the number of keys currently in flight.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        return len(self._calls)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """Return ``await factory()``, sharing one run among concurrent callers.
+
+        Must be awaited on one event loop (the table is not thread-safe).
+
+        Time complexity: O(1) plus the shared work.
+        Space complexity: O(1).
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            task.add_done_callback(lambda _done: self._calls.pop(key, None))
+            self.started += 1
+        else:
+            self.joined += 1
+        # shield: one session navigating away must not cancel everyone's query.
+        return await asyncio.shield(task)
+
+
+class AsyncDataGateway:
+    """Process-wide async engine, single-flight loads and a version-keyed result cache.
+
+    All async work runs on one dedicated event-loop thread; Streamlit script
+    threads submit coroutines to it and block only on their own result.
+    Results are cached like ``cache.DashboardCache`` (key = name plus
+    data version), and concurrent misses for the same key share a query.
+
+    Space complexity: O(max_entries) cached results plus the pool.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 32,
+        data_version_source: str = "probe",
+        listener: DataVersionListener | None = None,
+    ) -> None:
+        """Start the event-loop thread and create the shared async engine.
+
+        ``data_version_source`` and ``listener`` choose the version probe as
+        in ``notify.data_version_probe``.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        if data_version_source not in DATA_VERSION_SOURCES:
+            raise ValueError(f"Unknown data version source {data_version_source!r}")
+        if data_version_source == "notify" and listener is None:
+            raise ValueError("data_version_source='notify' needs a DataVersionListener")
+        self.data_version_source = data_version_source
+        self.listener = listener
+        # psycopg's async mode needs a selector loop (Windows defaults to Proactor).
+        self._loop = asyncio.SelectorEventLoop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="steelworks-async-db", daemon=True)
+        self._thread.start()
+        self.engine = create_async_db_engine(database_url, pool_size=pool_size, max_overflow=max_overflow)
+        self.flights = SingleFlight()
+        self._results = TTLCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+    async def data_version(self) -> Hashable:
+        """Return the current data version; concurrent probes share one query.
+
+        With a connected listener no query runs at all.
+
+        Time complexity: O(1) round trip, or O(1) without one.
+        Space complexity: O(1).
+        """
+        if self.data_version_source == "notify":
+            version = self.listener.version
+            if version is not None:
+                return version
+        if self.data_version_source == "probe":
+            return await self.flights.do(("data_version",), lambda: probe_data_version_async(self.engine))
+        return await self.flights.do(("data_version",), lambda: get_data_version_async(self.engine))
+
+    async def load(self, name: Hashable, loader: Callable[[AsyncEngine], Awaitable[T]]) -> T:
+        """Return the result for ``name`` at the current data version.
+
+        ``loader`` must be a pure read; CPU-heavy post-processing inside it
+        should use ``asyncio.to_thread`` so it does not stall other sessions.
+
+        Time complexity: O(1) on a hit plus the probe; one loader run per
+        (name, version) miss regardless of concurrent callers.
+        Space complexity: O(size of loaded result).
+        """
+        key = (name, await self.data_version())
+        hit, value = self._results.get(key)
+        if hit:
+            return value
+        value = await self.flights.do(key, lambda: loader(self.engine))
+        self._results.set(key, value)
+        return value
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Run ``coroutine`` on the gateway loop and block for its result.
+
+        The coroutine inherits the caller's context variables, so
+        ``instrumentation.stage`` timings land in the caller's recorder.
+
+        Time complexity: O(coroutine).
+        Space complexity: O(result).
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def get_or_load(self, name: Hashable, loader: Callable[[AsyncEngine], Awaitable[T]]) -> T:
+        """Blocking ``load`` for synchronous callers (Streamlit scripts).
+
+        Time complexity: see ``load``.
+        Space complexity: see ``load``.
+        """
+        return self.run(self.load(name, loader))
+
+    def clear(self) -> None:
+        """Invalidate every cached result (explicit refresh control).
+
+        Time complexity: O(e), where e is cached entries.
+        Space complexity: O(1).
+        """
+        self._results.clear()
+
+    def close(self) -> None:
+        """Dispose the pool and stop the loop thread.
+
+        Time complexity: O(p), where p is pooled connections.
+        Space complexity: O(1).
+        """
+        self.run(self.engine.dispose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
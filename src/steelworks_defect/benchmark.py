@@ -0,0 +1,314 @@
+"""Benchmark harness for the analysis and DB paths.
+
+Times (best/median of ``--repeat`` runs) and memory-profiles (tracemalloc
+peak) each stage on synthetic histories and writes machine-readable JSON, so
+results from two commits can be compared with ``--compare``.
+
+Usage:
+    poetry run benchmark --rows 10000 1000000 10000000 --output bench.json
+    poetry run benchmark --rows 10000 --compare bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from steelworks_defect.analysis import (
+    classify_defects,
+    classify_defects_explained,
+    drill_down_defect,
+    filter_recurring_only,
+    recurring_mask,
+)
+from steelworks_defect.bootstrap import _apply_schema
+from steelworks_defect.db import (
+    DefectFilters,
+    create_db_engine,
+    fetch_defect_events_page,
+    fetch_defect_week_rollup,
+    fetch_filtered_defect_events,
+    fetch_inspection_events,
+    fetch_lot_impact,
+    iter_analysis_event_chunks,
+)
+from steelworks_defect.event_store import EventStore
+from steelworks_defect.incremental import DefectAggregateState
+from steelworks_defect.ingest import IngestResult, LotIdNormalizer
+from steelworks_defect.loader import _empty_ingest_frame, load_ingest_result
+from steelworks_defect.parallel import classify_defects_parallel
+from steelworks_defect.rolling import rolling_recurrence
+from steelworks_defect.rollup import classify_rollup, rollup_events
+from steelworks_defect.sketch import classify_defects_approximate, weekly_lot_sketches
+from steelworks_defect.synthetic import generate_inspection_history, generate_raw_lot_ids, generate_shipment_history
+
+
+# Bump when the JSON layout changes so comparisons can refuse mismatches.
+RESULT_SCHEMA_VERSION = 1
+
+DEFAULT_ROW_COUNTS = [10_000, 1_000_000, 10_000_000]
+
+
+def measure_stage(
+    stage: str,
+    rows: int,
+    func: Callable[[], object],
+    repeat: int = 3,
+    profile_memory: bool = True,
+) -> dict[str, object]:
+    """Time ``func`` ``repeat`` times and record its tracemalloc peak once.
+
+    Memory is profiled in a separate run so tracing overhead does not distort
+    the timings.
+
+    Time complexity: O(repeat * T(func)).
+    Space complexity: O(repeat) beyond what ``func`` allocates.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    peak_bytes = None
+    if profile_memory:
+        tracemalloc.start()
+        try:
+            func()
+            _, peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "stage": stage,
+        "rows": rows,
+        "repeat": repeat,
+        "seconds_min": min(timings),
+        "seconds_median": statistics.median(timings),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def _reset_scratch_database(engine: Engine, project_root: Path, partitioned: bool = False) -> None:
+    """Drop and recreate the ``operations`` schema on a scratch database.
+
+    Time complexity: O(s), where s is schema script size.
+    Space complexity: O(s).
+    """
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA IF EXISTS operations CASCADE"))
+    _apply_schema(engine, project_root, partitioned)
+
+
+def _load_events(engine: Engine, events: pd.DataFrame, shipments: pd.DataFrame | None = None) -> None:
+    """Bulk-load synthetic events (one production run per lot, optional shipments) with the COPY loader.
+
+    Time complexity: O(n log n).
+    Space complexity: O(n).
+    """
+    production_runs = events.groupby("normalized_lot_id", as_index=False).agg(
+        line_id=("line_id", "first"),
+        shift=("shift", "first"),
+        part_number=("part_number", "first"),
+        production_date=("inspection_timestamp", "min"),
+    )
+    production_runs["production_date"] = production_runs["production_date"].dt.normalize()
+    production_runs["raw_lot_id"] = production_runs["normalized_lot_id"]
+    result = IngestResult(
+        inspections=events,
+        production_runs=production_runs,
+        shipments=_empty_ingest_frame("shipment") if shipments is None else shipments,
+        indeterminate=pd.DataFrame(),
+    )
+    load_ingest_result(engine, result)
+
+
+def run_benchmarks(
+    row_counts: list[int],
+    repeat: int = 3,
+    seed: int = 0,
+    profile_memory: bool = True,
+    engine: Engine | None = None,
+    project_root: Path | None = None,
+) -> dict[str, object]:
+    """Run every stage at each row count and return the JSON-ready report.
+
+    DB stages run only when ``engine`` points at a scratch database; its
+    ``operations`` schema is recreated for every row count.
+
+    Time complexity: O(sum(row_counts) * repeat) for the in-memory stages.
+    Space complexity: O(max(row_counts)).
+    """
+    results: list[dict[str, object]] = []
+    for rows in row_counts:
+        events = generate_inspection_history(rows, seed=seed)
+        summary = classify_defects(events)
+        # Drill into the most common defect: the worst case for AC7/AC8 detail.
+        top_defect = str(events["defect_id"].mode().iloc[0]) if events["defect_id"].notna().any() else "NONE"
+        store = EventStore.from_frame(events)
+        cells = rollup_events(store)
+        drill_down_index = classify_defects_explained(store)[1]
+        raw_lot_ids = generate_raw_lot_ids(rows, seed=seed)["raw_lot_id"]
+
+        stages: list[tuple[str, Callable[[], object]]] = [
+            ("classify_defects", lambda: classify_defects(events)),
+            ("event_store.from_frame", lambda: EventStore.from_frame(events)),
+            ("classify_defects[event_store]", lambda: classify_defects(store)),
+            ("classify_defects_parallel", lambda: classify_defects_parallel(events)),
+            ("drill_down_defect", lambda: drill_down_defect(events, top_defect)),
+            ("drill_down_defect[event_store]", lambda: drill_down_defect(store, top_defect)),
+            ("classify_defects_explained[event_store]", lambda: classify_defects_explained(store)),
+            ("drill_down_index.drill_down", lambda: drill_down_index.drill_down(top_defect)),
+            ("filter_recurring_only", lambda: filter_recurring_only(summary)),
+            ("rolling_recurrence", lambda: rolling_recurrence(store)),
+            ("classify_rollup", lambda: classify_rollup(cells)),
+            ("classify_defects_approximate[event_store]", lambda: classify_defects_approximate(store)),
+            ("weekly_lot_sketches", lambda: weekly_lot_sketches(cells)),
+            # A fresh normalizer per run: the memo would otherwise hide the cost.
+            ("normalize_lot_ids", lambda: LotIdNormalizer().normalize(raw_lot_ids)),
+        ]
+        for stage, func in stages:
+            results.append(measure_stage(stage, rows, func, repeat=repeat, profile_memory=profile_memory))
+
+        if engine is not None and project_root is not None:
+            _reset_scratch_database(engine, project_root)
+            shipments = generate_shipment_history(events, seed=seed)
+            # Loading mutates the database, so it is timed once and not traced.
+            results.append(
+                measure_stage(
+                    "bulk_load", rows, lambda: _load_events(engine, events, shipments), repeat=1, profile_memory=False
+                )
+            )
+            recurring_codes = summary.loc[recurring_mask(summary), "defect_id"].astype(str).tolist()
+
+            def stream_fold() -> None:
+                DefectAggregateState().apply_chunks(iter_analysis_event_chunks(engine))
+
+            # Last 12 weeks of one line: a typical filtered dashboard request.
+            window_end = events["inspection_timestamp"].max().date()
+            filters = DefectFilters(start=window_end - timedelta(weeks=12), end=window_end, line_id="Line 2")
+
+            db_stages: list[tuple[str, Callable[[], object]]] = [
+                ("fetch_inspection_events", lambda: fetch_inspection_events(engine)),
+                ("stream_fold", stream_fold),
+                ("classify_defects[filtered]", lambda: classify_defects(fetch_filtered_defect_events(engine, filters))),
+                ("classify_rollup[db]", lambda: classify_rollup(fetch_defect_week_rollup(engine))),
+                ("fetch_defect_events_page", lambda: fetch_defect_events_page(engine, top_defect, page_size=50)),
+                ("fetch_lot_impact", lambda: fetch_lot_impact(engine, recurring_codes)),
+            ]
+            for stage, func in db_stages:
+                results.append(measure_stage(stage, rows, func, repeat=repeat, profile_memory=profile_memory))
+
+    return {
+        "schema_version": RESULT_SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def _git_commit() -> str | None:
+    """Return the current git commit hash, or None outside a checkout.
+
+    Time complexity: O(1) (one subprocess call).
+    Space complexity: O(1).
+    """
+    try:
+        completed = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def compare_results(
+    baseline: dict[str, object],
+    current: dict[str, object],
+    tolerance: float = 0.2,
+    min_delta_seconds: float = 0.005,
+) -> list[str]:
+    """List stages whose best time regressed by more than ``tolerance``.
+
+    Stages are matched on (stage, rows); stages missing from either report are
+    ignored, as are slowdowns under ``min_delta_seconds`` (timer noise on
+    sub-millisecond stages).
+
+    Time complexity: O(r), where r is result entries.
+    Space complexity: O(r).
+    """
+    if baseline.get("schema_version") != current.get("schema_version"):
+        raise ValueError("Benchmark reports use different schema versions")
+
+    previous = {(item["stage"], item["rows"]): item for item in baseline["results"]}
+    regressions = []
+    for item in current["results"]:
+        before = previous.get((item["stage"], item["rows"]))
+        if before is None or before["seconds_min"] <= 0:
+            continue
+        ratio = item["seconds_min"] / before["seconds_min"]
+        if ratio > 1.0 + tolerance and item["seconds_min"] - before["seconds_min"] >= min_delta_seconds:
+            regressions.append(
+                f"{item['stage']} @ {item['rows']} rows: {before['seconds_min']:.4f}s -> "
+                f"{item['seconds_min']:.4f}s ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> None:
+    """CLI entry point for `poetry run benchmark`.
+
+    Time complexity: O(sum(row_counts) * repeat).
+    Space complexity: O(max(row_counts)).
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the recurring-defect analysis paths.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROW_COUNTS, help="Synthetic history sizes.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (best and median reported).")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run per stage.")
+    parser.add_argument(
+        "--scratch-database-url",
+        default=None,
+        help="Also benchmark DB stages; the operations schema there is DROPPED and recreated.",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON report here (default: stdout).")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline JSON report to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown ratio before failing.")
+    args = parser.parse_args(argv)
+
+    engine = create_db_engine(args.scratch_database_url) if args.scratch_database_url else None
+    report = run_benchmarks(
+        args.rows,
+        repeat=max(args.repeat, 1),
+        seed=args.seed,
+        profile_memory=not args.no_memory,
+        engine=engine,
+        project_root=Path(__file__).resolve().parents[2],
+    )
+
+    payload = json.dumps(report, indent=2)
+    if args.output is None:
+        print(payload)
+    else:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+
+    if args.compare is not None:
+        regressions = compare_results(json.loads(args.compare.read_text(encoding="utf-8")), report, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            raise SystemExit(1)
@@ -1,16 +1,25 @@
 """Database bootstrap utility.
 
-This module initializes the database by executing schema and seed SQL files.
+This module initializes the database by executing schema and seed SQL files,
+or bulk-loads real exports instead of the seed (``init-db --load PATH``).
 """
 
 from __future__ import annotations
 
+import argparse
 from pathlib import Path
 
 from sqlalchemy import text
+from sqlalchemy.engine import Engine
 
 from steelworks_defect.config import get_database_url
-from steelworks_defect.db import create_db_engine
+from steelworks_defect.db import (
+    create_db_engine,
+    fetch_normalized_lot_ids,
+    refresh_defect_summary,
+    refresh_defect_week_rollup,
+)
+from steelworks_defect.loader import LoadReport, load_ingest_result, read_load_source
 
 
 def _read_sql_file(path: Path) -> str:
@@ -22,43 +31,162 @@ def _read_sql_file(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
-def initialize_database(project_root: Path) -> None:
+def _apply_schema(engine: Engine, project_root: Path, partitioned: bool = False) -> None:
+    """Execute db/schema.sql in one transaction.
+
+    ``partitioned`` creates ``inspection_event`` range-partitioned by month
+    (the schema reads the ``steelworks.partition_inspections`` setting).
+
+    Time complexity: O(s), where s is schema script size.
+    Space complexity: O(s).
+    """
+    schema_path = project_root / "db" / "schema.sql"
+    if not schema_path.exists():
+        raise FileNotFoundError(f"Schema file not found: {schema_path}")
+    # engine.begin() guarantees commit/rollback semantics and closes the
+    # underlying connection even when exceptions are raised.
+    with engine.begin() as connection:
+        # Transaction-local (is_local = true), so it never leaks into pooled sessions.
+        connection.execute(
+            text("SELECT set_config('steelworks.partition_inspections', :mode, true)"),
+            {"mode": "monthly" if partitioned else ""},
+        )
+        connection.execute(text(_read_sql_file(schema_path)))
+
+
+def initialize_database(project_root: Path, partitioned: bool = False) -> None:
     """Execute schema and seed SQL files in one transaction boundary each.
 
     Resources are properly closed because SQLAlchemy engine connections are
     wrapped in context managers (`engine.begin()`).
 
-    Time complexity: O(s + d), where s and d are SQL script sizes.
+    Time complexity: O(s + d + n), where s and d are SQL script sizes and n is
+    seeded inspection rows aggregated by the summary refresh.
     Space complexity: O(s + d) for in-memory SQL text.
     """
-    schema_path = project_root / "db" / "schema.sql"
     seed_path = project_root / "db" / "seed.sql"
-
-    if not schema_path.exists():
-        raise FileNotFoundError(f"Schema file not found: {schema_path}")
     if not seed_path.exists():
         raise FileNotFoundError(f"Seed file not found: {seed_path}")
 
     engine = create_db_engine(get_database_url())
 
-    schema_sql = _read_sql_file(schema_path)
-    seed_sql = _read_sql_file(seed_path)
-
-    # engine.begin() guarantees commit/rollback semantics and closes the
-    # underlying connection even when exceptions are raised.
-    with engine.begin() as connection:
-        connection.execute(text(schema_sql))
+    _apply_schema(engine, project_root, partitioned)
     with engine.begin() as connection:
-        connection.execute(text(seed_sql))
+        connection.execute(text(_read_sql_file(seed_path)))
+        # Seed rows went to the default partition; give them their months.
+        connection.execute(
+            text(
+                "SELECT operations.ensure_inspection_partitions(MIN(inspection_timestamp), MAX(inspection_timestamp)) "
+                "FROM operations.inspection_event"
+            )
+        )
+    # The materialized summary was created empty with the schema.
+    refresh_defect_summary(engine)
+
+
+def load_database(
+    project_root: Path,
+    source: Path,
+    apply_schema: bool = True,
+    batch_size: int = 50_000,
+    partitioned: bool = False,
+) -> LoadReport:
+    """Create the schema (optionally) and bulk-load exports from ``source``.
+
+    Loading into an existing schema passes its lot IDs to ingestion, so
+    mistyped IDs in new exports can match lots loaded earlier.
+
+    Time complexity: O(s + l + r log r), where r is rows loaded and l stored lots.
+    Space complexity: O(l + r) client-side for known lots and the normalized frames.
+    """
+    engine = create_db_engine(get_database_url())
+    if apply_schema:
+        _apply_schema(engine, project_root, partitioned)
+        known_lot_ids: list[str] = []
+    else:
+        known_lot_ids = fetch_normalized_lot_ids(engine)
+    return load_ingest_result(engine, read_load_source(source, known_lot_ids), batch_size=batch_size)
+
+
+def _format_load_report(report: LoadReport) -> str:
+    """Render a ``LoadReport`` as aligned per-table lines plus throughput.
+
+    Time complexity: O(t), where t is number of tables.
+    Space complexity: O(t).
+    """
+    lines = [f"{'table':<18}{'staged':>10}{'upserted':>10}{'rejected':>10}"]
+    for table, staged in report.staged.items():
+        lines.append(f"{table:<18}{staged:>10}{report.upserted[table]:>10}{report.rejected[table]:>10}")
+    lines.append(f"Loaded in {report.elapsed_seconds:.2f}s ({report.rows_per_second:,.0f} rows/sec).")
+    return "\n".join(lines)
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     """CLI entry point for `poetry run init-db`.
 
-    Time complexity: O(s + d).
-    Space complexity: O(s + d).
+    Without arguments the schema and seed are applied. ``--load PATH`` applies
+    the schema and bulk-loads exports instead of the seed; add
+    ``--skip-schema`` to load into an existing database. ``--partitioned``
+    creates ``inspection_event`` with monthly range partitions.
+
+    Time complexity: O(s + d) for the seed path, O(s + r log r) for --load.
+    Space complexity: O(s + d) or O(r).
     """
+    parser = argparse.ArgumentParser(description="Initialize the steelworks database.")
+    parser.add_argument(
+        "--load",
+        type=Path,
+        default=None,
+        help="Directory of .xlsx exports, directory of ingest CSVs, or one inspections CSV.",
+    )
+    parser.add_argument("--skip-schema", action="store_true", help="Do not (re)create the schema before --load.")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Rows per COPY/upsert transaction.")
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="Create inspection_event range-partitioned by month (new schema only).",
+    )
+    args = parser.parse_args(argv)
+    if args.partitioned and args.skip_schema:
+        parser.error("--partitioned applies when the schema is created; drop --skip-schema")
+
     # Resolve project root by walking up from this source file location.
     project_root = Path(__file__).resolve().parents[2]
-    initialize_database(project_root)
-    print("Database initialization complete.")
+    if args.load is None:
+        initialize_database(project_root, partitioned=args.partitioned)
+        print("Database initialization complete.")
+        return
+
+    report = load_database(
+        project_root,
+        args.load,
+        apply_schema=not args.skip_schema,
+        batch_size=args.batch_size,
+        partitioned=args.partitioned,
+    )
+    print(_format_load_report(report))
+
+
+def refresh_summary_main() -> None:
+    """CLI entry point for `poetry run refresh-summary`.
+
+    Run after loading new exports so the dashboard list view reflects them.
+
+    Time complexity: O(n), where n is inspection rows aggregated by Postgres.
+    Space complexity: O(1) on the client.
+    """
+    refresh_defect_summary(create_db_engine(get_database_url()))
+    print("Defect summary refresh complete.")
+
+
+def refresh_rollup_main() -> None:
+    """CLI entry point for `poetry run refresh-rollup`.
+
+    Triggers keep the weekly rollup current, so this only backfills or
+    repairs it (e.g. on a database created before the rollup existed).
+
+    Time complexity: O(n), where n is inspection rows aggregated by Postgres.
+    Space complexity: O(1) on the client.
+    """
+    cells = refresh_defect_week_rollup(create_db_engine(get_database_url()))
+    print(f"Weekly defect rollup rebuilt ({cells} cells).")
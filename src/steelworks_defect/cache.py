@@ -0,0 +1,167 @@
+"""UI-independent caching for the dashboard.
+
+Streamlit reruns the whole script on every interaction. This module keeps a
+process-wide engine per database URL and caches loaded results keyed by a
+cheap data version (the ``DataVersion`` fingerprint by default, or see
+``notify.py``), so repeat interactions only pay for the version probe.
+Nothing here imports Streamlit, so it is unit-testable.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+from sqlalchemy.engine import Engine
+
+from steelworks_defect.db import create_db_engine, probe_data_version
+
+
+T = TypeVar("T")
+
+_ENGINES: dict[str, Engine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_shared_engine(database_url: str) -> Engine:
+    """Return the process-wide engine (and connection pool) for a URL.
+
+    Time complexity: O(1).
+    Space complexity: O(1) per distinct URL.
+    """
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(database_url)
+        if engine is None:
+            engine = create_db_engine(database_url)
+            _ENGINES[database_url] = engine
+        return engine
+
+
+class TTLCache:
+    """Thread-safe LRU mapping whose entries also expire after a TTL.
+
+    Time complexity: O(1) per get/set.
+    Space complexity: O(max_entries).
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, clock: Callable[[], float] = time.monotonic) -> None:
+        """Create an empty cache.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of stored (possibly expired) entries.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Return ``(hit, value)``; expired entries count as misses and are dropped.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            stored_at, value = entry
+            if self._clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return False, None
+            # Mark as most recently used for LRU eviction.
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting least recently used entries beyond capacity.
+
+        Time complexity: O(1) amortized.
+        Space complexity: O(1).
+        """
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry.
+
+        Time complexity: O(e), where e is stored entries.
+        Space complexity: O(1).
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+class DashboardCache:
+    """Cache of loaded dashboard data keyed by name and data version.
+
+    Each lookup runs the version probe once; a hit returns the stored object
+    without further database work, and a new data version naturally misses.
+
+    Space complexity: O(max_entries) cached results.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 32,
+        probe: Callable[[Engine], Hashable] = probe_data_version,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a cache with TTL and size-bounded eviction.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        self._entries = TTLCache(ttl_seconds=ttl_seconds, max_entries=max_entries, clock=clock)
+        self._probe = probe
+
+    def data_version(self, engine: Engine) -> Hashable:
+        """Return the current data version via the probe.
+
+        Time complexity: O(1) round trip (none for ``DataVersionListener.probe``).
+        Space complexity: O(1).
+        """
+        return self._probe(engine)
+
+    def get_or_load(self, name: Hashable, engine: Engine, loader: Callable[[Engine], T]) -> T:
+        """Return the cached result for ``name`` at the current data version.
+
+        Concurrent misses may both call ``loader``; the last result wins, which
+        is safe because loaders are pure reads of the same version.
+
+        Time complexity: O(1) on a hit plus the probe; loader cost on a miss.
+        Space complexity: O(size of loaded result).
+        """
+        key = (name, self.data_version(engine))
+        hit, value = self._entries.get(key)
+        if hit:
+            return value
+        value = loader(engine)
+        self._entries.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Invalidate every cached result (explicit refresh control).
+
+        Time complexity: O(e), where e is cached entries.
+        Space complexity: O(1).
+        """
+        self._entries.clear()
@@ -7,6 +7,7 @@ lookups across the codebase.
 from __future__ import annotations
 
 import os
+from pathlib import Path
 
 
 # DATABASE_URL controls the SQLAlchemy connection string.
@@ -36,3 +37,213 @@ def get_default_recurring_filter() -> bool:
     raw_value = os.getenv("SHOW_RECURRING_ONLY", "true").strip().lower()
     # Convert to boolean while staying permissive for common variants.
     return raw_value in {"1", "true", "yes", "on"}
+
+
+# Valid values for SUMMARY_SOURCE. "incremental" folds new inspection rows in
+# the app process; "materialized" reads operations.mv_defect_summary; "rollup"
+# reads operations.defect_week_rollup through rollup.classify_rollup.
+SUMMARY_SOURCES = {"incremental", "materialized", "rollup"}
+
+
+def get_summary_source() -> str:
+    """Return which engine produces the dashboard list-view summary.
+
+    Unknown values fall back to "incremental" so a typo never breaks the UI.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    raw_value = os.getenv("SUMMARY_SOURCE", "incremental").strip().lower()
+    return raw_value if raw_value in SUMMARY_SOURCES else "incremental"
+
+
+def get_cache_ttl_seconds() -> float:
+    """Return how long cached dashboard results stay valid, in seconds.
+
+    Invalid values fall back to the 300-second default.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    raw_value = os.getenv("CACHE_TTL_SECONDS", "300").strip()
+    try:
+        return max(float(raw_value), 0.0)
+    except ValueError:
+        return 300.0
+
+
+def get_cache_max_entries() -> int:
+    """Return the maximum number of cached dashboard results.
+
+    Invalid values fall back to the default of 32 entries.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    raw_value = os.getenv("CACHE_MAX_ENTRIES", "32").strip()
+    try:
+        return max(int(raw_value), 1)
+    except ValueError:
+        return 32
+
+
+def get_stream_chunk_size() -> int:
+    """Return rows per chunk when streaming inspection events.
+
+    Bounds client memory during classification. Invalid values fall back to
+    the default of 50,000 rows.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    raw_value = os.getenv("STREAM_CHUNK_SIZE", "50000").strip()
+    try:
+        return max(int(raw_value), 1)
+    except ValueError:
+        return 50_000
+
+
+def get_snapshot_dir() -> Path | None:
+    """Return the local event snapshot directory, or None when disabled.
+
+    Set ``SNAPSHOT_DIR`` to a writable local path so cold starts read events
+    from a Parquet snapshot and fetch only newer rows from Postgres.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    raw_value = os.getenv("SNAPSHOT_DIR", "").strip()
+    return Path(raw_value) if raw_value else None
+
+
+def get_recurrence_window_weeks() -> int:
+    """Return the trailing window, in weeks, for the rolling recurrence timeline.
+
+    Invalid or non-positive values fall back to the default of 12 weeks.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    raw_value = os.getenv("RECURRENCE_WINDOW_WEEKS", "12").strip()
+    try:
+        value = int(raw_value)
+    except ValueError:
+        return 12
+    return value if value >= 1 else 12
+
+
+def get_profile_mode() -> str:
+    """Return the dashboard profiling mode from ``PROFILE_MODE``.
+
+    ``off`` (default) records stage timings only; ``tracemalloc`` adds a peak
+    allocation per stage; ``cprofile`` adds a whole-run function profile to
+    the performance panel. Unknown values fall back to ``off``.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    raw_value = os.getenv("PROFILE_MODE", "off").strip().lower()
+    return raw_value if raw_value in {"off", "cprofile", "tracemalloc"} else "off"
+
+
+def get_page_size() -> int:
+    """Return rows per page for the dashboard's list and drill-down tables.
+
+    Invalid or non-positive values fall back to the default of 50 rows.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    raw_value = os.getenv("PAGE_SIZE", "50").strip()
+    try:
+        value = int(raw_value)
+    except ValueError:
+        return 50
+    return value if value >= 1 else 50
+
+
+def get_lot_count_mode() -> str:
+    """Return how filtered views count impacted lots from ``LOT_COUNT_MODE``.
+
+    ``exact`` (default) counts distinct lot IDs; ``approximate`` uses
+    HyperLogLog sketches (see ``sketch.py``) with exact recounts near the
+    recurring threshold. Unknown values fall back to ``exact``.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    raw_value = os.getenv("LOT_COUNT_MODE", "exact").strip().lower()
+    return raw_value if raw_value in {"exact", "approximate"} else "exact"
+
+
+def get_lot_count_error() -> float:
+    """Return the target relative standard error for approximate lot counts.
+
+    Values outside (0, 0.5] fall back to the default of 0.01 (1%).
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    raw_value = os.getenv("LOT_COUNT_ERROR", "0.01").strip()
+    try:
+        value = float(raw_value)
+    except ValueError:
+        return 0.01
+    return value if 0.0 < value <= 0.5 else 0.01
+
+
+def get_async_db_enabled() -> bool:
+    """Return whether dashboard reads go through the async, single-flight gateway.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    raw_value = os.getenv("ASYNC_DB", "false").strip().lower()
+    return raw_value in {"1", "true", "yes", "on"}
+
+
+def get_db_pool_size() -> int:
+    """Return the async engine's persistent pool size from ``DB_POOL_SIZE``.
+
+    Invalid or non-positive values fall back to the default of 10.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    raw_value = os.getenv("DB_POOL_SIZE", "10").strip()
+    try:
+        value = int(raw_value)
+    except ValueError:
+        return 10
+    return value if value >= 1 else 10
+
+
+def get_db_max_overflow() -> int:
+    """Return how many extra async connections may open under burst load.
+
+    Invalid or negative values fall back to the default of 20.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    raw_value = os.getenv("DB_MAX_OVERFLOW", "20").strip()
+    try:
+        value = int(raw_value)
+    except ValueError:
+        return 20
+    return value if value >= 0 else 20
+
+
+def get_data_version_source() -> str:
+    """Return how cached dashboard results detect new data (``DATA_VERSION_SOURCE``).
+
+    ``probe`` (default) fingerprints inspection_event on every lookup;
+    ``counter`` reads the trigger-maintained ``operations.data_version`` row;
+    ``notify`` keeps that version in memory via LISTEN/NOTIFY, so idle
+    dashboards query nothing. Unknown values fall back to ``probe``.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    raw_value = os.getenv("DATA_VERSION_SOURCE", "probe").strip().lower()
+    return raw_value if raw_value in {"probe", "counter", "notify"} else "probe"
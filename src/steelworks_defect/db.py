@@ -6,9 +6,37 @@ making the project easier to test and reason about.
 
 from __future__ import annotations
 
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
 import pandas as pd
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
+from sqlalchemy import bindparam, create_engine, inspect, text
+from sqlalchemy.engine import Connection, Engine, Row
+from sqlalchemy.sql.elements import TextClause
+
+from steelworks_defect.instrumentation import stage
+
+
+@dataclass(frozen=True)
+class DataVersion:
+    """Cheap fingerprint of the inspection_event table contents.
+
+    Attributes:
+        max_event_id: Highest ``inspection_event.id`` (0 when empty).
+        row_count: Number of inspection rows; catches deletes.
+        max_timestamp: Latest inspection timestamp, if any.
+        counter: ``operations.data_version.version``, which also moves on
+            in-place updates and view refreshes the other fields miss; None
+            on schemas created before the counter.
+
+    Space complexity: O(1).
+    """
+
+    max_event_id: int
+    row_count: int
+    max_timestamp: pd.Timestamp | None
+    counter: int | None = None
 
 
 def create_db_engine(database_url: str) -> Engine:
@@ -21,41 +49,826 @@ def create_db_engine(database_url: str) -> Engine:
     return create_engine(database_url, pool_pre_ping=True)
 
 
-def fetch_inspection_events(engine: Engine) -> pd.DataFrame:
+# Shared SELECT/JOIN for event-level reads. LEFT JOIN on defect_type because
+# defect-free inspections may contain NULL defect references, and on
+# production_run (unique per lot) because not every lot has a run record.
+_EVENT_FROM = """
+    FROM operations.inspection_event ie
+    JOIN operations.lot l ON l.id = ie.lot_id
+    JOIN operations.inspector i ON i.id = ie.inspector_id
+    LEFT JOIN operations.defect_type dt ON dt.id = ie.defect_type_id
+    LEFT JOIN operations.production_run pr ON pr.lot_id = l.id
+"""
+
+_EVENT_SELECT = """
+    SELECT
+        ie.id AS event_id,
+        dt.defect_id,
+        dt.severity,
+        l.normalized_lot_id,
+        ie.inspection_timestamp,
+        ie.qty_checked,
+        ie.qty_defects,
+        ie.disposition,
+        ie.notes,
+        i.inspector_name,
+        pr.line_id,
+        l.part_number,
+        pr.shift
+""" + _EVENT_FROM
+
+# Analysis columns only (what drill_down_defect and rolling_recurrence read),
+# over the same joins so DefectFilters predicates still apply.
+_OCCURRENCE_SELECT = """
+    SELECT
+        ie.id AS event_id,
+        dt.defect_id,
+        dt.severity,
+        l.normalized_lot_id,
+        ie.inspection_timestamp,
+        ie.qty_defects
+""" + _EVENT_FROM
+
+# Drill-down order. ie.id breaks (timestamp, lot) ties so keyset pages are
+# disjoint and complete.
+_DRILL_DOWN_ORDER = " ORDER BY ie.inspection_timestamp DESC, l.normalized_lot_id, ie.id"
+
+
+@dataclass(frozen=True)
+class DefectFilters:
+    """Optional slice of the inspection history for filtered classification.
+
+    Unset fields do not filter. ``start`` and ``end`` are inclusive calendar
+    dates. Frozen so a filter combination can key the dashboard cache.
+
+    Attributes:
+        start: First inspection date to include.
+        end: Last inspection date to include.
+        line_id: Production line (``production_run.line_id``).
+        part_number: Part number (``lot.part_number``).
+        shift: Production shift (``production_run.shift``).
+        inspector_name: Inspector (``inspector.inspector_name``).
+
+    Space complexity: O(1).
+    """
+
+    start: date | None = None
+    end: date | None = None
+    line_id: str | None = None
+    part_number: str | None = None
+    shift: str | None = None
+    inspector_name: str | None = None
+
+    def is_empty(self) -> bool:
+        """Return True when no filter is set.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        return self == DefectFilters()
+
+    def to_sql(self) -> tuple[list[str], dict[str, object]]:
+        """Translate set filters into WHERE predicates and bound parameters.
+
+        Each predicate is only emitted when its value is set, so Postgres can
+        use the matching index (see ``db/schema.sql``) instead of evaluating
+        ``(:param IS NULL OR ...)`` for every row.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        predicates: list[str] = []
+        params: dict[str, object] = {}
+        if self.start is not None:
+            predicates.append("ie.inspection_timestamp >= :window_start")
+            params["window_start"] = datetime.combine(self.start, time.min)
+        if self.end is not None:
+            # Half-open upper bound keeps the whole end date inclusive.
+            predicates.append("ie.inspection_timestamp < :window_end")
+            params["window_end"] = datetime.combine(self.end + timedelta(days=1), time.min)
+        for column, value in (
+            ("pr.line_id", self.line_id),
+            ("l.part_number", self.part_number),
+            ("pr.shift", self.shift),
+            ("i.inspector_name", self.inspector_name),
+        ):
+            if value is not None:
+                name = column.split(".")[1]
+                predicates.append(f"{column} = :{name}")
+                params[name] = value
+        return predicates, params
+
+
+def _read_events(
+    engine: Engine,
+    clauses: str,
+    params: dict[str, object],
+    stage_name: str,
+    select: str = _EVENT_SELECT,
+) -> pd.DataFrame:
+    """Run an event SELECT (full rows by default) with extra WHERE/ORDER clauses.
+
+    ``stage_name`` labels the query in the active performance recorder.
+
+    Time complexity: O(k) where k is number of rows returned.
+    Space complexity: O(k) for the resulting DataFrame.
+    """
+    query = text(select + clauses)
+
+    # The context manager guarantees the DB connection is closed promptly,
+    # preventing leaked connections in long-running UI sessions.
+    with stage(stage_name) as timing:
+        with engine.connect() as connection:
+            frame = pd.read_sql_query(query, connection, params=params)
+        frame = _coerce_event_frame(frame)
+        timing.rows = len(frame)
+    return frame
+
+
+def _coerce_event_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Normalize driver-returned event columns in place (shared by sync and async reads).
+
+    Time complexity: O(k).
+    Space complexity: O(k).
+    """
+    # Parse timestamps once so all downstream logic can rely on datetime dtype.
+    frame["inspection_timestamp"] = pd.to_datetime(frame["inspection_timestamp"], errors="coerce")
+    # Enforce numeric defects to prevent string comparisons during filtering.
+    frame["qty_defects"] = pd.to_numeric(frame["qty_defects"], errors="coerce").fillna(0).astype(int)
+    return frame
+
+
+def fetch_inspection_events(engine: Engine, after_id: int | None = None) -> pd.DataFrame:
     """Fetch normalized inspection-event records for analysis.
 
-    The query intentionally uses LEFT JOIN for defect_type because defect-free
-    inspections may contain NULL defect references.
+    When ``after_id`` is given, only rows with ``inspection_event.id`` above it
+    are returned so incremental consumers can fetch new loads only.
 
     Time complexity: O(n) where n is number of inspection rows returned.
     Space complexity: O(n) for the resulting DataFrame.
     """
-    query = text(
+    clauses, params = _inspection_event_clauses(after_id)
+    return _read_events(engine, clauses, params, "fetch.inspection_events")
+
+
+def _inspection_event_clauses(after_id: int | None) -> tuple[str, dict[str, object]]:
+    """Return the WHERE/ORDER clauses and parameters of ``fetch_inspection_events``.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    # The predicate is only added when needed; "(:id IS NULL OR ...)" would
+    # leave the parameter type undetermined for Postgres.
+    if after_id is not None:
+        return "WHERE ie.id > :after_id ORDER BY ie.id", {"after_id": after_id}
+    return "ORDER BY ie.id", {}
+
+
+# Narrow projection for streaming classification: only the columns
+# analysis.classify_defects reads, with AC3 (defect rows only) pushed down so
+# zero-defect inspections and free-text notes never leave the database.
+_ANALYSIS_STREAM_SELECT = """
+    SELECT
+        ie.id AS event_id,
+        dt.defect_id,
+        dt.severity,
+        l.normalized_lot_id,
+        ie.inspection_timestamp,
+        ie.qty_defects
+    FROM operations.inspection_event ie
+    JOIN operations.lot l ON l.id = ie.lot_id
+    JOIN operations.defect_type dt ON dt.id = ie.defect_type_id
+"""
+
+# Dimension joins needed only when DefectFilters reference inspector or run columns.
+_ANALYSIS_STREAM_FILTER_JOINS = """
+    JOIN operations.inspector i ON i.id = ie.inspector_id
+    LEFT JOIN operations.production_run pr ON pr.lot_id = l.id
+"""
+
+
+def iter_analysis_event_chunks(
+    engine: Engine,
+    after_id: int | None = None,
+    chunksize: int = 50_000,
+    filters: DefectFilters | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Stream defect rows in ``inspection_event.id`` order, one chunk at a time.
+
+    A server-side cursor (``stream_results``) keeps at most ``chunksize`` rows
+    on the client, so peak memory is bounded by the chunk size rather than
+    table history. Chunks carry the analysis columns plus ``event_id`` and can
+    be folded straight into ``DefectAggregateState.apply``. ``filters``
+    restricts the stream to a slice (e.g. a report's date window).
+
+    Time complexity: O(n) where n is defect rows streamed.
+    Space complexity: O(chunksize).
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+
+    predicates, params = filters.to_sql() if filters is not None else ([], {})
+    predicates.insert(0, "ie.qty_defects > 0")
+    if after_id is not None:
+        predicates.append("ie.id > :after_id")
+        params["after_id"] = after_id
+    # A date window filters inspection_event alone; only run/inspector filters need the extra joins.
+    needs_joins = filters is not None and any(
+        value is not None for value in (filters.line_id, filters.shift, filters.inspector_name)
+    )
+    joins = _ANALYSIS_STREAM_FILTER_JOINS if needs_joins else ""
+    query = text(_ANALYSIS_STREAM_SELECT + joins + "WHERE " + " AND ".join(predicates) + " ORDER BY ie.id")
+
+    with engine.connect() as connection:
+        streaming = connection.execution_options(stream_results=True, max_row_buffer=chunksize)
+        for chunk in pd.read_sql_query(query, streaming, params=params, chunksize=chunksize):
+            chunk["inspection_timestamp"] = pd.to_datetime(chunk["inspection_timestamp"], errors="coerce")
+            chunk["qty_defects"] = pd.to_numeric(chunk["qty_defects"], errors="coerce").fillna(0).astype(int)
+            yield chunk
+
+
+def fetch_defect_events(engine: Engine, defect_id: str) -> pd.DataFrame:
+    """Fetch defect occurrences (qty_defects > 0) for one defect code.
+
+    Backed by the partial index ``idx_insp_defect_occ`` on (defect_type_id,
+    inspection_timestamp), so drill-down latency depends on the selected
+    defect's row count rather than total history size.
+
+    Time complexity: O(k log n) where k is rows for the defect.
+    Space complexity: O(k).
+    """
+    return _read_events(
+        engine,
         """
+        WHERE dt.defect_id = :defect_id
+          AND ie.qty_defects > 0
+        """
+        + _DRILL_DOWN_ORDER,
+        {"defect_id": defect_id},
+        "fetch.defect_events",
+    )
+
+
+def fetch_filtered_defect_events(
+    engine: Engine,
+    filters: DefectFilters,
+    defect_id: str | None = None,
+) -> pd.DataFrame:
+    """Fetch defect occurrences (qty_defects > 0) matching ``filters``.
+
+    Predicates are pushed into SQL so each filter change is answered from the
+    dimension indexes instead of reclassifying the full history. Pass
+    ``defect_id`` to narrow to one code for a filtered drill-down.
+
+    Time complexity: O(k log n) where k is matching rows.
+    Space complexity: O(k).
+    """
+    clauses, params = _filtered_event_clauses(filters, defect_id)
+    return _read_events(engine, clauses, params, "fetch.filtered_events")
+
+
+def _filtered_event_clauses(filters: DefectFilters, defect_id: str | None) -> tuple[str, dict[str, object]]:
+    """Return the WHERE/ORDER clauses and parameters of ``fetch_filtered_defect_events``.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    predicates, params = filters.to_sql()
+    predicates.insert(0, "ie.qty_defects > 0")
+    if defect_id is not None:
+        predicates.append("dt.defect_id = :defect_id")
+        params["defect_id"] = defect_id
+    return "WHERE " + " AND ".join(predicates) + _DRILL_DOWN_ORDER, params
+
+
+def _defect_predicates(defect_id: str, filters: DefectFilters | None) -> tuple[list[str], dict[str, object]]:
+    """Return WHERE predicates for one defect's occurrences within ``filters``.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    predicates, params = filters.to_sql() if filters is not None else ([], {})
+    predicates[:0] = ["dt.defect_id = :defect_id", "ie.qty_defects > 0"]
+    params["defect_id"] = defect_id
+    return predicates, params
+
+
+def fetch_defect_occurrences(engine: Engine, defect_id: str, filters: DefectFilters | None = None) -> pd.DataFrame:
+    """Fetch only the analysis columns of one defect's occurrences.
+
+    Enough for ``analysis.drill_down_defect`` explainability and the rolling
+    timeline, without transferring notes, dispositions or dimension columns
+    for every row; full rows are read a page at a time with
+    ``fetch_defect_events_page``.
+
+    Time complexity: O(k log n) where k is rows for the defect.
+    Space complexity: O(k).
+    """
+    predicates, params = _defect_predicates(defect_id, filters)
+    clauses = "WHERE " + " AND ".join(predicates) + _DRILL_DOWN_ORDER
+    return _read_events(engine, clauses, params, "fetch.defect_occurrences", select=_OCCURRENCE_SELECT)
+
+
+@dataclass(frozen=True)
+class EventCursor:
+    """Keyset position after the last row of a drill-down page.
+
+    Attributes:
+        inspection_timestamp: Timestamp of the last row shown.
+        normalized_lot_id: Lot of the last row shown.
+        event_id: ``inspection_event.id`` of the last row shown (tiebreaker).
+
+    Space complexity: O(1).
+    """
+
+    inspection_timestamp: datetime
+    normalized_lot_id: str
+    event_id: int
+
+
+def fetch_defect_events_page(
+    engine: Engine,
+    defect_id: str,
+    page_size: int = 100,
+    after: EventCursor | None = None,
+    filters: DefectFilters | None = None,
+) -> tuple[pd.DataFrame, EventCursor | None]:
+    """Fetch one page of a defect's full event rows in drill-down order.
+
+    Keyset pagination on (inspection_timestamp DESC, normalized_lot_id,
+    event_id): each page seeks past ``after`` through ``idx_insp_defect_occ``
+    instead of skipping OFFSET rows, so deep pages cost the same as the
+    first. Returns the page and the cursor for the next one (None on the
+    last page).
+
+    Time complexity: O(log n + page_size).
+    Space complexity: O(page_size).
+    """
+    clauses, params = _event_page_clauses(defect_id, page_size, after, filters)
+    frame = _read_events(engine, clauses, params, "fetch.defect_events_page")
+    return _split_event_page(frame, page_size)
+
+
+def _event_page_clauses(
+    defect_id: str,
+    page_size: int,
+    after: EventCursor | None,
+    filters: DefectFilters | None,
+) -> tuple[str, dict[str, object]]:
+    """Return the keyset WHERE/ORDER/LIMIT clauses of ``fetch_defect_events_page``.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+
+    predicates, params = _defect_predicates(defect_id, filters)
+    if after is not None:
+        # The redundant "<=" bound gives the planner an index range on
+        # (defect_type_id, inspection_timestamp); the OR resolves ties.
+        predicates.append(
+            "ie.inspection_timestamp <= :after_ts AND (ie.inspection_timestamp < :after_ts"
+            " OR (l.normalized_lot_id > :after_lot)"
+            " OR (l.normalized_lot_id = :after_lot AND ie.id > :after_id))"
+        )
+        params.update(
+            after_ts=after.inspection_timestamp,
+            after_lot=after.normalized_lot_id,
+            after_id=after.event_id,
+        )
+    # One extra row tells whether another page exists.
+    params["page_limit"] = page_size + 1
+    return "WHERE " + " AND ".join(predicates) + _DRILL_DOWN_ORDER + " LIMIT :page_limit", params
+
+
+def _split_event_page(frame: pd.DataFrame, page_size: int) -> tuple[pd.DataFrame, EventCursor | None]:
+    """Trim the look-ahead row of a ``page_size + 1`` read and build the next cursor.
+
+    Time complexity: O(page_size).
+    Space complexity: O(page_size).
+    """
+    if len(frame) <= page_size:
+        return frame, None
+    page = frame.iloc[:page_size].reset_index(drop=True)
+    last = page.iloc[-1]
+    cursor = EventCursor(
+        inspection_timestamp=last["inspection_timestamp"].to_pydatetime(),
+        normalized_lot_id=str(last["normalized_lot_id"]),
+        event_id=int(last["event_id"]),
+    )
+    return page, cursor
+
+
+# Column order returned by fetch_lot_impact.
+LOT_IMPACT_COLUMNS = [
+    "defect_id",
+    "severity",
+    "normalized_lot_id",
+    "part_number",
+    "line_id",
+    "shift",
+    "defect_events",
+    "qty_defects",
+    "first_detected",
+    "last_detected",
+    "sales_order",
+    "customer",
+    "ship_date",
+    "ship_status",
+    "qty_shipped",
+]
+
+
+# Lot impact: one set-based statement. The CTE reduces the defects' occurrences
+# (index-only on idx_insp_defect_occ) to one row per (lot, defect); production
+# runs and shipments then join by lot key (idx_prod_lot_id, idx_ship_lot_id),
+# so the cost does not grow with one round trip per lot. LEFT JOINs keep lots
+# that have no run record or have not shipped yet.
+_LOT_IMPACT_QUERY = """
+    WITH affected AS (
         SELECT
+            ie.lot_id,
             dt.defect_id,
             dt.severity,
-            l.normalized_lot_id,
-            ie.inspection_timestamp,
-            ie.qty_checked,
-            ie.qty_defects,
-            ie.disposition,
-            ie.notes,
-            i.inspector_name
+            COUNT(*) AS defect_events,
+            SUM(ie.qty_defects) AS qty_defects,
+            MIN(ie.inspection_timestamp) AS first_detected,
+            MAX(ie.inspection_timestamp) AS last_detected
         FROM operations.inspection_event ie
-        JOIN operations.lot l ON l.id = ie.lot_id
-        JOIN operations.inspector i ON i.id = ie.inspector_id
-        LEFT JOIN operations.defect_type dt ON dt.id = ie.defect_type_id
-        """
+        JOIN operations.defect_type dt ON dt.id = ie.defect_type_id
+        {filter_joins}
+        WHERE {predicates}
+        GROUP BY ie.lot_id, dt.defect_id, dt.severity
     )
+    SELECT
+        a.defect_id,
+        a.severity,
+        l.normalized_lot_id,
+        l.part_number,
+        pr.line_id,
+        pr.shift,
+        a.defect_events,
+        a.qty_defects,
+        a.first_detected,
+        a.last_detected,
+        s.sales_order,
+        s.customer,
+        s.ship_date,
+        s.ship_status,
+        s.qty_shipped
+    FROM affected a
+    JOIN operations.lot l ON l.id = a.lot_id
+    LEFT JOIN operations.production_run pr ON pr.lot_id = a.lot_id
+    LEFT JOIN operations.shipment s ON s.lot_id = a.lot_id
+    ORDER BY a.defect_id, l.normalized_lot_id, s.ship_date, s.id
+"""
 
-    # The context manager guarantees the DB connection is closed promptly,
-    # preventing leaked connections in long-running UI sessions.
+
+def _lot_impact_query(defect_ids: list[str], filters: DefectFilters | None) -> tuple[TextClause, dict[str, object]]:
+    """Return the lot-impact statement and parameters (shared by sync and async reads).
+
+    Time complexity: O(d), where d is defect codes.
+    Space complexity: O(d).
+    """
+    predicates, params = filters.to_sql() if filters is not None else ([], {})
+    predicates[:0] = ["dt.defect_id IN :defect_ids", "ie.qty_defects > 0"]
+    params["defect_ids"] = list(defect_ids)
+    # As in iter_analysis_event_chunks: only dimension filters need the lot/run/inspector joins.
+    needs_joins = filters is not None and any(
+        value is not None for value in (filters.line_id, filters.part_number, filters.shift, filters.inspector_name)
+    )
+    filter_joins = "JOIN operations.lot l ON l.id = ie.lot_id" + _ANALYSIS_STREAM_FILTER_JOINS if needs_joins else ""
+    query = text(_LOT_IMPACT_QUERY.format(filter_joins=filter_joins, predicates=" AND ".join(predicates)))
+    # Expanding bind: one placeholder per code, portable across drivers.
+    return query.bindparams(bindparam("defect_ids", expanding=True)), params
+
+
+def _coerce_lot_impact(frame: pd.DataFrame) -> pd.DataFrame:
+    """Normalize driver-returned lot-impact columns in place.
+
+    Time complexity: O(k).
+    Space complexity: O(k).
+    """
+    for column in ("first_detected", "last_detected", "ship_date"):
+        frame[column] = pd.to_datetime(frame[column], errors="coerce")
+    for column in ("defect_events", "qty_defects"):
+        frame[column] = pd.to_numeric(frame[column], errors="coerce").fillna(0).astype(int)
+    # Nullable: unshipped lots have no shipment row.
+    frame["qty_shipped"] = pd.to_numeric(frame["qty_shipped"], errors="coerce").astype("Int64")
+    return frame
+
+
+def fetch_lot_impact(
+    engine: Engine,
+    defect_ids: list[str],
+    filters: DefectFilters | None = None,
+) -> pd.DataFrame:
+    """Fetch every lot affected by ``defect_ids`` with its production run and shipments.
+
+    Returns one row per (defect, lot, shipment) with the lot's occurrence
+    counts, line and shift, and the shipment's customer, status and quantity;
+    lots that have not shipped appear once with null shipment columns.
+    ``filters`` restricts which occurrences mark a lot as affected. The whole
+    set is answered by one statement, however many lots are affected.
+
+    Time complexity: O(k log n + a + s) where k is matching occurrences, a
+    affected lots and s their shipments.
+    Space complexity: O(a + s).
+    """
+    with stage("fetch.lot_impact") as timing:
+        if not defect_ids:
+            # An empty IN list is not valid SQL everywhere; nothing is affected.
+            frame = pd.DataFrame(columns=LOT_IMPACT_COLUMNS)
+        else:
+            query, params = _lot_impact_query(defect_ids, filters)
+            with engine.connect() as connection:
+                frame = pd.read_sql_query(query, connection, params=params)
+        frame = _coerce_lot_impact(frame)
+        timing.rows = len(frame)
+    return frame
+
+
+_FILTER_OPTION_QUERIES = {
+    "line_id": "SELECT DISTINCT line_id AS value FROM operations.production_run WHERE line_id IS NOT NULL",
+    "part_number": "SELECT DISTINCT part_number AS value FROM operations.lot",
+    "shift": "SELECT DISTINCT shift AS value FROM operations.production_run WHERE shift IS NOT NULL",
+    "inspector_name": "SELECT DISTINCT inspector_name AS value FROM operations.inspector",
+}
+
+
+def fetch_filter_options(engine: Engine) -> dict[str, list[str]]:
+    """Return the distinct values offered by each dashboard filter.
+
+    Time complexity: O(l + r + i) over lots, production runs and inspectors
+    (index-only scans in Postgres).
+    Space complexity: O(d), where d is distinct values.
+    """
     with engine.connect() as connection:
-        frame = pd.read_sql_query(query, connection)
+        return {
+            name: sorted(str(row.value) for row in connection.execute(text(query)))
+            for name, query in _FILTER_OPTION_QUERIES.items()
+        }
 
-    # Parse timestamps once so all downstream logic can rely on datetime dtype.
-    frame["inspection_timestamp"] = pd.to_datetime(frame["inspection_timestamp"], errors="coerce")
-    # Enforce numeric defects to prevent string comparisons during filtering.
-    frame["qty_defects"] = pd.to_numeric(frame["qty_defects"], errors="coerce").fillna(0).astype(int)
+
+def fetch_normalized_lot_ids(engine: Engine) -> list[str]:
+    """Return every stored ``normalized_lot_id`` (known lots for ingestion).
+
+    Time complexity: O(l) for l lots (index-only scan in Postgres).
+    Space complexity: O(l).
+    """
+    with engine.connect() as connection:
+        return list(connection.execute(text("SELECT normalized_lot_id FROM operations.lot")).scalars())
+
+
+def _parse_week_starts(value: object) -> list[pd.Timestamp]:
+    """Normalize an aggregated week-start value into sorted timestamps.
+
+    Postgres returns ``ARRAY_AGG`` as a Python list; drivers without array
+    support (e.g. SQLite ``group_concat``) return a comma-separated string.
+
+    Time complexity: O(w log w), where w is weeks in the value.
+    Space complexity: O(w).
+    """
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return []
+    items = value.split(",") if isinstance(value, str) else list(value)
+    return sorted(pd.Timestamp(item) for item in items if item not in ("", None))
+
+
+_DEFECT_SUMMARY_QUERY = """
+    SELECT
+        defect_id,
+        severity,
+        impacted_lot_count,
+        weeks_with_defects,
+        first_detected,
+        last_detected,
+        total_defects,
+        week_starts
+    FROM operations.mv_defect_summary
+"""
+
+
+def fetch_defect_summary(engine: Engine) -> pd.DataFrame:
+    """Fetch pre-aggregated per-defect statistics from the materialized view.
+
+    Returns one row per (defect_id, severity) with the aggregate columns used
+    by ``analysis.classify_defect_summary`` plus the distinct ``week_starts``
+    list, so the list view transfers O(g) rows instead of O(n) events.
+
+    Time complexity: O(g + c), where g is defect count and c is distinct
+    defect-weeks.
+    Space complexity: O(g + c).
+    """
+    with stage("fetch.defect_summary") as timing, engine.connect() as connection:
+        frame = pd.read_sql_query(text(_DEFECT_SUMMARY_QUERY), connection)
+        timing.rows = len(frame)
+    return _coerce_defect_summary(frame)
+
+
+def _coerce_defect_summary(frame: pd.DataFrame) -> pd.DataFrame:
+    """Normalize materialized-view summary rows in place.
+
+    Time complexity: O(g + c).
+    Space complexity: O(g + c).
+    """
+    frame["first_detected"] = pd.to_datetime(frame["first_detected"], errors="coerce")
+    frame["last_detected"] = pd.to_datetime(frame["last_detected"], errors="coerce")
+    frame["week_starts"] = frame["week_starts"].map(_parse_week_starts)
+    return frame
+
+
+def refresh_defect_summary(engine: Engine) -> None:
+    """Refresh the per-defect materialized view after new loads.
+
+    CONCURRENTLY keeps the view readable by dashboards during the refresh; it
+    relies on the unique index defined in ``db/schema.sql``.
+    The same transaction bumps ``operations.data_version`` (when present), so
+    caches keyed on it drop summaries read before the refresh committed.
+
+    Time complexity: O(n) where n is inspection rows scanned by Postgres.
+    Space complexity: O(1) on the client.
+    """
+    with engine.begin() as connection:
+        connection.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY operations.mv_defect_summary"))
+        # A refresh fires no trigger. Without this bump a dashboard read between
+        # the load's commit and the refresh would cache the stale view under the
+        # load's version; same transaction, so the new version implies the new view.
+        if _has_data_version_table(connection):
+            connection.execute(text("SELECT operations.next_data_version()"))
+
+
+_DEFECT_WEEK_ROLLUP_QUERY = """
+    SELECT
+        dt.defect_id,
+        dt.severity,
+        r.week_start,
+        l.normalized_lot_id,
+        r.qty_defects,
+        r.event_count,
+        r.first_detected,
+        r.last_detected
+    FROM operations.defect_week_rollup r
+    JOIN operations.defect_type dt ON dt.id = r.defect_type_id
+    JOIN operations.lot l ON l.id = r.lot_id
+"""
+
+
+def fetch_defect_week_rollup(engine: Engine) -> pd.DataFrame:
+    """Fetch the trigger-maintained weekly rollup in ``rollup.ROLLUP_COLUMNS`` shape.
+
+    One row per (defect type, week, lot) cell, so the transfer is O(c) rather
+    than O(n) events; classify with ``rollup.classify_rollup``.
+
+    Time complexity: O(c), where c is rollup cells.
+    Space complexity: O(c).
+    """
+    with stage("fetch.defect_week_rollup") as timing, engine.connect() as connection:
+        frame = pd.read_sql_query(text(_DEFECT_WEEK_ROLLUP_QUERY), connection)
+        timing.rows = len(frame)
+    return _coerce_defect_week_rollup(frame)
+
+
+def _coerce_defect_week_rollup(frame: pd.DataFrame) -> pd.DataFrame:
+    """Normalize rollup cell rows in place.
+
+    Time complexity: O(c).
+    Space complexity: O(c).
+    """
+    for column in ("week_start", "first_detected", "last_detected"):
+        frame[column] = pd.to_datetime(frame[column], errors="coerce")
+    frame["qty_defects"] = frame["qty_defects"].astype("int64")
+    frame["event_count"] = frame["event_count"].astype("int64")
     return frame
+
+
+def refresh_defect_week_rollup(engine: Engine) -> int:
+    """Rebuild ``operations.defect_week_rollup`` from all inspection events.
+
+    Triggers keep the rollup current on every insert, update and delete, so
+    this is only needed to backfill a database created before the rollup
+    existed or to repair it (e.g. after ``TRUNCATE``, which fires no row
+    triggers). Idempotent: rerunning yields the same table. Returns the
+    number of cells written.
+
+    Time complexity: O(n) where n is inspection rows scanned by Postgres.
+    Space complexity: O(1) on the client.
+    """
+    with engine.begin() as connection:
+        # The rebuild is one transaction, so readers see the old or the new rollup.
+        connection.execute(text("DELETE FROM operations.defect_week_rollup"))
+        result = connection.execute(
+            text(
+                """
+                INSERT INTO operations.defect_week_rollup
+                    (defect_type_id, week_start, lot_id, qty_defects, event_count, first_detected, last_detected)
+                SELECT
+                    defect_type_id,
+                    operations.defect_week_start(inspection_timestamp),
+                    lot_id,
+                    SUM(qty_defects),
+                    COUNT(*),
+                    MIN(inspection_timestamp),
+                    MAX(inspection_timestamp)
+                FROM operations.inspection_event
+                WHERE qty_defects > 0 AND defect_type_id IS NOT NULL
+                GROUP BY 1, 2, 3
+                """
+            )
+        )
+        return max(result.rowcount, 0)
+
+
+_DATA_VERSION_QUERY = """
+    SELECT
+        COALESCE(MAX(id), 0) AS max_event_id,
+        COUNT(*) AS row_count,
+        MAX(inspection_timestamp) AS max_timestamp,
+        {counter} AS counter
+    FROM operations.inspection_event
+"""
+
+
+def _data_version_query(has_counter: bool) -> str:
+    """Return the probe query, reading the data_version counter when it exists.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    return _DATA_VERSION_QUERY.format(counter="(SELECT version FROM operations.data_version)" if has_counter else "NULL")
+
+
+def _has_data_version_table(connection: Connection) -> bool:
+    """Return whether the schema has ``operations.data_version`` (section 4d).
+
+    Time complexity: O(1) catalog lookup.
+    Space complexity: O(1).
+    """
+    return inspect(connection).has_table("data_version", schema="operations")
+
+
+def probe_data_version(engine: Engine) -> DataVersion:
+    """Return the current ``DataVersion`` using a single tiny aggregate query.
+
+    MAX(id) and MAX(inspection_timestamp) are served from indexes; COUNT(*)
+    can use an index-only scan on the primary key. Those alone miss in-place
+    updates, so the trigger-maintained counter is included when present.
+
+    Time complexity: O(log n) for the MAX lookups plus the COUNT scan in Postgres.
+    Space complexity: O(1).
+    """
+    with engine.connect() as connection:
+        row = connection.execute(text(_data_version_query(_has_data_version_table(connection)))).one()
+    return _data_version_from_row(row)
+
+
+# NOTIFY channel of operations.bump_data_version(); the payload is the new version.
+DATA_VERSION_CHANNEL = "steelworks_data_version"
+
+_DATA_VERSION_COUNTER_QUERY = "SELECT version FROM operations.data_version"
+_REWRITE_VERSION_QUERY = "SELECT rewrite_version FROM operations.data_version"
+
+
+def get_data_version(engine: Engine) -> int:
+    """Return the ``operations.data_version`` counter.
+
+    Triggers bump the counter on every write statement against the tables
+    the dashboard reads, so unlike ``probe_data_version`` this is a primary
+    key lookup that never touches inspection_event.
+
+    Time complexity: O(1) round trip.
+    Space complexity: O(1).
+    """
+    with engine.connect() as connection:
+        return int(connection.execute(text(_DATA_VERSION_COUNTER_QUERY)).scalar_one())
+
+
+def get_rewrite_version(engine: Engine) -> int | None:
+    """Return ``operations.data_version.rewrite_version``, or None without the counter.
+
+    It moves only when stored rows change (updates, deletes), so readers
+    that fold rows above an ``inspection_event.id`` watermark must start over
+    when it differs from the value they were built at. None means in-place
+    changes cannot be detected (schemas created before the counter).
+
+    Time complexity: O(1) round trips.
+    Space complexity: O(1).
+    """
+    with engine.connect() as connection:
+        if not _has_data_version_table(connection):
+            return None
+        return int(connection.execute(text(_REWRITE_VERSION_QUERY)).scalar_one())
+
+
+def _data_version_from_row(row: Row) -> DataVersion:
+    """Build a ``DataVersion`` from the probe query's single row.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    max_timestamp = pd.to_datetime(row.max_timestamp) if row.max_timestamp is not None else None
+    counter = int(row.counter) if row.counter is not None else None
+    return DataVersion(
+        max_event_id=int(row.max_event_id), row_count=int(row.row_count), max_timestamp=max_timestamp, counter=counter
+    )
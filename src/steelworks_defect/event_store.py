@@ -0,0 +1,131 @@
+"""Compact, normalized in-memory representation of inspection events.
+
+``EventStore`` normalizes an events frame once at load time and keeps it in a
+dictionary-encoded layout: text columns become sorted categoricals, quantities
+become int32 and each row carries its precomputed ``W-MON`` week ordinal.
+``classify_defects`` and ``drill_down_defect`` accept a store directly and skip
+per-call normalization and full-history copies.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from steelworks_defect.analysis import _require_analysis_columns, _week_ordinals
+
+
+# Text columns stored as categoricals (one int code per row plus a shared
+# dictionary). Categories are sorted so groupby order matches string sorting.
+_CATEGORICAL_COLUMNS = (
+    "defect_id",
+    "severity",
+    "normalized_lot_id",
+    "inspector_name",
+    "disposition",
+    "notes",
+    "line_id",
+    "part_number",
+    "shift",
+)
+# Quantities fit comfortably in int32 (CHECK constraints keep them >= 0).
+_INT32_COLUMNS = ("qty_checked", "qty_defects")
+
+
+@dataclass(frozen=True)
+class EventStore:
+    """Normalized, dictionary-encoded inspection events.
+
+    Attributes:
+        frame: Compact columns plus ``week_ordinal`` (nullable Int32). Treat as
+            read-only; analysis functions read it without copying.
+        source_dtypes: Original column order and dtypes, used by ``to_frame``.
+
+    Space complexity: O(n + u), where n is rows and u is distinct text values.
+    """
+
+    frame: pd.DataFrame
+    source_dtypes: dict[str, object]
+
+    @classmethod
+    def from_frame(cls, events: pd.DataFrame) -> EventStore:
+        """Normalize ``events`` once into the compact layout.
+
+        Applies the same coercions as ``analysis._normalize_analysis_frame``
+        (unparseable timestamps become NaT, non-numeric defect counts become 0).
+
+        Time complexity: O(n log u), dominated by category inference.
+        Space complexity: O(n + u).
+        """
+        _require_analysis_columns(events)
+
+        compact: dict[str, object] = {}
+        for column in events.columns:
+            values = events[column]
+            if column in _CATEGORICAL_COLUMNS:
+                compact[column] = values.astype("string").astype("category")
+            elif column in _INT32_COLUMNS:
+                compact[column] = pd.to_numeric(values, errors="coerce").fillna(0).astype(np.int32)
+            elif column == "inspection_timestamp":
+                compact[column] = pd.to_datetime(values, errors="coerce")
+            else:
+                compact[column] = values
+        frame = pd.DataFrame(compact, index=pd.RangeIndex(len(events)))
+        frame["week_ordinal"] = _week_ordinals(frame["inspection_timestamp"]).astype("Int32")
+        return cls(frame=frame, source_dtypes=dict(events.dtypes.items()))
+
+    def __len__(self) -> int:
+        """Return the number of stored events.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        return len(self.frame)
+
+    def memory_usage(self) -> int:
+        """Return the store's deep memory footprint in bytes.
+
+        Time complexity: O(c + u), where c is column count.
+        Space complexity: O(c).
+        """
+        return int(self.frame.memory_usage(deep=True).sum())
+
+    def _restore(self, compact: pd.DataFrame) -> pd.DataFrame:
+        """Expand compact rows back to the original column order and dtypes.
+
+        Time complexity: O(k) for k rows.
+        Space complexity: O(k).
+        """
+        compact = compact.reset_index(drop=True)
+        restored = {}
+        for column, dtype in self.source_dtypes.items():
+            values = compact[column].astype(dtype)
+            # Categoricals decode missing values as <NA>; object columns from
+            # the database use None.
+            restored[column] = values.where(values.notna(), None) if dtype == object else values
+        return pd.DataFrame(restored)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the events in their original DataFrame shape.
+
+        Exact for frames already in ``fetch_inspection_events`` shape; other
+        inputs come back with ``from_frame``'s coercions applied.
+
+        Time complexity: O(n).
+        Space complexity: O(n).
+        """
+        return self._restore(self.frame)
+
+    def select_defect(self, defect_id: str) -> pd.DataFrame:
+        """Return one defect's rows in the original shape.
+
+        Only the selected rows are expanded; the categorical comparison runs on
+        integer codes.
+
+        Time complexity: O(n + k).
+        Space complexity: O(k).
+        """
+        mask = self.frame["defect_id"].eq(defect_id).fillna(False).to_numpy(dtype=bool)
+        return self._restore(self.frame[mask])
@@ -0,0 +1,331 @@
+"""EXPLAIN-based scan regression checks for the dashboard's Postgres queries.
+
+Runs the app's selective reads (drill-down, keyset page, filtered slice, lot
+impact, incremental watermark reads) exactly as ``db.py`` issues them: each
+read is executed once with its SQL captured at the cursor, then re-run under
+``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)``. A sequential scan of a guarded
+fact table that filters most of what it reads means an index stopped
+matching (a dropped index, a rewritten predicate, an un-analyzed table) and
+fails the check. Full-history reads
+(classification stream, rollup, materialized view) scan by design and are
+not part of the workload.
+
+Usage:
+    poetry run explain-check --database-url postgresql+psycopg://localhost:5432/steelworks
+    poetry run explain-check --database-url URL --scratch-rows 200000 --partitioned   # DROPS and reloads the operations schema
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from steelworks_defect.db import (
+    DefectFilters,
+    create_db_engine,
+    fetch_defect_events_page,
+    fetch_defect_occurrences,
+    fetch_filtered_defect_events,
+    fetch_inspection_events,
+    fetch_lot_impact,
+    iter_analysis_event_chunks,
+)
+
+
+# Fact tables that must never be read with a Seq Scan by the workload.
+# Month partitions (inspection_event_2026_01, inspection_event_default) match by prefix.
+SCAN_GUARDED_TABLES = ("inspection_event", "shipment")
+
+# Rows above the watermark for the incremental reads.
+_WATERMARK_ROWS = 1_000
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """EXPLAIN ANALYZE outcome of one captured statement.
+
+    Attributes:
+        name: Workload entry, suffixed ``#i`` when it issued several statements.
+        execution_ms: Server-side execution time.
+        shared_hit_blocks: Buffer cache hits for the whole plan.
+        shared_read_blocks: Blocks read from disk (or the OS cache).
+        relations: Relations scanned, in plan order (partitions listed individually).
+        seq_scans: Guarded relations read by a wasteful sequential scan.
+        plan: The root plan node, for drilling into a failure.
+
+    Space complexity: O(p), where p is plan nodes.
+    """
+
+    name: str
+    execution_ms: float
+    shared_hit_blocks: int
+    shared_read_blocks: int
+    relations: tuple[str, ...]
+    seq_scans: tuple[str, ...]
+    plan: dict[str, object]
+
+
+def plan_nodes(plan: dict[str, object]) -> Iterator[dict[str, object]]:
+    """Yield every node of an EXPLAIN JSON plan tree, depth first.
+
+    Time complexity: O(p).
+    Space complexity: O(d), where d is plan depth.
+    """
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def _is_guarded(relation: str, guarded: tuple[str, ...]) -> bool:
+    """Return True when ``relation`` is a guarded table or one of its partitions.
+
+    Time complexity: O(t).
+    Space complexity: O(1).
+    """
+    return any(relation == table or relation.startswith(f"{table}_") for table in guarded)
+
+
+def sequential_scans(
+    plan: dict[str, object],
+    guarded: tuple[str, ...] = SCAN_GUARDED_TABLES,
+    min_rows: int = 10_000,
+    max_discard: float = 0.5,
+) -> list[str]:
+    """Return guarded relations that ``plan`` reads with a wasteful Seq Scan.
+
+    A sequential scan counts when it reads at least ``min_rows`` rows and its
+    filter discards more than ``max_discard`` of them: the signature of a
+    missing or unusable index. Scans of small relations (a nearly empty
+    month partition) and of pruned partitions the query mostly needs are
+    what the planner should choose, so they pass.
+
+    Time complexity: O(p * t).
+    Space complexity: O(p).
+    """
+    flagged = []
+    for node in plan_nodes(plan):
+        relation = str(node.get("Relation Name", ""))
+        if node.get("Node Type") != "Seq Scan" or not _is_guarded(relation, guarded):
+            continue
+        loops = int(node.get("Actual Loops", 1))
+        kept = float(node.get("Actual Rows", 0)) * loops
+        discarded = float(node.get("Rows Removed by Filter", 0)) * loops
+        scanned = kept + discarded
+        if scanned >= min_rows and discarded > max_discard * scanned:
+            flagged.append(relation)
+    return flagged
+
+
+def capture_statements(engine: Engine, func: Callable[[Engine], object]) -> list[tuple[str, object]]:
+    """Run ``func(engine)`` and return the (SQL, DB-API parameters) it executed.
+
+    Generators are drained so streamed reads issue their statement.
+
+    Time complexity: O(T(func)).
+    Space complexity: O(q), where q is statements executed.
+    """
+    statements: list[tuple[str, object]] = []
+
+    def before_cursor_execute(_connection, _cursor, statement, parameters, _context, _executemany) -> None:
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = func(engine)
+        if isinstance(result, Iterator):
+            for _ in result:
+                pass
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def explain_statement(engine: Engine, statement: str, parameters: object) -> dict[str, object]:
+    """Return the ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` document of one statement.
+
+    The statement is executed (ANALYZE), so pass read-only SQL only.
+
+    Time complexity: O(statement).
+    Space complexity: O(p).
+    """
+    raw_connection = engine.raw_connection()
+    try:
+        with raw_connection.driver_connection.cursor() as cursor:
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters)
+            document = cursor.fetchone()[0][0]
+        raw_connection.rollback()
+    finally:
+        raw_connection.close()
+    return document
+
+
+def app_query_workload(engine: Engine) -> list[tuple[str, Callable[[Engine], object]]]:
+    """Build the selective app reads to check, sized from the loaded data.
+
+    Drill-downs use the defect with the median occurrence count (a typical
+    code, not the outlier whose rows are a large share of the table); the
+    filtered slice is the latest four weeks of one production line.
+
+    Time complexity: O(g) plus two index probes in Postgres.
+    Space complexity: O(g), where g is defect codes.
+    """
+    with engine.connect() as connection:
+        counts = connection.execute(
+            text(
+                """
+                SELECT dt.defect_id, COUNT(*) AS occurrences
+                FROM operations.inspection_event ie
+                JOIN operations.defect_type dt ON dt.id = ie.defect_type_id
+                WHERE ie.qty_defects > 0
+                GROUP BY dt.defect_id
+                ORDER BY occurrences, dt.defect_id
+                """
+            )
+        ).all()
+        bounds = connection.execute(
+            text("SELECT MAX(id), MAX(inspection_timestamp) FROM operations.inspection_event")
+        ).one()
+        line_id = connection.execute(
+            text("SELECT MIN(line_id) FROM operations.production_run WHERE line_id IS NOT NULL")
+        ).scalar()
+    if not counts:
+        raise ValueError("No defect occurrences to explain; load data or pass --scratch-rows")
+
+    defect_id = str(counts[len(counts) // 2].defect_id)
+    watermark = max(int(bounds[0]) - _WATERMARK_ROWS, 0)
+    window_end = bounds[1].date()
+    recent_line = DefectFilters(start=window_end - timedelta(weeks=4), end=window_end, line_id=line_id)
+    return [
+        ("fetch_defect_occurrences", lambda e: fetch_defect_occurrences(e, defect_id)),
+        ("fetch_defect_events_page", lambda e: fetch_defect_events_page(e, defect_id, page_size=50)),
+        ("fetch_filtered_defect_events[recent line]", lambda e: fetch_filtered_defect_events(e, recent_line)),
+        ("fetch_filtered_defect_events[defect]", lambda e: fetch_filtered_defect_events(e, recent_line, defect_id)),
+        ("fetch_lot_impact", lambda e: fetch_lot_impact(e, [defect_id])),
+        ("fetch_inspection_events[after_id]", lambda e: fetch_inspection_events(e, after_id=watermark)),
+        ("iter_analysis_event_chunks[after_id]", lambda e: iter_analysis_event_chunks(e, after_id=watermark)),
+    ]
+
+
+def run_explain_checks(
+    engine: Engine,
+    guarded: tuple[str, ...] = SCAN_GUARDED_TABLES,
+    min_rows: int = 10_000,
+) -> list[QueryPlan]:
+    """EXPLAIN ANALYZE every statement of the app workload.
+
+    ``min_rows`` is the smallest sequential scan flagged (see ``sequential_scans``).
+
+    Time complexity: O(w), where w is the workload's query cost (run twice).
+    Space complexity: O(p) per plan.
+    """
+    plans = []
+    for name, func in app_query_workload(engine):
+        statements = capture_statements(engine, func)
+        for index, (statement, parameters) in enumerate(statements):
+            document = explain_statement(engine, statement, parameters)
+            root = document["Plan"]
+            plans.append(
+                QueryPlan(
+                    name=name if len(statements) == 1 else f"{name}#{index}",
+                    execution_ms=float(document["Execution Time"]),
+                    shared_hit_blocks=int(root.get("Shared Hit Blocks", 0)),
+                    shared_read_blocks=int(root.get("Shared Read Blocks", 0)),
+                    relations=tuple(str(node["Relation Name"]) for node in plan_nodes(root) if "Relation Name" in node),
+                    seq_scans=tuple(sequential_scans(root, guarded, min_rows)),
+                    plan=root,
+                )
+            )
+    return plans
+
+
+def vacuum_analyze(engine: Engine) -> None:
+    """VACUUM ANALYZE the ``operations`` tables after a bulk load.
+
+    ANALYZE gives the planner row estimates; VACUUM sets the visibility map
+    that index-only scans (the covering index) depend on.
+
+    Time complexity: O(n) in Postgres.
+    Space complexity: O(1) on the client.
+    """
+    # VACUUM cannot run inside a transaction block.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        tables = connection.execute(
+            text("SELECT tablename FROM pg_tables WHERE schemaname = 'operations' ORDER BY tablename")
+        ).scalars()
+        for table in list(tables):
+            connection.execute(text(f'VACUUM ANALYZE operations."{table}"'))
+
+
+def format_plans(plans: list[QueryPlan]) -> str:
+    """Render plans as an aligned table, flagging sequential scans.
+
+    Time complexity: O(q).
+    Space complexity: O(q).
+    """
+    lines = [f"{'query':<42}{'ms':>9}{'hit':>9}{'read':>8}  scans"]
+    for plan in plans:
+        guarded = [relation for relation in plan.relations if _is_guarded(relation, SCAN_GUARDED_TABLES)]
+        # With partitioning, the count shows pruning (months touched).
+        scans = f"{len(guarded)} guarded relation(s)"
+        if plan.seq_scans:
+            scans = "SEQ SCAN " + ", ".join(sorted(set(plan.seq_scans)))
+        lines.append(
+            f"{plan.name:<42}{plan.execution_ms:>9.2f}{plan.shared_hit_blocks:>9}{plan.shared_read_blocks:>8}  {scans}"
+        )
+    lines.append(f"median execution {statistics.median(plan.execution_ms for plan in plans):.2f} ms")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """CLI entry point for `poetry run explain-check`; exits 1 on any guarded seq scan.
+
+    Time complexity: O(w), plus the load with ``--scratch-rows``.
+    Space complexity: O(p).
+    """
+    parser = argparse.ArgumentParser(description="Fail when the app's queries fall back to sequential scans.")
+    parser.add_argument("--database-url", required=True, help="Postgres URL (postgresql+psycopg://...).")
+    parser.add_argument(
+        "--scratch-rows",
+        type=int,
+        default=None,
+        help="Load this many synthetic rows first; the operations schema is DROPPED and recreated.",
+    )
+    parser.add_argument(
+        "--partitioned", action="store_true", help="With --scratch-rows: partition inspection_event by month."
+    )
+    parser.add_argument(
+        "--min-scan-rows", type=int, default=10_000, help="Smallest sequential scan that fails the check."
+    )
+    args = parser.parse_args(argv)
+    if args.partitioned and args.scratch_rows is None:
+        parser.error("--partitioned requires --scratch-rows")
+
+    engine = create_db_engine(args.database_url)
+    try:
+        if args.scratch_rows is not None:
+            # Imported lazily: the benchmark helpers pull in the synthetic generator.
+            from steelworks_defect.benchmark import _load_events, _reset_scratch_database
+            from steelworks_defect.synthetic import generate_inspection_history, generate_shipment_history
+
+            _reset_scratch_database(engine, Path(__file__).resolve().parents[2], partitioned=args.partitioned)
+            events = generate_inspection_history(args.scratch_rows)
+            _load_events(engine, events, generate_shipment_history(events))
+        vacuum_analyze(engine)
+        plans = run_explain_checks(engine, min_rows=args.min_scan_rows)
+    finally:
+        engine.dispose()
+
+    print(format_plans(plans))
+    if any(plan.seq_scans for plan in plans):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Shipment exposure of recurring defects.
+
+``db.fetch_lot_impact`` joins the lots affected by a set of defect codes to
+their production runs and shipments in one statement. This module turns
+those rows into the answer quality engineers need next: per defect, how many
+affected lots have already left the plant, to how many customers, and in
+what quantity, versus how many can still be contained.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from steelworks_defect.instrumentation import stage
+
+
+# Statuses of shipments that have left the plant (product is at the customer).
+SHIPPED_STATUSES = ("Shipped", "Partial")
+
+EXPOSURE_COLUMNS = [
+    "defect_id",
+    "severity",
+    "affected_lots",
+    "shipped_lots",
+    "unshipped_lots",
+    "customer_count",
+    "qty_shipped",
+    "customers",
+]
+
+
+def summarize_exposure(impact: pd.DataFrame) -> pd.DataFrame:
+    """Summarize ``db.fetch_lot_impact`` rows per defect code.
+
+    A lot counts as shipped when any of its shipments has a status in
+    ``SHIPPED_STATUSES``; ``unshipped_lots`` (not shipped, on hold or
+    backordered) are the ones still containable. ``qty_shipped`` and
+    ``customers`` cover shipped rows only. Groups follow defect_id order.
+
+    Time complexity: O(k log g), where k is impact rows and g is defect codes.
+    Space complexity: O(k).
+    """
+    if impact.empty:
+        return pd.DataFrame(columns=EXPOSURE_COLUMNS)
+
+    with stage("summarize_exposure", rows=len(impact)):
+        by_defect = impact.groupby("defect_id", sort=True)
+        exposure = by_defect.agg(
+            severity=("severity", "first"),
+            affected_lots=("normalized_lot_id", "nunique"),
+        )
+
+        shipped = impact[impact["ship_status"].isin(SHIPPED_STATUSES)]
+        by_shipped = shipped.groupby("defect_id", sort=True)
+        exposure["shipped_lots"] = by_shipped["normalized_lot_id"].nunique()
+        exposure["customer_count"] = by_shipped["customer"].nunique()
+        exposure["qty_shipped"] = by_shipped["qty_shipped"].sum()
+        # Deduplicate once per (defect, customer) before joining names.
+        names = shipped.dropna(subset=["customer"]).drop_duplicates(["defect_id", "customer"])
+        exposure["customers"] = names.sort_values("customer").groupby("defect_id")["customer"].agg(", ".join)
+
+        # Defects with no shipped lot are absent from the shipped groupby.
+        for column in ("shipped_lots", "customer_count", "qty_shipped"):
+            exposure[column] = exposure[column].fillna(0).astype(int)
+        exposure["customers"] = exposure["customers"].fillna("")
+        exposure["unshipped_lots"] = exposure["affected_lots"] - exposure["shipped_lots"]
+        return exposure.reset_index()[EXPOSURE_COLUMNS]
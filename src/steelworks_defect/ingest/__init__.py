@@ -0,0 +1,18 @@
+"""Ingestion of the ERP Excel exports (ADR 002 source of truth).
+
+Reads the QE inspector, production and shipping logs, normalizes lot IDs and
+dates, and emits frames shaped for the analysis and database layers.
+"""
+
+from steelworks_defect.ingest.excel import INSPECTION_EVENT_COLUMNS, IngestResult, ingest_directory, read_export
+from steelworks_defect.ingest.lot_ids import LotIdNormalizer, normalize_lot_id, normalize_lot_ids
+
+__all__ = [
+    "INSPECTION_EVENT_COLUMNS",
+    "IngestResult",
+    "LotIdNormalizer",
+    "ingest_directory",
+    "normalize_lot_id",
+    "normalize_lot_ids",
+    "read_export",
+]
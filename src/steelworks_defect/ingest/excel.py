@@ -0,0 +1,403 @@
+"""Streaming, parallel reader for the ERP Excel exports.
+
+Each workbook is opened in openpyxl read-only mode and consumed row by row, so
+memory stays proportional to the populated rows rather than the sheet's full
+formatted range. Workbooks are parsed in a process pool and combined into
+frames shaped for the analysis and loader layers.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from steelworks_defect.ingest.lot_ids import LOT_ID_RESOLUTION_COLUMNS, LotIdNormalizer
+
+
+# Header sets that identify each export kind (ADR 002 source files).
+_KIND_SIGNATURES = {
+    "inspection": {"Inspection Date", "Inspection Time", "Inspector", "Lot ID"},
+    "production": {"Date", "Shift", "Production Line", "Lot ID", "Units Planned"},
+    "shipment": {"Ship Date", "Lot ID", "Qty Shipped"},
+}
+
+# Export header -> canonical column name, per export kind.
+_COLUMN_MAP = {
+    "inspection": {
+        "Inspection Date": "inspection_date",
+        "Inspection Time": "inspection_time",
+        "Inspector": "inspector_name",
+        "Production Line": "line_id",
+        "Lot ID": "raw_lot_id",
+        "Part Number": "part_number",
+        "Defect Code": "defect_id",
+        "Severity": "severity",
+        "Qty Checked": "qty_checked",
+        "Qty Defects": "qty_defects",
+        "Disposition": "disposition",
+        "Notes": "notes",
+    },
+    "production": {
+        "Date": "production_date",
+        "Shift": "shift",
+        "Production Line": "line_id",
+        "Lot ID": "raw_lot_id",
+        "Part Number": "part_number",
+        "Units Planned": "units_planned",
+        "Units Actual": "units_actual",
+        "Downtime (min)": "downtime_minutes",
+        "Primary Issue": "primary_issue",
+    },
+    "shipment": {
+        "Ship Date": "ship_date",
+        "Lot ID": "raw_lot_id",
+        "Sales Order #": "sales_order",
+        "Customer": "customer",
+        "Carrier": "carrier",
+        "BOL #": "bol_number",
+        "Qty Shipped": "qty_shipped",
+        "Ship Status": "ship_status",
+    },
+}
+
+# Column order of db.fetch_inspection_events; lineage columns follow it.
+INSPECTION_EVENT_COLUMNS = [
+    "event_id",
+    "defect_id",
+    "severity",
+    "normalized_lot_id",
+    "inspection_timestamp",
+    "qty_checked",
+    "qty_defects",
+    "disposition",
+    "notes",
+    "inspector_name",
+]
+_LINEAGE_COLUMNS = ["raw_lot_id", "part_number", "line_id", "source_file", "source_row"]
+
+# Numeric day/month/year dates; a first field above 12 means day-first order.
+_NUMERIC_DATE = re.compile(r"^\s*(\d{1,2})[-/](\d{1,2})[-/]\d{2,4}\b")
+
+
+@dataclass(frozen=True)
+class ExportFrame:
+    """Raw rows from one workbook with canonical column names.
+
+    Attributes:
+        kind: "inspection", "production", "shipment", or None when unrecognized.
+        source_file: Workbook file name.
+        frame: Canonical columns plus ``source_row`` (1-based Excel row number).
+
+    Space complexity: O(r), where r is populated rows.
+    """
+
+    kind: str | None
+    source_file: str
+    frame: pd.DataFrame
+
+
+@dataclass(frozen=True)
+class IngestResult:
+    """Normalized frames produced from a directory of exports.
+
+    Attributes:
+        inspections: ``fetch_inspection_events``-shaped rows plus lineage columns.
+        production_runs: One row per production log entry.
+        shipments: One row per shipping log entry.
+        indeterminate: Rows whose lot ID or date could not be resolved (ADR 004).
+        skipped_files: Workbooks whose headers matched no known export.
+        lot_ids: One row per distinct raw lot ID with its normalized ID and
+            resolution status (Exact, Near duplicate or Indeterminate).
+
+    Space complexity: O(r), where r is total populated rows.
+    """
+
+    inspections: pd.DataFrame
+    production_runs: pd.DataFrame
+    shipments: pd.DataFrame
+    indeterminate: pd.DataFrame
+    skipped_files: list[str] = field(default_factory=list)
+    lot_ids: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=LOT_ID_RESOLUTION_COLUMNS))
+
+
+def detect_export_kind(headers: list[str]) -> str | None:
+    """Return the export kind whose signature headers are all present.
+
+    Time complexity: O(h), where h is header count.
+    Space complexity: O(h).
+    """
+    present = set(headers)
+    for kind, signature in _KIND_SIGNATURES.items():
+        if signature.issubset(present):
+            return kind
+    return None
+
+
+def read_export(path: Path) -> ExportFrame:
+    """Stream one workbook's first sheet into a canonical raw frame.
+
+    Blank rows (exports pad sheets with empty formatted rows) are skipped.
+    Top-level so it can be dispatched to a process pool.
+
+    Time complexity: O(r * c), where r is rows and c is columns.
+    Space complexity: O(r * c) for populated rows only.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header_row = next(rows, None)
+        headers = [str(value).strip() if value is not None else "" for value in (header_row or ())]
+        kind = detect_export_kind(headers)
+        if kind is None:
+            return ExportFrame(kind=None, source_file=path.name, frame=pd.DataFrame())
+
+        mapping = _COLUMN_MAP[kind]
+        positions = {mapping[name]: index for index, name in enumerate(headers) if name in mapping}
+        records: list[dict[str, object]] = []
+        # Excel row numbers start at 1 and the header occupies row 1.
+        for excel_row, values in enumerate(rows, start=2):
+            if not any(value is not None and str(value).strip() != "" for value in values):
+                continue
+            record = {
+                column: (values[index] if index < len(values) else None) for column, index in positions.items()
+            }
+            record["source_row"] = excel_row
+            records.append(record)
+    finally:
+        workbook.close()
+
+    frame = pd.DataFrame.from_records(records, columns=[*positions, "source_row"])
+    return ExportFrame(kind=kind, source_file=path.name, frame=frame)
+
+
+def _clean_text(values: pd.Series) -> pd.Series:
+    """Strip whitespace and turn empty strings into nulls.
+
+    Time complexity: O(r).
+    Space complexity: O(r).
+    """
+    text = values.astype("string").str.strip()
+    return text.mask(text == "")
+
+
+def _parse_dates(values: pd.Series, source_files: pd.Series) -> pd.Series:
+    """Parse mixed-format export dates, sniffing day-first order per file.
+
+    Exports mix ISO, US (MM/DD/YYYY, MM-DD-YY) and textual month formats; the
+    weekly inspector log is day-first. Order is decided per source file because
+    files of the same kind disagree. Unparseable values become NaT.
+
+    Time complexity: O(r).
+    Space complexity: O(r).
+    """
+    text = _clean_text(values)
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    for index in text.groupby(source_files, sort=False).groups.values():
+        file_text = text.loc[index]
+        leading = file_text.str.extract(_NUMERIC_DATE)[0]
+        dayfirst = bool((pd.to_numeric(leading, errors="coerce") > 12).any())
+        parsed.loc[index] = pd.to_datetime(file_text, format="mixed", dayfirst=dayfirst, errors="coerce")
+    return parsed
+
+
+def _join_date_time(dates: pd.Series, times: pd.Series) -> pd.Series:
+    """Append the time of day to each date, keeping missing dates null.
+
+    Time complexity: O(r).
+    Space complexity: O(r).
+    """
+    date_text = _clean_text(dates)
+    time_text = _clean_text(times)
+    return date_text.where(time_text.isna(), date_text + " " + time_text)
+
+
+def _to_int(values: pd.Series) -> pd.Series:
+    """Convert float-typed spreadsheet counts to nullable integers.
+
+    Time complexity: O(r).
+    Space complexity: O(r).
+    """
+    return pd.to_numeric(values, errors="coerce").round().astype("Int64")
+
+
+def _normalize_lots(frame: pd.DataFrame, normalizer: LotIdNormalizer) -> pd.Series:
+    """Normalize raw lot IDs through the shared, memoized normalizer.
+
+    Time complexity: O(r) once ``normalizer`` has seen these IDs.
+    Space complexity: O(r).
+    """
+    return normalizer.normalize(frame["raw_lot_id"])
+
+
+def _indeterminate_rows(frame: pd.DataFrame, mask: pd.Series, reason: str) -> pd.DataFrame:
+    """Describe rows excluded under the fail-soft policy.
+
+    Time complexity: O(r).
+    Space complexity: O(k), where k is flagged rows.
+    """
+    flagged = frame.loc[mask, ["source_file", "source_row", "raw_lot_id"]].copy()
+    flagged["reason"] = reason
+    return flagged
+
+
+def _split_indeterminate(frame: pd.DataFrame, date_column: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Separate rows with an unresolved lot ID or date from clean rows.
+
+    Time complexity: O(r).
+    Space complexity: O(r).
+    """
+    bad_lot = frame["normalized_lot_id"].isna()
+    bad_date = frame[date_column].isna() & ~bad_lot
+    flagged = pd.concat(
+        [
+            _indeterminate_rows(frame, bad_lot, "unrecognized lot ID"),
+            _indeterminate_rows(frame, bad_date, f"unparseable {date_column}"),
+        ],
+        ignore_index=True,
+    )
+    return frame[~(bad_lot | bad_date)].reset_index(drop=True), flagged
+
+
+def _shape_inspections(raw: pd.DataFrame, normalizer: LotIdNormalizer) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Build ``fetch_inspection_events``-shaped rows from inspector logs.
+
+    Time complexity: O(r).
+    Space complexity: O(r).
+    """
+    frame = pd.DataFrame(
+        {
+            "defect_id": _clean_text(raw["defect_id"]),
+            "severity": _clean_text(raw["severity"]),
+            "normalized_lot_id": _normalize_lots(raw, normalizer),
+            "inspection_timestamp": _parse_dates(
+                _join_date_time(raw["inspection_date"], raw["inspection_time"]), raw["source_file"]
+            ),
+            "qty_checked": _to_int(raw["qty_checked"]).fillna(0),
+            "qty_defects": _to_int(raw["qty_defects"]).fillna(0),
+            "disposition": _clean_text(raw["disposition"]),
+            "notes": _clean_text(raw["notes"]),
+            "inspector_name": _clean_text(raw["inspector_name"]),
+            "raw_lot_id": raw["raw_lot_id"].astype("string"),
+            "part_number": _clean_text(raw["part_number"]),
+            "line_id": _clean_text(raw["line_id"]),
+            "source_file": raw["source_file"],
+            "source_row": raw["source_row"],
+        }
+    )
+    clean, flagged = _split_indeterminate(frame, "inspection_timestamp")
+    clean.insert(0, "event_id", pd.RangeIndex(1, len(clean) + 1))
+    return clean[INSPECTION_EVENT_COLUMNS + _LINEAGE_COLUMNS], flagged
+
+
+def _shape_production(raw: pd.DataFrame, normalizer: LotIdNormalizer) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Build production-run rows from the production log.
+
+    Time complexity: O(r).
+    Space complexity: O(r).
+    """
+    frame = pd.DataFrame(
+        {
+            "normalized_lot_id": _normalize_lots(raw, normalizer),
+            "raw_lot_id": raw["raw_lot_id"].astype("string"),
+            "part_number": _clean_text(raw["part_number"]),
+            "production_date": _parse_dates(raw["production_date"], raw["source_file"]),
+            "line_id": _clean_text(raw["line_id"]),
+            "shift": _clean_text(raw["shift"]),
+            "units_planned": _to_int(raw["units_planned"]),
+            "units_actual": _to_int(raw["units_actual"]),
+            "downtime_minutes": _to_int(raw["downtime_minutes"]).fillna(0),
+            "primary_issue": _clean_text(raw["primary_issue"]),
+            "source_file": raw["source_file"],
+            "source_row": raw["source_row"],
+        }
+    )
+    return _split_indeterminate(frame, "production_date")
+
+
+def _shape_shipments(raw: pd.DataFrame, normalizer: LotIdNormalizer) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Build shipment rows from the shipping log.
+
+    Time complexity: O(r).
+    Space complexity: O(r).
+    """
+    frame = pd.DataFrame(
+        {
+            "normalized_lot_id": _normalize_lots(raw, normalizer),
+            "raw_lot_id": raw["raw_lot_id"].astype("string"),
+            "sales_order": _clean_text(raw["sales_order"]),
+            "customer": _clean_text(raw["customer"]),
+            "ship_date": _parse_dates(raw["ship_date"], raw["source_file"]),
+            "carrier": _clean_text(raw["carrier"]),
+            "bol_number": _clean_text(raw["bol_number"]),
+            "qty_shipped": _to_int(raw["qty_shipped"]),
+            "ship_status": _clean_text(raw["ship_status"]),
+            "source_file": raw["source_file"],
+            "source_row": raw["source_row"],
+        }
+    )
+    return _split_indeterminate(frame, "ship_date")
+
+
+def _combine(exports: list[ExportFrame], kind: str) -> pd.DataFrame:
+    """Concatenate raw frames of one kind, tagging each row with its file.
+
+    Missing optional columns are added as nulls so shaping stays uniform.
+
+    Time complexity: O(r).
+    Space complexity: O(r).
+    """
+    columns = [*_COLUMN_MAP[kind].values(), "source_row", "source_file"]
+    frames = [export.frame.assign(source_file=export.source_file) for export in exports if export.kind == kind]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True).reindex(columns=columns)
+
+
+def ingest_directory(directory: Path, workers: int | None = None, known_lot_ids: Iterable[str] = ()) -> IngestResult:
+    """Read every ``.xlsx`` export in ``directory`` and normalize it.
+
+    ``known_lot_ids`` (e.g. ``operations.lot``) lets mistyped IDs resolve as
+    near-duplicates of lots loaded earlier (see ``LotIdNormalizer``).
+
+    Workbooks are parsed concurrently in a process pool (``workers=1`` parses
+    in-process). Files are processed in name order so ``event_id`` values are
+    deterministic.
+
+    Time complexity: O(R / p) wall time for R total rows and p workers, plus
+    O(R) to combine and normalize.
+    Space complexity: O(R).
+    """
+    paths = sorted(path for path in Path(directory).glob("*.xlsx") if not path.name.startswith("~$"))
+    if workers == 1 or len(paths) <= 1:
+        exports = [read_export(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            exports = list(pool.map(read_export, paths))
+
+    raw_inspections = _combine(exports, "inspection")
+    raw_production = _combine(exports, "production")
+    raw_shipments = _combine(exports, "shipment")
+    # Resolve every export's lot IDs in one pass first, so a near-duplicate in
+    # one log can match a lot spelled correctly only in another.
+    normalizer = LotIdNormalizer(known_lot_ids)
+    normalizer.normalize(
+        pd.concat([raw_inspections["raw_lot_id"], raw_production["raw_lot_id"], raw_shipments["raw_lot_id"]])
+    )
+    inspections, inspection_flags = _shape_inspections(raw_inspections, normalizer)
+    production_runs, production_flags = _shape_production(raw_production, normalizer)
+    shipments, shipment_flags = _shape_shipments(raw_shipments, normalizer)
+
+    return IngestResult(
+        inspections=inspections,
+        production_runs=production_runs,
+        shipments=shipments,
+        indeterminate=pd.concat([inspection_flags, production_flags, shipment_flags], ignore_index=True),
+        skipped_files=[export.source_file for export in exports if export.kind is None],
+        lot_ids=normalizer.resolutions(),
+    )
@@ -0,0 +1,267 @@
+"""Lot ID normalization for raw ERP export values.
+
+Source spreadsheets spell the same lot many ways ("L0T-20251219-002",
+"Lot-20251221-002", "LOT 20260112 001 ", "LOT_20260108-002", "LOT20260111001").
+Every record is normalized to ``LOT-YYYYMMDD-NNN`` before storage.
+
+``LotIdNormalizer`` is the bulk engine used by ingestion: distinct raw IDs
+are matched in one vectorized pyarrow (RE2) pass and memoized, and IDs that
+still do not match are compared against known lots of the same production
+date (the blocking key) to catch near-duplicates such as "LOT-2O260101-001"
+or "LOT-20260101-0001". Anything left is reported as Indeterminate (ADR 004).
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+# "L0T" (zero) typos, any case, optional space/underscore/hyphen separators,
+# and stray surrounding whitespace are all accepted.
+_LOT_ID_PATTERN = re.compile(r"^\s*L[O0]T[\s_-]*(\d{8})[\s_-]*(\d{3})\s*$", re.IGNORECASE)
+
+# RE2 form of _LOT_ID_PATTERN for pyarrow. Surrounding whitespace is trimmed
+# separately; \p{Z} keeps Unicode spaces (e.g. NBSP in Excel cells) accepted
+# as separators like Python's \s does.
+_LOT_ID_RE2 = r"(?i)^L[O0]T[\s\p{Z}_-]*(?P<date>\d{8})[\s\p{Z}_-]*(?P<seq>\d{3})$"
+
+# Near-duplicate candidates: a short letter prefix followed by 10-12
+# digit-like characters once separators are removed.
+_SEPARATORS = re.compile(r"[\s_-]+")
+_PREFIX_PATTERN = re.compile(r"[A-Z0]+")
+_NUMBER_PATTERN = re.compile(r"[0-9OIL]{10,12}")
+# Letters commonly typed for digits in lot numbers.
+_DIGIT_LOOKALIKES = str.maketrans("OIL", "011")
+
+# Resolution statuses reported per distinct raw ID.
+LOT_ID_EXACT = "Exact"
+LOT_ID_NEAR_DUPLICATE = "Near duplicate"
+LOT_ID_INDETERMINATE = "Indeterminate"
+
+LOT_ID_RESOLUTION_COLUMNS = ["raw_lot_id", "normalized_lot_id", "lot_id_status"]
+
+
+@lru_cache(maxsize=65536)
+def normalize_lot_id(raw_lot_id: str | None) -> str | None:
+    """Return the canonical ``LOT-YYYYMMDD-NNN`` form, or None if unrecognized.
+
+    Results are memoized because exports repeat the same raw IDs many times.
+
+    Time complexity: O(m) on a cache miss, where m is string length; O(1) on a hit.
+    Space complexity: O(1) per cached entry.
+    """
+    if not isinstance(raw_lot_id, str):
+        return None
+    match = _LOT_ID_PATTERN.match(raw_lot_id)
+    if match is None:
+        return None
+    date_part, sequence = match.groups()
+    return f"LOT-{date_part}-{sequence}"
+
+
+def normalize_lot_ids(raw_lot_ids: pd.Series) -> pd.Series:
+    """Vectorized ``normalize_lot_id`` over a Series (nulls where unrecognized).
+
+    Runs as pyarrow compute kernels, so there is no Python call per value.
+
+    Time complexity: O(n * m) in native code for n values of length m.
+    Space complexity: O(n).
+    """
+    values = pc.cast(pa.array(raw_lot_ids.astype("string[pyarrow]").array), pa.string())
+    parts = pc.extract_regex(pc.utf8_trim_whitespace(values), _LOT_ID_RE2)
+    # struct_field (unlike StructArray.field) keeps the nulls of non-matches.
+    normalized = pc.binary_join_element_wise("LOT", pc.struct_field(parts, "date"), pc.struct_field(parts, "seq"), "-")
+    return pd.Series(normalized.to_numpy(zero_copy_only=False), index=raw_lot_ids.index, dtype="string")
+
+
+def _edit_distance_at_most_one(left: str, right: str) -> int | None:
+    """Return 0 or 1 if the strings are within one edit, else None.
+
+    One edit is a substitution, insertion, deletion or adjacent transposition.
+
+    Time complexity: O(m).
+    Space complexity: O(m).
+    """
+    if left == right:
+        return 0
+    if abs(len(left) - len(right)) > 1:
+        return None
+    if len(left) == len(right):
+        diffs = [index for index, (a, b) in enumerate(zip(left, right)) if a != b]
+        if len(diffs) == 1:
+            return 1
+        first, *rest = diffs
+        swapped = len(diffs) == 2 and rest[0] == first + 1
+        return 1 if swapped and left[first] == right[rest[0]] and left[rest[0]] == right[first] else None
+    shorter, longer = sorted((left, right), key=len)
+    index = next((i for i, (a, b) in enumerate(zip(shorter, longer)) if a != b), len(shorter))
+    return 1 if shorter[index:] == longer[index + 1 :] else None
+
+
+def _near_duplicate_key(raw_lot_id: str) -> str | None:
+    """Fold a raw ID that failed exact matching into a 10-12 digit key.
+
+    Separators are dropped, the prefix must be within one edit of "LOT", and
+    letter look-alikes in the number (O, I, L) become digits. A prefix such
+    as "LTO" can also be read as "LT" + "O...", so every split is tried and
+    one leaving exactly 11 digits is preferred.
+
+    Time complexity: O(m).
+    Space complexity: O(m).
+    """
+    folded = _SEPARATORS.sub("", raw_lot_id.strip().upper())
+    keys = [
+        folded[cut:].translate(_DIGIT_LOOKALIKES)
+        for cut in range(1, 6)
+        if _PREFIX_PATTERN.fullmatch(folded[:cut])
+        and _NUMBER_PATTERN.fullmatch(folded[cut:])
+        and _edit_distance_at_most_one(folded[:cut].replace("0", "O"), "LOT") is not None
+    ]
+    if not keys:
+        return None
+    return next((key for key in keys if len(key) == 11), keys[0])
+
+
+class LotIdNormalizer:
+    """Memoized bulk lot-ID resolver with blocked near-duplicate matching.
+
+    Every distinct raw ID is resolved once per normalizer: exact pattern
+    matches in one vectorized pass, then near-duplicate matching for the
+    rest. Near-duplicates resolve only to a lot already known (an exact
+    match seen by this normalizer or passed as ``known_lot_ids``), and only
+    when exactly one known lot is closest within one edit. Candidates come
+    from the block of known lots sharing the ID's first eight digits (the
+    production date), so matching never compares all pairs; corruption inside
+    the date itself therefore stays Indeterminate. Indeterminate IDs are
+    retried when later calls add known lots.
+
+    Space complexity: O(u + k) for u distinct raw IDs seen and k known lots.
+    """
+
+    def __init__(self, known_lot_ids: Iterable[str] = ()) -> None:
+        """Create an empty memo, optionally seeded with canonical lot IDs (e.g. the lot table).
+
+        Time complexity: O(k) for k known IDs.
+        Space complexity: O(k).
+        """
+        self._normalized: dict[str, str | None] = {}
+        self._status: dict[str, str] = {}
+        self._indeterminate: set[str] = set()
+        # Blocking index: date segment -> 11-digit keys (date + sequence) of known lots.
+        self._blocks: dict[str, set[str]] = {}
+        self._add_known(known_lot_ids)
+
+    def _add_known(self, normalized_lot_ids: Iterable[str]) -> bool:
+        """Index canonical IDs by date segment; return whether any were new.
+
+        Time complexity: O(k).
+        Space complexity: O(k).
+        """
+        size_before = sum(len(block) for block in self._blocks.values())
+        for normalized in normalized_lot_ids:
+            # LOT-YYYYMMDD-NNN: the date block, then date + sequence.
+            self._blocks.setdefault(normalized[4:12], set()).add(normalized[4:12] + normalized[13:16])
+        return sum(len(block) for block in self._blocks.values()) > size_before
+
+    @staticmethod
+    def _closest(key: str, block: set[str]) -> tuple[str | None, str]:
+        """Resolve one folded key against the known lots of its date block.
+
+        Only 10- and 12-digit keys (a dropped or doubled digit) are matched
+        by edit distance.
+
+        Time complexity: O(1) for an exact key match, else O(b * m) for b lots in the block.
+        Space complexity: O(b).
+        """
+        if key in block:
+            return f"LOT-{key[:8]}-{key[8:]}", LOT_ID_NEAR_DUPLICATE
+        # An 11-digit key already has the canonical shape; a one-edit neighbour
+        # would be a different lot (e.g. -086 for -087), not a spelling.
+        if len(key) == 11:
+            return None, LOT_ID_INDETERMINATE
+        distances: dict[int, list[str]] = {}
+        # Sorted so the result never depends on set iteration order.
+        for candidate in sorted(block):
+            distance = _edit_distance_at_most_one(key, candidate)
+            if distance is not None:
+                distances.setdefault(distance, []).append(candidate)
+        if not distances:
+            return None, LOT_ID_INDETERMINATE
+        closest = distances[min(distances)]
+        # Two equally close lots (e.g. -001 and -010 for "-00") are ambiguous.
+        if len(closest) != 1:
+            return None, LOT_ID_INDETERMINATE
+        match = closest[0]
+        return f"LOT-{match[:8]}-{match[8:]}", LOT_ID_NEAR_DUPLICATE
+
+    def _resolve_near_duplicates(self, raw_lot_ids: list[str]) -> None:
+        """Memoize near-duplicate matches (or Indeterminate) for unmatched raw IDs.
+
+        Time complexity: O(b * m) per ID for b known lots on its date.
+        Space complexity: O(b).
+        """
+        for raw in raw_lot_ids:
+            key = _near_duplicate_key(raw)
+            if key is None:
+                normalized, status = None, LOT_ID_INDETERMINATE
+            else:
+                normalized, status = self._closest(key, self._blocks.get(key[:8], set()))
+            self._normalized[raw] = normalized
+            self._status[raw] = status
+            if status == LOT_ID_INDETERMINATE:
+                self._indeterminate.add(raw)
+            else:
+                self._indeterminate.discard(raw)
+
+    def normalize(self, raw_lot_ids: pd.Series) -> pd.Series:
+        """Return normalized IDs for ``raw_lot_ids`` (null where Indeterminate).
+
+        Time complexity: O(n + u * m) for n values and u distinct new IDs,
+        plus the block scans for unmatched IDs.
+        Space complexity: O(n + u).
+        """
+        # Arrow-backed strings factorize natively (dictionary encoding).
+        codes, uniques = pd.factorize(raw_lot_ids.astype("string[pyarrow]"))
+        uniques = uniques.to_numpy(dtype=object)
+        memo = self._normalized
+        pending = [value for value in uniques if value not in memo]
+        if pending:
+            exact = normalize_lot_ids(pd.Series(pending, dtype="string[pyarrow]")).to_numpy(dtype=object, na_value=None)
+            unmatched = [value for value, normalized in zip(pending, exact) if normalized is None]
+            new_known = [normalized for normalized in exact if normalized is not None]
+            for value, normalized in zip(pending, exact):
+                if normalized is not None:
+                    memo[value] = normalized
+                    self._status[value] = LOT_ID_EXACT
+            # New known lots may now resolve IDs that were Indeterminate before.
+            if self._add_known(new_known):
+                unmatched.extend(self._indeterminate.difference(unmatched))
+            if unmatched:
+                self._resolve_near_duplicates(unmatched)
+
+        # factorize codes nulls as -1, which picks the trailing None.
+        mapped = np.array([memo[value] for value in uniques] + [None], dtype=object)
+        return pd.Series(mapped[codes], index=raw_lot_ids.index, dtype="string")
+
+    def resolutions(self) -> pd.DataFrame:
+        """Return one row per distinct raw ID seen, with its resolution status.
+
+        Time complexity: O(u).
+        Space complexity: O(u).
+        """
+        frame = pd.DataFrame(
+            {
+                "raw_lot_id": list(self._normalized),
+                "normalized_lot_id": list(self._normalized.values()),
+                "lot_id_status": list(self._status.values()),
+            },
+            columns=LOT_ID_RESOLUTION_COLUMNS,
+        )
+        return frame.astype("string")
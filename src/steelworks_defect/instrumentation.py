@@ -0,0 +1,214 @@
+"""Lightweight stage timing and optional profiling for dashboard runs.
+
+Library code marks its stages with ``stage("name")``. Outside an active
+``PerformanceRecorder`` that is a no-op costing one context-variable lookup,
+so analysis and DB functions stay cheap in tests, benchmarks and scripts.
+Inside ``recorder.activate()`` each stage records wall time, row count and
+(with ``PROFILE_MODE=tracemalloc``) its peak traced allocation; with
+``PROFILE_MODE=cprofile`` the whole run is profiled as well.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+
+import pandas as pd
+
+
+PROFILE_MODES = ("off", "cprofile", "tracemalloc")
+
+# Structured (one JSON object per run) performance log.
+logger = logging.getLogger("steelworks_defect.performance")
+
+_ACTIVE_RECORDER: ContextVar[PerformanceRecorder | None] = ContextVar("steelworks_performance_recorder", default=None)
+
+
+@dataclass
+class StageTiming:
+    """Measurements for one stage.
+
+    ``rows`` may be set by the instrumented code once its output size is known.
+
+    Attributes:
+        stage: Stage name, e.g. ``"classify.groupby"``.
+        depth: Nesting depth (0 for top-level stages).
+        seconds: Wall-clock duration.
+        rows: Rows processed or produced, when meaningful.
+        peak_bytes: Peak traced allocation during the stage (tracemalloc mode only).
+
+    Space complexity: O(1).
+    """
+
+    stage: str
+    depth: int = 0
+    seconds: float = 0.0
+    rows: int | None = None
+    peak_bytes: int | None = None
+
+
+@dataclass
+class _OpenStage:
+    """Bookkeeping for a stage that has not finished yet.
+
+    Space complexity: O(1).
+    """
+
+    started: float
+    start_bytes: int = 0
+    # Highest absolute traced size seen so far, carried across nested
+    # tracemalloc.reset_peak() calls.
+    max_bytes: int = 0
+
+
+@dataclass
+class PerformanceRecorder:
+    """Collects stage timings (and optionally a profile) for one run.
+
+    Attributes:
+        profile_mode: One of ``PROFILE_MODES``.
+        timings: Stages in start order (parents before their nested stages).
+        profile_text: Top cumulative-time entries when ``profile_mode`` is ``cprofile``.
+        total_seconds: Wall time of the last ``activate`` block.
+
+    Space complexity: O(s), where s is recorded stages.
+    """
+
+    profile_mode: str = "off"
+    timings: list[StageTiming] = field(default_factory=list)
+    profile_text: str | None = None
+    total_seconds: float = 0.0
+    _open: list[_OpenStage] = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        """Validate the profile mode.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        if self.profile_mode not in PROFILE_MODES:
+            raise ValueError(f"profile_mode must be one of {PROFILE_MODES}")
+
+    @contextmanager
+    def activate(self, profile_limit: int = 25) -> Iterator[PerformanceRecorder]:
+        """Route ``stage`` calls in this context to the recorder.
+
+        Starts tracemalloc or cProfile for the duration when requested.
+
+        Time complexity: O(1) plus profiling overhead.
+        Space complexity: O(s).
+        """
+        token = _ACTIVE_RECORDER.set(self)
+        profiler = cProfile.Profile() if self.profile_mode == "cprofile" else None
+        # Leave tracing alone when something else (e.g. the benchmark) owns it.
+        owns_tracing = self.profile_mode == "tracemalloc" and not tracemalloc.is_tracing()
+        if owns_tracing:
+            tracemalloc.start()
+        started = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield self
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            self.total_seconds = time.perf_counter() - started
+            if owns_tracing:
+                tracemalloc.stop()
+            _ACTIVE_RECORDER.reset(token)
+            if profiler is not None:
+                buffer = io.StringIO()
+                pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(profile_limit)
+                self.profile_text = buffer.getvalue()
+
+    @contextmanager
+    def stage(self, name: str, rows: int | None = None) -> Iterator[StageTiming]:
+        """Time one stage; the yielded ``StageTiming`` accepts a late ``rows``.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        timing = StageTiming(stage=name, depth=len(self._open), rows=rows)
+        entry = _OpenStage(started=0.0)
+        tracing = self.profile_mode == "tracemalloc" and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._open:
+                self._open[-1].max_bytes = max(self._open[-1].max_bytes, peak)
+            tracemalloc.reset_peak()
+            entry.start_bytes = entry.max_bytes = current
+        self._open.append(entry)
+        # Appended on entry so ``timings`` stays in start order.
+        self.timings.append(timing)
+        entry.started = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.seconds = time.perf_counter() - entry.started
+            self._open.pop()
+            if tracing:
+                peak = max(entry.max_bytes, tracemalloc.get_traced_memory()[1])
+                timing.peak_bytes = peak - entry.start_bytes
+                # The parent's window includes this stage's peak.
+                if self._open:
+                    self._open[-1].max_bytes = max(self._open[-1].max_bytes, peak)
+
+    def breakdown(self) -> pd.DataFrame:
+        """Return stages in start order with their share of the run's wall time.
+
+        Time complexity: O(s).
+        Space complexity: O(s).
+        """
+        frame = pd.DataFrame(
+            [asdict(timing) for timing in self.timings],
+            columns=["stage", "depth", "seconds", "rows", "peak_bytes"],
+        )
+        frame["rows"] = frame["rows"].astype("Int64")
+        frame["peak_bytes"] = frame["peak_bytes"].astype("Int64")
+        frame["share"] = frame["seconds"] / self.total_seconds if self.total_seconds > 0 else 0.0
+        return frame
+
+    def to_record(self) -> dict[str, object]:
+        """Return a JSON-serializable summary of the run.
+
+        Time complexity: O(s).
+        Space complexity: O(s).
+        """
+        return {
+            "total_seconds": round(self.total_seconds, 6),
+            "profile_mode": self.profile_mode,
+            "stages": [{**asdict(timing), "seconds": round(timing.seconds, 6)} for timing in self.timings],
+        }
+
+    def log(self, level: int = logging.INFO) -> None:
+        """Emit the run summary as one JSON log line on ``logger``.
+
+        Time complexity: O(s).
+        Space complexity: O(s).
+        """
+        if logger.isEnabledFor(level):
+            logger.log(level, json.dumps(self.to_record()))
+
+
+@contextmanager
+def stage(name: str, rows: int | None = None) -> Iterator[StageTiming]:
+    """Time a stage on the active recorder, or do nothing when none is active.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    recorder = _ACTIVE_RECORDER.get()
+    if recorder is None:
+        yield StageTiming(stage=name, rows=rows)
+        return
+    with recorder.stage(name, rows=rows) as timing:
+        yield timing
@@ -0,0 +1,467 @@
+"""Bulk loader for normalized exports into the ``operations`` schema.
+
+Rows are streamed into temporary staging tables with psycopg ``COPY FROM
+STDIN``; surrogate keys for lot, inspector and defect_type are resolved with
+set-based joins, and each batch is upserted in a single transaction. This
+replaces per-row INSERTs with correlated ``(SELECT id ...)`` subqueries.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy.engine import Engine
+
+from steelworks_defect.db import refresh_defect_summary
+from steelworks_defect.ingest import IngestResult, ingest_directory
+
+
+# Values accepted by the CHECK constraints in db/schema.sql.
+_VALID_SEVERITIES = {"Minor", "Major", "Critical", "Cosmetic"}
+
+# Staging DDL per logical table. ON COMMIT DROP scopes them to one batch.
+_STAGING_DDL = {
+    "lot": """
+        CREATE TEMP TABLE stage_lot (
+            normalized_lot_id TEXT,
+            part_number TEXT,
+            production_date DATE
+        ) ON COMMIT DROP
+    """,
+    "inspector": """
+        CREATE TEMP TABLE stage_inspector (
+            inspector_name TEXT
+        ) ON COMMIT DROP
+    """,
+    "defect_type": """
+        CREATE TEMP TABLE stage_defect_type (
+            defect_id TEXT,
+            severity TEXT
+        ) ON COMMIT DROP
+    """,
+    "production_run": """
+        CREATE TEMP TABLE stage_production_run (
+            normalized_lot_id TEXT,
+            raw_lot_id TEXT,
+            line_id TEXT,
+            shift TEXT,
+            units_planned INTEGER,
+            units_actual INTEGER,
+            downtime_minutes INTEGER,
+            primary_issue TEXT
+        ) ON COMMIT DROP
+    """,
+    "inspection_event": """
+        CREATE TEMP TABLE stage_inspection_event (
+            normalized_lot_id TEXT,
+            inspector_name TEXT,
+            defect_id TEXT,
+            inspection_timestamp TIMESTAMP,
+            qty_checked INTEGER,
+            qty_defects INTEGER,
+            disposition TEXT,
+            notes TEXT
+        ) ON COMMIT DROP
+    """,
+    "shipment": """
+        CREATE TEMP TABLE stage_shipment (
+            normalized_lot_id TEXT,
+            sales_order TEXT,
+            customer TEXT,
+            ship_date DATE,
+            carrier TEXT,
+            bol_number TEXT,
+            qty_shipped INTEGER,
+            ship_status TEXT
+        ) ON COMMIT DROP
+    """,
+}
+
+# Set-based upserts from staging into operations tables. DISTINCT ON removes
+# in-batch duplicates so ON CONFLICT never touches a row twice; rows failing
+# CHECK constraints are filtered out (fail-soft, ADR 004) instead of aborting.
+_UPSERT_SQL = {
+    "lot": """
+        INSERT INTO operations.lot (normalized_lot_id, part_number, production_date)
+        SELECT DISTINCT ON (normalized_lot_id) normalized_lot_id, part_number, production_date
+        FROM stage_lot
+        WHERE part_number IS NOT NULL AND production_date IS NOT NULL
+        ORDER BY normalized_lot_id, production_date
+        ON CONFLICT (normalized_lot_id) DO UPDATE
+            SET production_date = LEAST(operations.lot.production_date, EXCLUDED.production_date)
+    """,
+    "inspector": """
+        INSERT INTO operations.inspector (inspector_name)
+        SELECT DISTINCT inspector_name FROM stage_inspector WHERE inspector_name IS NOT NULL
+        ON CONFLICT (inspector_name) DO NOTHING
+    """,
+    "defect_type": """
+        INSERT INTO operations.defect_type (defect_id, severity)
+        SELECT DISTINCT ON (defect_id) defect_id, severity
+        FROM stage_defect_type
+        WHERE defect_id IS NOT NULL
+        ORDER BY defect_id
+        ON CONFLICT (defect_id) DO NOTHING
+    """,
+    "production_run": """
+        INSERT INTO operations.production_run
+            (lot_id, raw_lot_id, line_id, shift, units_planned, units_actual, downtime_minutes, primary_issue)
+        SELECT DISTINCT ON (l.id)
+            l.id, s.raw_lot_id, s.line_id,
+            CASE WHEN s.shift IN ('Day', 'Swing', 'Night') THEN s.shift END,
+            s.units_planned, s.units_actual, COALESCE(s.downtime_minutes, 0), s.primary_issue
+        FROM stage_production_run s
+        JOIN operations.lot l ON l.normalized_lot_id = s.normalized_lot_id
+        ORDER BY l.id
+        ON CONFLICT (lot_id) DO UPDATE SET
+            raw_lot_id = EXCLUDED.raw_lot_id,
+            line_id = EXCLUDED.line_id,
+            shift = EXCLUDED.shift,
+            units_planned = EXCLUDED.units_planned,
+            units_actual = EXCLUDED.units_actual,
+            downtime_minutes = EXCLUDED.downtime_minutes,
+            primary_issue = EXCLUDED.primary_issue
+    """,
+    "inspection_event": """
+        INSERT INTO operations.inspection_event
+            (lot_id, inspector_id, defect_type_id, inspection_timestamp, qty_checked, qty_defects, disposition, notes)
+        SELECT DISTINCT ON (l.id, i.id, s.inspection_timestamp, COALESCE(dt.id, 0))
+            l.id, i.id, dt.id, s.inspection_timestamp, s.qty_checked, s.qty_defects, s.disposition, s.notes
+        FROM stage_inspection_event s
+        JOIN operations.lot l ON l.normalized_lot_id = s.normalized_lot_id
+        JOIN operations.inspector i ON i.inspector_name = s.inspector_name
+        LEFT JOIN operations.defect_type dt ON dt.defect_id = s.defect_id
+        WHERE s.inspection_timestamp IS NOT NULL
+          AND s.qty_checked >= 0
+          AND s.qty_defects BETWEEN 0 AND s.qty_checked
+        ORDER BY l.id, i.id, s.inspection_timestamp, COALESCE(dt.id, 0)
+        ON CONFLICT (lot_id, inspector_id, inspection_timestamp, (COALESCE(defect_type_id, 0))) DO UPDATE SET
+            qty_checked = EXCLUDED.qty_checked,
+            qty_defects = EXCLUDED.qty_defects,
+            disposition = EXCLUDED.disposition,
+            notes = EXCLUDED.notes
+    """,
+    "shipment": """
+        INSERT INTO operations.shipment
+            (lot_id, sales_order, customer, ship_date, carrier, bol_number, qty_shipped, ship_status)
+        SELECT DISTINCT ON (l.id, COALESCE(s.sales_order, ''), COALESCE(s.bol_number, ''))
+            l.id, s.sales_order, s.customer, s.ship_date, s.carrier, s.bol_number, s.qty_shipped, s.ship_status
+        FROM stage_shipment s
+        JOIN operations.lot l ON l.normalized_lot_id = s.normalized_lot_id
+        ORDER BY l.id, COALESCE(s.sales_order, ''), COALESCE(s.bol_number, ''), s.ship_date
+        ON CONFLICT (lot_id, (COALESCE(sales_order, '')), (COALESCE(bol_number, ''))) DO UPDATE SET
+            customer = EXCLUDED.customer,
+            ship_date = EXCLUDED.ship_date,
+            carrier = EXCLUDED.carrier,
+            qty_shipped = EXCLUDED.qty_shipped,
+            ship_status = EXCLUDED.ship_status
+    """,
+}
+
+# Staging column order per logical table, matching _STAGING_DDL.
+_STAGING_COLUMNS = {
+    "lot": ["normalized_lot_id", "part_number", "production_date"],
+    "inspector": ["inspector_name"],
+    "defect_type": ["defect_id", "severity"],
+    "production_run": [
+        "normalized_lot_id",
+        "raw_lot_id",
+        "line_id",
+        "shift",
+        "units_planned",
+        "units_actual",
+        "downtime_minutes",
+        "primary_issue",
+    ],
+    "inspection_event": [
+        "normalized_lot_id",
+        "inspector_name",
+        "defect_id",
+        "inspection_timestamp",
+        "qty_checked",
+        "qty_defects",
+        "disposition",
+        "notes",
+    ],
+    "shipment": [
+        "normalized_lot_id",
+        "sales_order",
+        "customer",
+        "ship_date",
+        "carrier",
+        "bol_number",
+        "qty_shipped",
+        "ship_status",
+    ],
+}
+
+# Integer staging columns; CSV round-trips can widen them to float.
+_INTEGER_COLUMNS = {
+    "units_planned",
+    "units_actual",
+    "downtime_minutes",
+    "qty_checked",
+    "qty_defects",
+    "qty_shipped",
+}
+
+# On a month-partitioned inspection_event, create the staged months' partitions
+# before the upsert so rows are routed to them rather than the default partition.
+_ENSURE_PARTITIONS_SQL = """
+    SELECT operations.ensure_inspection_partitions(MIN(inspection_timestamp), MAX(inspection_timestamp))
+    FROM stage_inspection_event
+"""
+
+_IS_PARTITIONED_SQL = """
+    SELECT relkind = 'p' FROM pg_class WHERE oid = 'operations.inspection_event'::regclass
+"""
+
+# Load order: master data first so transactional rows can resolve keys.
+_LOAD_ORDER = ["lot", "inspector", "defect_type", "production_run", "inspection_event", "shipment"]
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    """Row counts and timing for one bulk load.
+
+    Attributes:
+        staged: Rows copied into staging, per logical table.
+        upserted: Rows inserted or updated, per logical table.
+        elapsed_seconds: Wall-clock duration of the load.
+
+    Space complexity: O(t), where t is number of tables.
+    """
+
+    staged: dict[str, int] = field(default_factory=dict)
+    upserted: dict[str, int] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rejected(self) -> dict[str, int]:
+        """Rows staged but not upserted (unresolved keys, failed checks, duplicates).
+
+        Time complexity: O(t).
+        Space complexity: O(t).
+        """
+        return {table: self.staged[table] - self.upserted.get(table, 0) for table in self.staged}
+
+    @property
+    def rows_per_second(self) -> float:
+        """Staged rows processed per second across all tables.
+
+        Time complexity: O(t).
+        Space complexity: O(1).
+        """
+        total = sum(self.staged.values())
+        return total / self.elapsed_seconds if self.elapsed_seconds > 0 else float(total)
+
+
+def _lot_master_rows(result: IngestResult) -> pd.DataFrame:
+    """Derive lot master rows from production and inspection logs.
+
+    Part number prefers the production log; production_date is the earliest
+    date any log associates with the lot (docs/data_design.md).
+
+    Time complexity: O(r log r), where r is production plus inspection rows.
+    Space complexity: O(r).
+    """
+    production = result.production_runs[["normalized_lot_id", "part_number", "production_date"]].assign(_priority=0)
+    inspections = result.inspections.assign(
+        production_date=result.inspections["inspection_timestamp"].dt.normalize(),
+        _priority=1,
+    )[["normalized_lot_id", "part_number", "production_date", "_priority"]]
+    combined = pd.concat([production, inspections], ignore_index=True).dropna(subset=["normalized_lot_id"])
+    if combined.empty:
+        return pd.DataFrame(columns=_STAGING_COLUMNS["lot"])
+
+    ranked = combined.sort_values(["normalized_lot_id", "_priority"], kind="mergesort")
+    part_numbers = ranked.dropna(subset=["part_number"]).groupby("normalized_lot_id")["part_number"].first()
+    dates = combined.groupby("normalized_lot_id")["production_date"].min()
+    lots = pd.DataFrame({"production_date": dates}).join(part_numbers).reset_index()
+    lots["production_date"] = lots["production_date"].dt.date
+    return lots[_STAGING_COLUMNS["lot"]]
+
+
+def _defect_type_rows(inspections: pd.DataFrame) -> pd.DataFrame:
+    """Pick one severity per defect code: its most frequent valid severity.
+
+    Time complexity: O(r).
+    Space complexity: O(d), where d is distinct defect codes.
+    """
+    coded = inspections.dropna(subset=["defect_id"])
+    if coded.empty:
+        return pd.DataFrame(columns=_STAGING_COLUMNS["defect_type"])
+    severity = coded["severity"].where(coded["severity"].isin(_VALID_SEVERITIES))
+    modes = (
+        coded.assign(severity=severity)
+        .dropna(subset=["severity"])
+        .groupby(["defect_id", "severity"])
+        .size()
+        .sort_values(ascending=False, kind="mergesort")
+        .reset_index()
+        .drop_duplicates("defect_id")
+        .set_index("defect_id")["severity"]
+    )
+    codes = pd.DataFrame({"defect_id": coded["defect_id"].drop_duplicates()})
+    codes["severity"] = codes["defect_id"].map(modes)
+    return codes[_STAGING_COLUMNS["defect_type"]]
+
+
+def _staging_frames(result: IngestResult) -> dict[str, pd.DataFrame]:
+    """Project an ``IngestResult`` onto the staging column layout.
+
+    Time complexity: O(r log r).
+    Space complexity: O(r).
+    """
+    shipments = result.shipments.assign(ship_date=result.shipments["ship_date"].dt.date)
+    frames = {
+        "lot": _lot_master_rows(result),
+        "inspector": result.inspections[["inspector_name"]].drop_duplicates(),
+        "defect_type": _defect_type_rows(result.inspections),
+        "production_run": result.production_runs.reindex(columns=_STAGING_COLUMNS["production_run"]),
+        "inspection_event": result.inspections.reindex(columns=_STAGING_COLUMNS["inspection_event"]),
+        "shipment": shipments.reindex(columns=_STAGING_COLUMNS["shipment"]),
+    }
+    for frame in frames.values():
+        for column in _INTEGER_COLUMNS.intersection(frame.columns):
+            frame[column] = pd.to_numeric(frame[column], errors="coerce").round().astype("Int64")
+    return frames
+
+
+def _copy_records(frame: pd.DataFrame) -> Iterator[tuple[object, ...]]:
+    """Yield COPY-ready tuples with pandas nulls converted to None.
+
+    Time complexity: O(r * c).
+    Space complexity: O(r * c) for the object-typed view.
+    """
+    as_objects = frame.astype(object).where(frame.notna(), None)
+    yield from as_objects.itertuples(index=False, name=None)
+
+
+def _batches(frame: pd.DataFrame, batch_size: int) -> Iterator[pd.DataFrame]:
+    """Split a frame into consecutive row batches.
+
+    Time complexity: O(r).
+    Space complexity: O(1) beyond the slices (views).
+    """
+    for start in range(0, len(frame), batch_size):
+        yield frame.iloc[start : start + batch_size]
+
+
+def load_ingest_result(engine: Engine, result: IngestResult, batch_size: int = 50_000) -> LoadReport:
+    """Bulk-load normalized exports with COPY + set-based upserts.
+
+    Each batch runs in its own transaction: create staging table, COPY rows,
+    upsert with key-resolving joins, commit (staging drops on commit). The
+    materialized defect summary is refreshed at the end.
+
+    Time complexity: O(r log r) overall, dominated by Postgres join/index work.
+    Space complexity: O(r) client-side for the projected frames.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    started = time.perf_counter()
+    frames = _staging_frames(result)
+    staged: dict[str, int] = {}
+    upserted: dict[str, int] = {}
+
+    raw_connection = engine.raw_connection()
+    try:
+        connection = raw_connection.driver_connection
+        # Checked once: databases created before partitioning support lack the helper function.
+        with connection.transaction(), connection.cursor() as cursor:
+            partitioned = bool(cursor.execute(_IS_PARTITIONED_SQL).fetchone()[0])
+        for table in _LOAD_ORDER:
+            columns = ", ".join(_STAGING_COLUMNS[table])
+            staged[table] = 0
+            upserted[table] = 0
+            for batch in _batches(frames[table], batch_size):
+                with connection.transaction(), connection.cursor() as cursor:
+                    cursor.execute(_STAGING_DDL[table])
+                    with cursor.copy(f"COPY stage_{table} ({columns}) FROM STDIN") as copy:
+                        for record in _copy_records(batch):
+                            copy.write_row(record)
+                    if partitioned and table == "inspection_event":
+                        cursor.execute(_ENSURE_PARTITIONS_SQL)
+                    cursor.execute(_UPSERT_SQL[table])
+                    staged[table] += len(batch)
+                    upserted[table] += max(cursor.rowcount, 0)
+    finally:
+        raw_connection.close()
+
+    refresh_defect_summary(engine)
+    return LoadReport(staged=staged, upserted=upserted, elapsed_seconds=time.perf_counter() - started)
+
+
+def _read_csv_frames(directory: Path) -> IngestResult:
+    """Read CSVs written by ``ingest --output-dir`` back into an ``IngestResult``.
+
+    Time complexity: O(r).
+    Space complexity: O(r).
+    """
+
+    def read(name: str, date_columns: list[str]) -> pd.DataFrame:
+        path = directory / f"{name}.csv"
+        if not path.exists():
+            return pd.DataFrame()
+        return pd.read_csv(path, parse_dates=date_columns, dtype={"normalized_lot_id": "string"})
+
+    inspections = read("inspections", ["inspection_timestamp"])
+    production_runs = read("production_runs", ["production_date"])
+    shipments = read("shipments", ["ship_date"])
+    return IngestResult(
+        inspections=inspections if not inspections.empty else _empty_ingest_frame("inspection"),
+        production_runs=production_runs if not production_runs.empty else _empty_ingest_frame("production"),
+        shipments=shipments if not shipments.empty else _empty_ingest_frame("shipment"),
+        indeterminate=read("indeterminate", []),
+    )
+
+
+def _empty_ingest_frame(kind: str) -> pd.DataFrame:
+    """Return an empty frame with the columns the loader projects from ``kind``.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    if kind == "inspection":
+        columns = [*_STAGING_COLUMNS["inspection_event"], "part_number"]
+        return pd.DataFrame(columns=columns).astype({"inspection_timestamp": "datetime64[ns]"})
+    if kind == "production":
+        columns = [*_STAGING_COLUMNS["production_run"], "part_number", "production_date"]
+        return pd.DataFrame(columns=columns).astype({"production_date": "datetime64[ns]"})
+    return pd.DataFrame(columns=_STAGING_COLUMNS["shipment"]).astype({"ship_date": "datetime64[ns]"})
+
+
+def read_load_source(path: Path, known_lot_ids: Iterable[str] = ()) -> IngestResult:
+    """Resolve a ``--load`` argument into normalized frames.
+
+    Accepts a directory of ``.xlsx`` exports, a directory of CSVs written by
+    ``ingest --output-dir``, or a single inspections CSV in the
+    ``fetch_inspection_events`` shape (with ``part_number``).
+    ``known_lot_ids`` feeds near-duplicate lot-ID matching for ``.xlsx``
+    exports; CSVs are already normalized.
+
+    Time complexity: O(r).
+    Space complexity: O(r).
+    """
+    path = Path(path)
+    if path.is_dir():
+        if any(path.glob("*.xlsx")):
+            return ingest_directory(path, known_lot_ids=known_lot_ids)
+        if any(path.glob("*.csv")):
+            return _read_csv_frames(path)
+        raise ValueError(f"No .xlsx or .csv files found in {path}")
+    if path.suffix.lower() == ".csv":
+        inspections = pd.read_csv(path, parse_dates=["inspection_timestamp"], dtype={"normalized_lot_id": "string"})
+        return IngestResult(
+            inspections=inspections,
+            production_runs=_empty_ingest_frame("production"),
+            shipments=_empty_ingest_frame("shipment"),
+            indeterminate=pd.DataFrame(),
+        )
+    raise ValueError(f"Unsupported load source: {path}")
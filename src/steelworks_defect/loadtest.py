@@ -0,0 +1,225 @@
+"""Concurrent-session load test: blocking reads vs the async single-flight gateway.
+
+Simulates N dashboard sessions that all miss the cache at once (the moment a
+new load lands at shift change) and run the cold-load queries: filter
+options, the rollup list summary, and the busiest defect's drill-down and
+first event page. Each mode is reported with per-session latency
+percentiles, wall time and the number of SQL statements Postgres executed.
+
+Usage:
+    poetry run load-test --database-url postgresql+psycopg://localhost:5432/steelworks --sessions 40
+    poetry run load-test --database-url URL --scratch-rows 200000   # DROPS and reloads the operations schema
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from steelworks_defect.async_db import (
+    AsyncDataGateway,
+    fetch_defect_events_page_async,
+    fetch_defect_occurrences_async,
+    fetch_defect_week_rollup_async,
+    fetch_filter_options_async,
+)
+from steelworks_defect.cache import DashboardCache
+from steelworks_defect.db import (
+    create_db_engine,
+    fetch_defect_events_page,
+    fetch_defect_occurrences,
+    fetch_defect_week_rollup,
+    fetch_filter_options,
+)
+
+
+def _count_statements(engine: Engine) -> list[int]:
+    """Attach a statement counter to ``engine``; returns a one-item mutable counter.
+
+    Time complexity: O(1) per executed statement.
+    Space complexity: O(1).
+    """
+    counter = [0]
+    lock = threading.Lock()
+
+    def before_cursor_execute(*_args: object) -> None:
+        with lock:
+            counter[0] += 1
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    return counter
+
+
+def _busiest_defect(engine: Engine) -> str:
+    """Return the defect code with the most occurrences (worst-case drill-down).
+
+    Time complexity: O(n) in Postgres.
+    Space complexity: O(1).
+    """
+    query = text(
+        """
+        SELECT dt.defect_id
+        FROM operations.inspection_event ie
+        JOIN operations.defect_type dt ON dt.id = ie.defect_type_id
+        WHERE ie.qty_defects > 0
+        GROUP BY dt.defect_id
+        ORDER BY COUNT(*) DESC, dt.defect_id
+        LIMIT 1
+        """
+    )
+    with engine.connect() as connection:
+        defect_id = connection.execute(query).scalar()
+    if defect_id is None:
+        raise ValueError("No defect occurrences to load-test; load data or pass --scratch-rows")
+    return str(defect_id)
+
+
+def _run_sessions(sessions: int, session: Callable[[], None]) -> dict[str, float]:
+    """Start ``sessions`` threads together and time each ``session()`` call.
+
+    Time complexity: O(sessions) plus the sessions' work.
+    Space complexity: O(sessions).
+    """
+    barrier = threading.Barrier(sessions)
+    latencies = [0.0] * sessions
+    errors: list[Exception] = []
+
+    def worker(index: int) -> None:
+        barrier.wait()
+        started = time.perf_counter()
+        try:
+            session()
+        except Exception as error:
+            # Re-raised in the calling thread once every session has finished.
+            errors.append(error)
+        latencies[index] = time.perf_counter() - started
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(sessions)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    if errors:
+        raise errors[0]
+
+    ordered = sorted(latencies)
+    return {
+        "wall_seconds": wall,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(int(0.95 * len(ordered)), len(ordered) - 1)] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def run_load_test(database_url: str, sessions: int = 40, rounds: int = 3, page_size: int = 50) -> dict[str, object]:
+    """Run ``rounds`` cold-cache bursts of ``sessions`` concurrent sessions per mode.
+
+    ``sync`` is the pre-async dashboard: a shared ``DashboardCache`` on the
+    blocking engine, where concurrent misses each run their own queries.
+    ``async`` routes the same reads through one ``AsyncDataGateway``. Both
+    caches are cleared before each burst, so single-flight coalescing and
+    non-blocking I/O (not caching) separate the two.
+
+    Time complexity: O(rounds * sessions * q) for q queries per session.
+    Space complexity: O(sessions + result sizes).
+    """
+    if sessions < 1 or rounds < 1:
+        raise ValueError("sessions and rounds must be at least 1")
+
+    engine = create_db_engine(database_url)
+    defect_id = _busiest_defect(engine)
+    sync_statements = _count_statements(engine)
+
+    cache = DashboardCache()
+
+    def sync_session() -> None:
+        cache.get_or_load(("filter_options",), engine, fetch_filter_options)
+        cache.get_or_load(("rollup",), engine, fetch_defect_week_rollup)
+        cache.get_or_load(("occurrences", defect_id), engine, lambda e: fetch_defect_occurrences(e, defect_id))
+        cache.get_or_load(
+            ("page", defect_id, page_size), engine, lambda e: fetch_defect_events_page(e, defect_id, page_size=page_size)
+        )
+
+    gateway = AsyncDataGateway(database_url, pool_size=10, max_overflow=20)
+    async_statements = _count_statements(gateway.engine.sync_engine)
+
+    def async_session() -> None:
+        gateway.get_or_load(("filter_options",), fetch_filter_options_async)
+        gateway.get_or_load(("rollup",), fetch_defect_week_rollup_async)
+        gateway.get_or_load(("occurrences", defect_id), lambda e: fetch_defect_occurrences_async(e, defect_id))
+        gateway.get_or_load(
+            ("page", defect_id, page_size), lambda e: fetch_defect_events_page_async(e, defect_id, page_size=page_size)
+        )
+
+    modes: dict[str, list[dict[str, float]]] = {"sync": [], "async": []}
+    try:
+        for _ in range(rounds):
+            cache.clear()
+            sync_statements[0] = 0
+            burst = _run_sessions(sessions, sync_session)
+            modes["sync"].append({**burst, "statements": sync_statements[0]})
+
+            gateway.clear()
+            async_statements[0] = 0
+            burst = _run_sessions(sessions, async_session)
+            modes["async"].append({**burst, "statements": async_statements[0]})
+    finally:
+        gateway.close()
+        engine.dispose()
+
+    def summarize(bursts: list[dict[str, float]]) -> dict[str, float]:
+        # Median across rounds damps one-off scheduler noise.
+        return {metric: statistics.median(burst[metric] for burst in bursts) for metric in bursts[0]}
+
+    return {
+        "sessions": sessions,
+        "rounds": rounds,
+        "defect_id": defect_id,
+        "modes": {name: summarize(bursts) for name, bursts in modes.items()},
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """CLI entry point for `poetry run load-test`.
+
+    Time complexity: O(rounds * sessions * q).
+    Space complexity: O(sessions + result sizes).
+    """
+    parser = argparse.ArgumentParser(description="Load-test concurrent dashboard sessions against Postgres.")
+    parser.add_argument("--database-url", required=True, help="Postgres URL (postgresql+psycopg://...).")
+    parser.add_argument("--sessions", type=int, default=40, help="Concurrent sessions per burst.")
+    parser.add_argument("--rounds", type=int, default=3, help="Bursts per mode (median reported).")
+    parser.add_argument(
+        "--scratch-rows",
+        type=int,
+        default=None,
+        help="Load this many synthetic rows first; the operations schema is DROPPED and recreated.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.scratch_rows is not None:
+        # Imported lazily: the benchmark helpers pull in the synthetic generator.
+        from steelworks_defect.benchmark import _load_events, _reset_scratch_database
+        from steelworks_defect.synthetic import generate_inspection_history
+
+        engine = create_db_engine(args.database_url)
+        _reset_scratch_database(engine, Path(__file__).resolve().parents[2])
+        _load_events(engine, generate_inspection_history(args.scratch_rows))
+        engine.dispose()
+
+    report = run_load_test(args.database_url, sessions=args.sessions, rounds=args.rounds)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
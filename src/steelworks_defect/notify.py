@@ -0,0 +1,216 @@
+"""Data-version change notifications for dashboard caches.
+
+Exports arrive in daily and weekly chunks, but every Streamlit rerun used to
+probe inspection_event to decide whether cached results were still valid.
+Triggers in ``db/schema.sql`` now bump ``operations.data_version`` on every
+write statement and send NOTIFY on ``db.DATA_VERSION_CHANNEL``.
+``DataVersionListener`` holds one LISTEN connection per process and keeps
+the latest version in memory: cache lookups cost no query while the data is
+unchanged, and subscribers (e.g. ``DashboardCache.clear``) run once per load.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable, Hashable
+
+from psycopg import sql
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from steelworks_defect.db import (
+    _DATA_VERSION_COUNTER_QUERY,
+    DATA_VERSION_CHANNEL,
+    get_data_version,
+    probe_data_version,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Valid DATA_VERSION_SOURCE values (see config.get_data_version_source).
+DATA_VERSION_SOURCES = ("probe", "counter", "notify")
+
+
+class DataVersionListener:
+    """Background LISTEN loop tracking the ``operations.data_version`` counter.
+
+    ``version`` is ``None`` until the first connection succeeds and again
+    while disconnected (notifications sent in between would be lost), so
+    ``probe`` falls back to reading the counter rather than serving a stale
+    version. Each reconnect re-reads the counter after LISTEN, so no change
+    can slip between the two.
+
+    Space complexity: O(s) for s subscribers.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        channel: str = DATA_VERSION_CHANNEL,
+        poll_seconds: float = 1.0,
+        reconnect_seconds: float = 5.0,
+    ) -> None:
+        """Create a stopped listener; call ``start`` to connect.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        if poll_seconds <= 0 or reconnect_seconds <= 0:
+            raise ValueError("poll_seconds and reconnect_seconds must be positive")
+        # NullPool: the LISTEN connection is held for the process lifetime and
+        # must not occupy a slot in the dashboard's query pool.
+        self._engine = create_engine(database_url, poolclass=NullPool)
+        self.channel = channel
+        self.poll_seconds = poll_seconds
+        self.reconnect_seconds = reconnect_seconds
+        self._version: int | None = None
+        # Last non-null version, so a reconnect to unchanged data is not a change.
+        self._last_seen: int | None = None
+        self._subscribers: list[Callable[[int], None]] = []
+        self._changed = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def version(self) -> int | None:
+        """Return the last known data version, or ``None`` when not connected.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        return self._version
+
+    def subscribe(self, callback: Callable[[int], None]) -> None:
+        """Call ``callback(new_version)`` on the listener thread after each change.
+
+        The first version read after (re)connecting counts as a change only
+        if it differs from the last one seen.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        with self._changed:
+            self._subscribers.append(callback)
+
+    def probe(self, engine: Engine) -> int:
+        """``DashboardCache`` probe: the in-memory version, else the counter row.
+
+        Time complexity: O(1); one round trip only while disconnected.
+        Space complexity: O(1).
+        """
+        version = self._version
+        return version if version is not None else get_data_version(engine)
+
+    def start(self) -> DataVersionListener:
+        """Start the listener thread (idempotent) and return ``self``.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="steelworks-data-version", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the listener thread within about ``poll_seconds``.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._engine.dispose()
+
+    def wait_for(self, predicate: Callable[[int | None], bool], timeout: float) -> bool:
+        """Block until ``predicate(version)`` holds; return whether it did in time.
+
+        Time complexity: O(changes within the timeout).
+        Space complexity: O(1).
+        """
+        with self._changed:
+            return self._changed.wait_for(lambda: predicate(self._version), timeout)
+
+    def _set_version(self, version: int | None) -> None:
+        """Record a version and notify waiters and, on a change, subscribers.
+
+        Versions only grow, so a late or duplicate notification is ignored.
+
+        Time complexity: O(s) for s subscribers.
+        Space complexity: O(s).
+        """
+        with self._changed:
+            previous = self._version
+            if version is not None and previous is not None and version <= previous:
+                return
+            self._version = version
+            self._changed.notify_all()
+            subscribers = list(self._subscribers)
+            changed = version is not None and version != self._last_seen
+            if version is not None:
+                self._last_seen = version
+        if changed:
+            for callback in subscribers:
+                callback(version)
+
+    def _listen_once(self) -> None:
+        """Hold one LISTEN connection until it fails or the listener stops.
+
+        Time complexity: O(notifications received).
+        Space complexity: O(1).
+        """
+        raw_connection = self._engine.raw_connection()
+        try:
+            connection = raw_connection.driver_connection
+            # LISTEN only takes effect outside a transaction block.
+            connection.autocommit = True
+            connection.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+            # Read after LISTEN so a bump between the two is not missed.
+            self._set_version(int(connection.execute(_DATA_VERSION_COUNTER_QUERY).fetchone()[0]))
+            while not self._stopped.is_set():
+                # Several bumps in one load arrive together at commit; keep the highest.
+                payloads = [int(notify.payload) for notify in connection.notifies(timeout=self.poll_seconds)]
+                if payloads:
+                    self._set_version(max(payloads))
+        finally:
+            raw_connection.close()
+
+    def _run(self) -> None:
+        """Listener thread body: reconnect with a fixed delay until stopped.
+
+        Time complexity: O(notifications received).
+        Space complexity: O(1).
+        """
+        while not self._stopped.is_set():
+            try:
+                self._listen_once()
+            except Exception:
+                logger.warning("data-version listener disconnected; retrying", exc_info=True)
+            # Unknown until reconnected: probe falls back to the counter row.
+            self._set_version(None)
+            self._stopped.wait(self.reconnect_seconds)
+
+
+def data_version_probe(source: str, listener: DataVersionListener | None = None) -> Callable[[Engine], Hashable]:
+    """Return the ``DashboardCache`` probe for a ``DATA_VERSION_SOURCE`` value.
+
+    ``probe`` fingerprints inspection_event (works on any schema),
+    ``counter`` reads ``operations.data_version`` per lookup, and ``notify``
+    uses ``listener`` and queries nothing while connected.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    if source == "probe":
+        return probe_data_version
+    if source == "counter":
+        return get_data_version
+    if source == "notify":
+        if listener is None:
+            raise ValueError("DATA_VERSION_SOURCE=notify needs a DataVersionListener")
+        return listener.probe
+    raise ValueError(f"Unknown data version source {source!r}; expected one of {DATA_VERSION_SOURCES}")
@@ -0,0 +1,193 @@
+"""Parallel, sharded recurring-defect classification.
+
+``classify_defects_parallel`` hash-partitions defect rows by ``defect_id``,
+publishes the integer-encoded columns once in shared memory, and lets each
+worker aggregate its contiguous shard in place. Only the small per-shard
+aggregates travel back through pickling; the merge restores groupby key
+order so the AC9 mergesort in ``_finalize_summary`` is identical to the
+serial ``classify_defects`` result.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from steelworks_defect.analysis import (
+    _empty_summary,
+    _finalize_summary,
+    _missing_weeks_by_group,
+    _normalize_analysis_frame,
+    _week_ordinals,
+    classify_defects,
+)
+
+
+# Encoded columns published to workers, all int64 so one dtype covers them.
+# Timestamps are datetime64[ns] viewed as int64 (NaT is the minimum int64).
+_SHARED_COLUMNS = ("defect_code", "severity_code", "lot_code", "timestamp_ns", "qty_defects")
+
+
+@dataclass(frozen=True)
+class _ShardTask:
+    """Picklable description of one shard: segment names plus a row range.
+
+    Space complexity: O(c), where c is shared column count.
+    """
+
+    segments: dict[str, str]
+    row_count: int
+    start: int
+    stop: int
+
+
+def _aggregate_shard(task: _ShardTask) -> pd.DataFrame:
+    """Aggregate one shard's rows straight from shared memory.
+
+    Returns one row per (defect_code, severity_code) with the same aggregate
+    columns as ``classify_defects`` plus ``missing_periods``.
+
+    Time complexity: O(k + c), where k is shard rows and c is weeks spanned.
+    Space complexity: O(k + c).
+    """
+    # Pool workers share the parent's resource tracker, so attaching does not
+    # transfer ownership; the parent unlinks every segment after the merge.
+    segments = {column: shared_memory.SharedMemory(name=name) for column, name in task.segments.items()}
+    try:
+        views = {
+            column: np.ndarray((task.row_count,), dtype=np.int64, buffer=segment.buf)[task.start : task.stop]
+            for column, segment in segments.items()
+        }
+        timestamps = pd.Series(views["timestamp_ns"].view("datetime64[ns]"))
+        shard = pd.DataFrame(
+            {
+                "defect_code": views["defect_code"],
+                "severity_code": views["severity_code"],
+                "lot_code": views["lot_code"],
+                "inspection_timestamp": timestamps,
+                "week_ordinal": _week_ordinals(timestamps),
+                "qty_defects": views["qty_defects"],
+            }
+        )
+        # Lot code -1 marks a null lot, which nunique must not count.
+        shard["lot_code"] = shard["lot_code"].where(shard["lot_code"] >= 0)
+
+        groups = shard.groupby(["defect_code", "severity_code"], sort=True)
+        grouped = groups.agg(
+            impacted_lot_count=("lot_code", "nunique"),
+            weeks_with_defects=("week_ordinal", "nunique"),
+            first_detected=("inspection_timestamp", "min"),
+            last_detected=("inspection_timestamp", "max"),
+            total_defects=("qty_defects", "sum"),
+        ).reset_index()
+
+        group_codes = groups.ngroup().to_numpy()
+        dated = shard["week_ordinal"].notna().to_numpy()
+        grouped["missing_periods"] = _missing_weeks_by_group(
+            group_codes[dated],
+            shard["week_ordinal"][dated].to_numpy(dtype=np.int64),
+            len(grouped),
+        )
+        # Views must be released before the segments can be closed.
+        del views, timestamps, shard, groups
+        return grouped
+    finally:
+        for segment in segments.values():
+            segment.close()
+
+
+def _encode(non_zero: pd.DataFrame) -> tuple[dict[str, np.ndarray], pd.Index, pd.Index]:
+    """Integer-encode defect rows; codes follow sorted string order.
+
+    Null severities get code ``len(severities)`` so they sort last, matching
+    the serial engine's ``dropna=False`` groupby order.
+
+    Time complexity: O(n log u), where u is distinct values per column.
+    Space complexity: O(n).
+    """
+    defect_code, defects = pd.factorize(non_zero["defect_id"], sort=True)
+    severity_code, severities = pd.factorize(non_zero["severity"], sort=True)
+    severity_code = np.where(severity_code < 0, len(severities), severity_code)
+    lot_code, _ = pd.factorize(non_zero["normalized_lot_id"])
+    columns = {
+        "defect_code": defect_code.astype(np.int64),
+        "severity_code": severity_code.astype(np.int64),
+        "lot_code": lot_code.astype(np.int64),
+        "timestamp_ns": non_zero["inspection_timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64),
+        "qty_defects": non_zero["qty_defects"].to_numpy(dtype=np.int64),
+    }
+    return columns, pd.Index(defects), pd.Index(severities)
+
+
+def classify_defects_parallel(events: pd.DataFrame, workers: int | None = None) -> pd.DataFrame:
+    """Classify defects across a process pool; identical to ``classify_defects``.
+
+    Rows are hash-partitioned by ``defect_id`` into ``workers`` shards and
+    sorted so each shard is one contiguous slice of the shared columns.
+    ``workers=None`` uses every core; ``workers=1`` runs the serial engine.
+
+    Time complexity: O(n log n) to partition, then O(n / p + c) per worker for
+    p workers, plus O(g log g) to merge.
+    Space complexity: O(n) shared once, plus O(g + c) for merged aggregates.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if workers == 1:
+        return classify_defects(events)
+
+    frame = _normalize_analysis_frame(events)
+    # AC3: Exclude non-defect rows from trend counting.
+    non_zero = frame[(frame["qty_defects"] > 0) & (frame["defect_id"].notna())]
+    if non_zero.empty:
+        return _empty_summary()
+
+    # Stable hash so a defect always lands on the same shard across runs.
+    shard_of_row = pd.util.hash_array(non_zero["defect_id"].to_numpy(dtype=object)) % np.uint64(workers)
+    order = np.argsort(shard_of_row, kind="stable")
+    bounds = np.searchsorted(shard_of_row[order], np.arange(workers + 1, dtype=np.uint64))
+    columns, defects, severities = _encode(non_zero.iloc[order])
+
+    segments: dict[str, shared_memory.SharedMemory] = {}
+    try:
+        for column in _SHARED_COLUMNS:
+            values = columns[column]
+            segment = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            segments[column] = segment
+            np.ndarray(values.shape, dtype=np.int64, buffer=segment.buf)[:] = values
+        names = {column: segment.name for column, segment in segments.items()}
+        tasks = [
+            _ShardTask(segments=names, row_count=len(order), start=int(start), stop=int(stop))
+            for start, stop in zip(bounds[:-1], bounds[1:])
+            if stop > start
+        ]
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            shard_results = list(pool.map(_aggregate_shard, tasks))
+    finally:
+        for segment in segments.values():
+            segment.close()
+            segment.unlink()
+
+    # Restore serial groupby key order (defect_id, then severity nulls last).
+    merged = pd.concat(shard_results, ignore_index=True)
+    merged = merged.sort_values(["defect_code", "severity_code"], kind="mergesort").reset_index(drop=True)
+    severity_labels = np.append(severities.to_numpy(dtype=object), pd.NA)
+
+    grouped = pd.DataFrame(
+        {
+            "defect_id": pd.array(defects.to_numpy(dtype=object)[merged["defect_code"]], dtype="string"),
+            "severity": pd.array(severity_labels[merged["severity_code"]], dtype="string"),
+            "impacted_lot_count": merged["impacted_lot_count"].astype(np.int64),
+            "weeks_with_defects": merged["weeks_with_defects"].astype(np.int64),
+            "first_detected": merged["first_detected"],
+            "last_detected": merged["last_detected"],
+            "total_defects": merged["total_defects"].astype(np.int64),
+        }
+    )
+    return _finalize_summary(grouped, merged["missing_periods"].tolist())
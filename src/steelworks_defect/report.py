@@ -0,0 +1,261 @@
+"""Headless batch report: classify and export without the Streamlit UI.
+
+Streams defect rows from Postgres in bounded chunks into the incremental
+aggregate state (so memory is independent of history length), classifies,
+drills into the selected defects with indexed per-defect reads, and writes
+the summary and drill-down tables to CSV, Parquet or Postgres result tables
+(COPY, one transaction per run). Stage timings and throughput are printed,
+so cron jobs can log how long the morning report took.
+
+Usage:
+    poetry run defect-report --start 2026-01-01 --end 2026-03-31 --format parquet --output-dir build/report
+    poetry run defect-report --format postgres --drill-downs all
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy.engine import Engine
+
+from steelworks_defect.analysis import drill_down_defect, recurring_mask
+from steelworks_defect.config import get_database_url, get_profile_mode, get_stream_chunk_size
+from steelworks_defect.db import DefectFilters, create_db_engine, fetch_defect_occurrences, iter_analysis_event_chunks
+from steelworks_defect.incremental import DefectAggregateState
+from steelworks_defect.instrumentation import PerformanceRecorder, stage
+from steelworks_defect.loader import _copy_records
+
+
+REPORT_FORMATS = ("csv", "parquet", "postgres")
+DRILL_DOWN_SCOPES = ("recurring", "all", "none")
+
+# Occurrence columns exported per drill-down row (matches operations.defect_report_drill_down).
+DRILL_DOWN_COLUMNS = ["event_id", "defect_id", "severity", "normalized_lot_id", "inspection_timestamp", "qty_defects"]
+
+
+@dataclass(frozen=True)
+class DefectReport:
+    """Result of one headless classification run.
+
+    Attributes:
+        summary: Classified list-view summary plus ``drill_down_message``
+            (None for defects outside the drill-down scope).
+        drill_downs: Occurrence rows of the drilled-down defects.
+        event_rows: Defect rows streamed for classification.
+
+    Space complexity: O(g + k), where k is drill-down rows.
+    """
+
+    summary: pd.DataFrame
+    drill_downs: pd.DataFrame
+    event_rows: int
+
+
+def build_report(
+    engine: Engine,
+    filters: DefectFilters | None = None,
+    drill_downs: str = "recurring",
+    chunksize: int = 50_000,
+) -> DefectReport:
+    """Stream, classify and drill down, honoring ``filters`` (e.g. a date window).
+
+    ``drill_downs`` selects which defects get event-level detail: the
+    recurring ones (default), all of them, or none.
+
+    Time complexity: O(n + g log g + sum(k_d log n)), where n is streamed
+    rows and k_d is rows of each drilled-down defect.
+    Space complexity: O(chunksize + g + k).
+    """
+    if drill_downs not in DRILL_DOWN_SCOPES:
+        raise ValueError(f"drill_downs must be one of {', '.join(DRILL_DOWN_SCOPES)}")
+    filter_arg = None if filters is None or filters.is_empty() else filters
+
+    with stage("report.classify") as timing:
+        state = DefectAggregateState()
+        event_rows = state.apply_chunks(iter_analysis_event_chunks(engine, chunksize=chunksize, filters=filter_arg))
+        summary = state.summary()
+        timing.rows = event_rows
+
+    if drill_downs == "none" or summary.empty:
+        selected: list[str] = []
+    elif drill_downs == "recurring":
+        selected = summary.loc[recurring_mask(summary), "defect_id"].astype(str).tolist()
+    else:
+        selected = summary["defect_id"].astype(str).tolist()
+
+    messages: dict[str, str] = {}
+    frames = []
+    with stage("report.drill_downs") as timing:
+        for defect_id in selected:
+            detail = drill_down_defect(fetch_defect_occurrences(engine, defect_id, filter_arg), defect_id)
+            messages[defect_id] = detail.message
+            frames.append(detail.records[DRILL_DOWN_COLUMNS])
+        records = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=DRILL_DOWN_COLUMNS)
+        timing.rows = len(records)
+
+    summary = summary.assign(drill_down_message=summary["defect_id"].astype(str).map(messages))
+    return DefectReport(summary=summary, drill_downs=records, event_rows=event_rows)
+
+
+def write_report_files(report: DefectReport, output_dir: Path, output_format: str = "csv") -> list[Path]:
+    """Write ``defect_summary`` and ``defect_drill_downs`` as CSV or Parquet.
+
+    CSV stores ``missing_periods`` as a comma-joined string; Parquet keeps
+    the list type.
+
+    Time complexity: O(g + k).
+    Space complexity: O(g + k).
+    """
+    if output_format not in ("csv", "parquet"):
+        raise ValueError("output_format must be csv or parquet")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summary = report.summary
+    if output_format == "csv":
+        summary = summary.assign(missing_periods=summary["missing_periods"].map(",".join))
+
+    paths = []
+    for name, frame in (("defect_summary", summary), ("defect_drill_downs", report.drill_downs)):
+        path = output_dir / f"{name}.{output_format}"
+        if output_format == "csv":
+            frame.to_csv(path, index=False)
+        else:
+            frame.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+# Column order of the COPY targets in db/schema.sql (section 5b).
+_SUMMARY_RESULT_COLUMNS = [
+    "run_id",
+    "defect_id",
+    "severity",
+    "impacted_lot_count",
+    "weeks_with_defects",
+    "first_detected",
+    "last_detected",
+    "total_defects",
+    "days_span",
+    "trend_classification",
+    "missing_periods",
+    "drill_down_message",
+]
+_DRILL_DOWN_RESULT_COLUMNS = ["run_id", *DRILL_DOWN_COLUMNS]
+
+
+def write_report_postgres(
+    engine: Engine,
+    report: DefectReport,
+    filters: DefectFilters | None = None,
+    elapsed_seconds: float = 0.0,
+) -> int:
+    """Bulk-insert a run into the ``operations.defect_report_*`` tables; return its run_id.
+
+    Rows are written with COPY in a single transaction, so readers see the
+    whole run or none of it.
+
+    Time complexity: O(g + k).
+    Space complexity: O(g + k) for the object-typed COPY views.
+    """
+    filters = filters or DefectFilters()
+    raw_connection = engine.raw_connection()
+    try:
+        connection = raw_connection.driver_connection
+        with connection.transaction(), connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO operations.defect_report_run (window_start, window_end, event_rows, elapsed_seconds)
+                VALUES (%s, %s, %s, %s)
+                RETURNING run_id
+                """,
+                (filters.start, filters.end, report.event_rows, elapsed_seconds),
+            )
+            run_id = int(cursor.fetchone()[0])
+            for table, frame, columns in (
+                ("defect_report_summary", report.summary, _SUMMARY_RESULT_COLUMNS),
+                ("defect_report_drill_down", report.drill_downs, _DRILL_DOWN_RESULT_COLUMNS),
+            ):
+                rows = frame.assign(run_id=run_id)[columns]
+                with cursor.copy(f"COPY operations.{table} ({', '.join(columns)}) FROM STDIN") as copy:
+                    for record in _copy_records(rows):
+                        copy.write_row(record)
+    finally:
+        raw_connection.close()
+    return run_id
+
+
+def _format_timings(recorder: PerformanceRecorder) -> str:
+    """Render top-level report stages with row throughput.
+
+    Time complexity: O(s), where s is recorded stages.
+    Space complexity: O(s).
+    """
+    lines = [f"{'stage':<22}{'seconds':>10}{'rows':>12}{'rows/sec':>14}"]
+    breakdown = recorder.breakdown()
+    for row in breakdown[breakdown["depth"] == 0].itertuples(index=False):
+        rows = "" if pd.isna(row.rows) else f"{int(row.rows):,}"
+        rate = f"{row.rows / row.seconds:,.0f}" if rows and row.seconds > 0 else ""
+        lines.append(f"{row.stage:<22}{row.seconds:>10.2f}{rows:>12}{rate:>14}")
+    lines.append(f"Report complete in {recorder.total_seconds:.2f}s.")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """CLI entry point for `poetry run defect-report`.
+
+    Reads ``DATABASE_URL`` like the dashboard. ``--start``/``--end`` are
+    inclusive inspection dates.
+
+    Time complexity: O(n + g log g + k log n).
+    Space complexity: O(chunksize + g + k).
+    """
+    parser = argparse.ArgumentParser(description="Classify defects headlessly and export the report.")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="First inspection date (YYYY-MM-DD).")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="Last inspection date (YYYY-MM-DD).")
+    parser.add_argument("--format", choices=REPORT_FORMATS, default="csv", help="Output format (default: csv).")
+    parser.add_argument(
+        "--output-dir", type=Path, default=Path("build/report"), help="Directory for csv/parquet output."
+    )
+    parser.add_argument(
+        "--drill-downs", choices=DRILL_DOWN_SCOPES, default="recurring", help="Defects to export event rows for."
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=None, help="Rows per streamed chunk (default: STREAM_CHUNK_SIZE)."
+    )
+    args = parser.parse_args(argv)
+    if args.start is not None and args.end is not None and args.start > args.end:
+        parser.error("--start must not be after --end")
+
+    engine = create_db_engine(get_database_url())
+    filters = DefectFilters(start=args.start, end=args.end)
+    recorder = PerformanceRecorder(profile_mode=get_profile_mode())
+    started = time.perf_counter()
+    try:
+        with recorder.activate():
+            report = build_report(
+                engine, filters, drill_downs=args.drill_downs, chunksize=args.chunk_size or get_stream_chunk_size()
+            )
+            with stage("report.write", rows=len(report.summary) + len(report.drill_downs)):
+                if args.format == "postgres":
+                    run_id = write_report_postgres(engine, report, filters, time.perf_counter() - started)
+                    destinations = [f"operations.defect_report_* (run_id {run_id})"]
+                else:
+                    destinations = [str(path) for path in write_report_files(report, args.output_dir, args.format)]
+    finally:
+        engine.dispose()
+
+    recorder.log()
+    print(f"{len(report.summary)} defects classified from {report.event_rows:,} defect rows.")
+    for destination in destinations:
+        print(f"wrote {destination}")
+    print(_format_timings(recorder))
+    if recorder.profile_text:
+        print(recorder.profile_text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Rolling recurrence classification over trailing week windows.
+
+``classify_defects`` answers "has this defect ever recurred?". The timeline
+here answers "was it recurring *as of* each week?": for every defect bucket
+and every ``W-MON`` week from its first occurrence to the latest week in the
+data, lots, weeks and defect quantity are counted over the trailing
+``window_weeks`` weeks and classified with the same AC1/AC2/AC4 rules.
+
+The window is slid incrementally rather than re-aggregated per week: each
+occurrence adds its contribution when it enters the window and removes it
+``window_weeks`` later, recorded as +/- events in a per-bucket difference
+array whose running sum is the window state. A lot seen in several nearby
+weeks is coalesced into one coverage interval first, so distinct lot counts
+stay exact.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from steelworks_defect.analysis import _WEEK_ANCHOR_DAY, _classify_status, _normalize_analysis_frame, _week_ordinals
+
+if TYPE_CHECKING:
+    from steelworks_defect.event_store import EventStore
+
+
+# Status for weeks whose trailing window holds no defect occurrences.
+NO_RECENT_DEFECTS = "No Recent Defects"
+
+TIMELINE_COLUMNS = [
+    "defect_id",
+    "severity",
+    "week_start",
+    "impacted_lot_count",
+    "weeks_with_defects",
+    "total_defects",
+    "trend_classification",
+    "previous_classification",
+    "status_changed",
+]
+
+
+def _empty_timeline() -> pd.DataFrame:
+    """Return an empty timeline with stable columns.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    return pd.DataFrame(
+        {
+            "defect_id": pd.Series(dtype="string"),
+            "severity": pd.Series(dtype="string"),
+            "week_start": pd.Series(dtype="datetime64[ns]"),
+            "impacted_lot_count": pd.Series(dtype="int64"),
+            "weeks_with_defects": pd.Series(dtype="int64"),
+            "total_defects": pd.Series(dtype="int64"),
+            "trend_classification": pd.Series(dtype=object),
+            "previous_classification": pd.Series(dtype=object),
+            "status_changed": pd.Series(dtype=bool),
+        }
+    )
+
+
+def _sliding_sums(
+    row_offsets: np.ndarray,
+    group_codes: np.ndarray,
+    enter_weeks: np.ndarray,
+    leave_weeks: np.ndarray,
+    weights: np.ndarray,
+) -> np.ndarray:
+    """Accumulate weighted [enter, leave) week intervals onto the timeline grid.
+
+    ``row_offsets[g]`` is the first grid slot of group ``g`` and each group
+    owns one spare slot past its last week. Exits beyond a group's final week
+    land in that spare slot, so running sums never leak into the next group.
+
+    Time complexity: O(e + t), where e is intervals and t is grid slots.
+    Space complexity: O(t).
+    """
+    group_first_slot = row_offsets[group_codes]
+    group_last_slot = row_offsets[group_codes + 1] - 1
+    diff = np.zeros(int(row_offsets[-1]), dtype=np.int64)
+    np.add.at(diff, group_first_slot + enter_weeks, weights)
+    np.add.at(diff, np.minimum(group_first_slot + leave_weeks, group_last_slot), -weights)
+    return np.cumsum(diff)
+
+
+def rolling_recurrence(events: pd.DataFrame | EventStore, window_weeks: int = 12) -> pd.DataFrame:
+    """Classify every defect bucket at every week over a trailing window.
+
+    Each output row is one (defect_id, severity, week_start) where
+    ``week_start`` is the Tuesday opening the ``W-MON`` week. Counts cover
+    the ``window_weeks`` weeks ending with that week; AC3 applies (rows with
+    ``qty_defects == 0`` are ignored) and undated rows are skipped because
+    they belong to no window. Weeks whose window is empty are labeled
+    ``NO_RECENT_DEFECTS``, so a defect that stops occurring visibly decays.
+    ``status_changed`` marks the first week and every change of
+    ``trend_classification``.
+
+    Rows are ordered by defect_id, severity (nulls last) and week.
+
+    Time complexity: O(n log n + t), where n is defect rows and t is output
+    rows (buckets times weeks from first occurrence to the last week).
+    Space complexity: O(n + t).
+    """
+    if window_weeks < 1:
+        raise ValueError("window_weeks must be at least 1")
+
+    if isinstance(events, pd.DataFrame):
+        frame = _normalize_analysis_frame(events)
+        non_zero = frame[(frame["qty_defects"] > 0) & (frame["defect_id"].notna())]
+        enriched = non_zero.assign(week_ordinal=_week_ordinals(non_zero["inspection_timestamp"]))
+    else:
+        frame = events.frame
+        enriched = frame[(frame["qty_defects"] > 0) & (frame["defect_id"].notna())]
+    enriched = enriched[enriched["week_ordinal"].notna()]
+    if enriched.empty:
+        return _empty_timeline()
+
+    groups = enriched.groupby(["defect_id", "severity"], dropna=False, observed=True, sort=True)
+    keys = groups.size().reset_index()[["defect_id", "severity"]]
+    group_codes = groups.ngroup().to_numpy(dtype=np.int64)
+    weeks = enriched["week_ordinal"].to_numpy(dtype=np.int64)
+    group_count = len(keys)
+
+    # Grid: each bucket spans its first week through the latest week overall,
+    # plus one spare slot (see _sliding_sums).
+    first_week = np.full(group_count, np.iinfo(np.int64).max)
+    np.minimum.at(first_week, group_codes, weeks)
+    last_week = int(weeks.max())
+    spans = last_week - first_week + 1
+    row_offsets = np.concatenate(([0], np.cumsum(spans + 1)))
+    relative_week = weeks - first_week[group_codes]
+
+    # Weeks with defects and defect quantity: each (bucket, week) enters at
+    # its week and leaves window_weeks later.
+    week_keys = pd.DataFrame(
+        {"group": group_codes, "week": relative_week, "qty": enriched["qty_defects"].to_numpy(dtype=np.int64)}
+    )
+    per_week = week_keys.groupby(["group", "week"], sort=False)["qty"].sum().reset_index()
+    week_group = per_week["group"].to_numpy(dtype=np.int64)
+    week_start = per_week["week"].to_numpy(dtype=np.int64)
+    weeks_in_window = _sliding_sums(
+        row_offsets, week_group, week_start, week_start + window_weeks, np.ones(len(per_week), dtype=np.int64)
+    )
+    qty_in_window = _sliding_sums(
+        row_offsets, week_group, week_start, week_start + window_weeks, per_week["qty"].to_numpy(dtype=np.int64)
+    )
+
+    # Distinct lots: a lot's weekly occurrences are merged into maximal
+    # coverage intervals so overlapping windows never count it twice.
+    lots = enriched["normalized_lot_id"]
+    has_lot = lots.notna().to_numpy()
+    lot_codes = pd.factorize(lots[has_lot])[0]
+    lot_keys = pd.DataFrame({"group": group_codes[has_lot], "lot": lot_codes, "week": relative_week[has_lot]})
+    lot_keys = lot_keys.drop_duplicates().sort_values(["group", "lot", "week"], kind="mergesort")
+    lot_group = lot_keys["group"].to_numpy(dtype=np.int64)
+    lot_code = lot_keys["lot"].to_numpy(dtype=np.int64)
+    lot_week = lot_keys["week"].to_numpy(dtype=np.int64)
+    # A new interval starts at a new (bucket, lot) or once the previous
+    # occurrence has left the window.
+    starts = np.ones(len(lot_keys), dtype=bool)
+    starts[1:] = (
+        (lot_group[1:] != lot_group[:-1]) | (lot_code[1:] != lot_code[:-1]) | (lot_week[1:] >= lot_week[:-1] + window_weeks)
+    )
+    start_positions = np.flatnonzero(starts)
+    end_positions = np.append(start_positions[1:] - 1, len(lot_keys) - 1)
+    lots_in_window = _sliding_sums(
+        row_offsets,
+        lot_group[start_positions],
+        lot_week[start_positions],
+        lot_week[end_positions] + window_weeks,
+        np.ones(len(start_positions), dtype=np.int64),
+    )
+
+    # Drop each bucket's spare slot.
+    slot_group = np.repeat(np.arange(group_count), spans + 1)
+    slot_week = np.arange(int(row_offsets[-1])) - row_offsets[slot_group]
+    keep = slot_week < spans[slot_group]
+    slot_group, slot_week = slot_group[keep], slot_week[keep]
+    lots_in_window, weeks_in_window, qty_in_window = lots_in_window[keep], weeks_in_window[keep], qty_in_window[keep]
+
+    critical = keys["severity"].astype(object).eq("Critical").to_numpy(dtype=bool)[slot_group]
+    status = _classify_status(lots_in_window, weeks_in_window, np.zeros(len(slot_group), dtype=bool), critical)
+    status = np.where(weeks_in_window == 0, NO_RECENT_DEFECTS, status).astype(object)
+
+    # Previous status within the same bucket; None on each bucket's first week.
+    first_of_group = slot_week == 0
+    previous = np.empty(len(status), dtype=object)
+    previous[1:] = status[:-1]
+    previous[first_of_group] = None
+    changed = first_of_group | (status != previous)
+
+    absolute_week = first_week[slot_group] + slot_week
+    timeline = pd.DataFrame(
+        {
+            "defect_id": pd.array(keys["defect_id"].astype(object).to_numpy()[slot_group], dtype="string"),
+            "severity": pd.array(keys["severity"].astype(object).to_numpy()[slot_group], dtype="string"),
+            "week_start": pd.to_datetime(absolute_week * 7 + _WEEK_ANCHOR_DAY, unit="D"),
+            "impacted_lot_count": lots_in_window,
+            "weeks_with_defects": weeks_in_window,
+            "total_defects": qty_in_window,
+            "trend_classification": status,
+            "previous_classification": previous,
+            "status_changed": changed,
+        }
+    )
+    return timeline[TIMELINE_COLUMNS]
+
+
+def status_transitions(timeline: pd.DataFrame) -> pd.DataFrame:
+    """Return only the timeline rows where a bucket's status changed.
+
+    Time complexity: O(t).
+    Space complexity: O(t).
+    """
+    return timeline[timeline["status_changed"]].reset_index(drop=True)
@@ -0,0 +1,141 @@
+"""Classification from weekly per-lot defect rollups.
+
+A rollup row summarizes every defect occurrence of one (defect, week, lot)
+cell: summed ``qty_defects``, event count and first/last timestamps. Those
+are sufficient statistics for every ``classify_defects`` aggregate (distinct
+lots, distinct weeks, min/max, sum) and for missing-week detection, so
+classifying c rollup cells gives the same summary as classifying n >> c
+events. ``operations.defect_week_rollup`` (see ``db/schema.sql``) keeps the
+cells current in Postgres; ``rollup_events`` builds the same cells in memory.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from steelworks_defect.analysis import (
+    _WEEK_ANCHOR_DAY,
+    _empty_summary,
+    _finalize_summary,
+    _missing_weeks_by_group,
+    _normalize_analysis_frame,
+    _week_ordinals,
+)
+from steelworks_defect.instrumentation import stage
+
+if TYPE_CHECKING:
+    from steelworks_defect.event_store import EventStore
+
+
+# Column order shared by rollup_events and db.fetch_defect_week_rollup.
+ROLLUP_COLUMNS = [
+    "defect_id",
+    "severity",
+    "week_start",
+    "normalized_lot_id",
+    "qty_defects",
+    "event_count",
+    "first_detected",
+    "last_detected",
+]
+
+
+def rollup_events(events: pd.DataFrame | EventStore) -> pd.DataFrame:
+    """Aggregate defect occurrences into (defect, severity, week, lot) cells.
+
+    AC3 applies (zero-defect rows are dropped). Null lots and undated rows
+    keep their own cells, mirroring ``classify_defects``' treatment of them.
+
+    Time complexity: O(n log c), where n is events and c is cells.
+    Space complexity: O(n + c).
+    """
+    if isinstance(events, pd.DataFrame):
+        frame = _normalize_analysis_frame(events)
+        non_zero = frame[(frame["qty_defects"] > 0) & (frame["defect_id"].notna())]
+        enriched = non_zero.assign(week_ordinal=_week_ordinals(non_zero["inspection_timestamp"]))
+    else:
+        frame = events.frame
+        enriched = frame[(frame["qty_defects"] > 0) & (frame["defect_id"].notna())]
+
+    if enriched.empty:
+        return pd.DataFrame(
+            {
+                "defect_id": pd.Series(dtype="string"),
+                "severity": pd.Series(dtype="string"),
+                "week_start": pd.Series(dtype="datetime64[ns]"),
+                "normalized_lot_id": pd.Series(dtype=object),
+                "qty_defects": pd.Series(dtype="int64"),
+                "event_count": pd.Series(dtype="int64"),
+                "first_detected": pd.Series(dtype="datetime64[ns]"),
+                "last_detected": pd.Series(dtype="datetime64[ns]"),
+            }
+        )[ROLLUP_COLUMNS]
+
+    cells = (
+        enriched.groupby(["defect_id", "severity", "week_ordinal", "normalized_lot_id"], dropna=False, observed=True)
+        .agg(
+            qty_defects=("qty_defects", "sum"),
+            event_count=("qty_defects", "size"),
+            first_detected=("inspection_timestamp", "min"),
+            last_detected=("inspection_timestamp", "max"),
+        )
+        .reset_index()
+    )
+    ordinals = cells["week_ordinal"]
+    days = ordinals.to_numpy(dtype=np.float64, na_value=np.nan) * 7 + _WEEK_ANCHOR_DAY
+    cells["week_start"] = pd.to_datetime(days, unit="D")
+    return cells.astype(
+        {
+            "defect_id": "string",
+            "severity": "string",
+            "normalized_lot_id": object,
+            "qty_defects": np.int64,
+            "event_count": np.int64,
+        }
+    )[ROLLUP_COLUMNS]
+
+
+def classify_rollup(rollup: pd.DataFrame) -> pd.DataFrame:
+    """Classify defects from rollup cells; output matches ``classify_defects``.
+
+    Accepts ``rollup_events`` output or ``db.fetch_defect_week_rollup`` rows.
+
+    Time complexity: O(c + w + g log g), where c is cells, w is weeks spanned
+    summed across groups and g is defect buckets.
+    Space complexity: O(c + w).
+    """
+    if rollup.empty:
+        return _empty_summary()
+
+    with stage("classify_rollup.groupby", rows=len(rollup)):
+        cells = rollup.assign(week_ordinal=_week_ordinals(pd.to_datetime(rollup["week_start"])))
+        groups = cells.groupby(["defect_id", "severity"], dropna=False, observed=True)
+        grouped = groups.agg(
+            impacted_lot_count=("normalized_lot_id", "nunique"),
+            weeks_with_defects=("week_ordinal", "nunique"),
+            first_detected=("first_detected", "min"),
+            last_detected=("last_detected", "max"),
+            total_defects=("qty_defects", "sum"),
+        ).reset_index()
+        grouped = grouped.astype(
+            {
+                "defect_id": "string",
+                "severity": "string",
+                "impacted_lot_count": np.int64,
+                "weeks_with_defects": np.int64,
+                "total_defects": np.int64,
+            }
+        )
+        group_codes = groups.ngroup().to_numpy()
+
+    with stage("classify_rollup.missing_weeks", rows=len(grouped)):
+        dated = cells["week_ordinal"].notna().to_numpy()
+        missing_periods = _missing_weeks_by_group(
+            group_codes[dated],
+            cells["week_ordinal"][dated].to_numpy(dtype=np.int64),
+            len(grouped),
+        )
+    return _finalize_summary(grouped, missing_periods)
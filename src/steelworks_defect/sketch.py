@@ -0,0 +1,394 @@
+"""Approximate distinct lot counts with mergeable HyperLogLog sketches.
+
+``impacted_lot_count`` is a distinct count, and exact distinct counting keeps
+every lot ID of every defect bucket in memory. ``LotSketch`` bounds that:
+
+* While a sketch has seen few lots it stores their sorted 64-bit hashes
+  (sparse mode), so small counts -- including everything near the recurring
+  threshold of 2 lots -- are exact.
+* Past ``2**precision / 8`` lots it switches to ``2**precision`` one-byte
+  HyperLogLog registers (dense mode), no larger than the hashes it replaces,
+  with relative standard error ``1.04 / sqrt(2**precision)``.
+
+Sketches merge losslessly (set union / register max) and serialize to bytes,
+so per-week sketches can be stored once and merged into any time window or
+across shards without rescanning events.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from steelworks_defect.analysis import (
+    _empty_summary,
+    _finalize_summary,
+    _missing_weeks_by_group,
+    _normalize_analysis_frame,
+    _week_ordinals,
+)
+from steelworks_defect.instrumentation import stage
+
+if TYPE_CHECKING:
+    from steelworks_defect.event_store import EventStore
+
+
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+# Buckets whose estimate is below this are recounted exactly, so statuses that
+# hinge on 1 vs 2 lots never depend on an estimate.
+EXACT_FALLBACK_BELOW = 16
+
+_HEADER = struct.Struct("<2sBB")
+_MAGIC = b"LS"
+_SPARSE, _DENSE = 0, 1
+
+
+def precision_for_error(relative_error: float) -> int:
+    """Return the smallest precision whose standard error is at most ``relative_error``.
+
+    Time complexity: O(1).
+    Space complexity: O(1).
+    """
+    if not 0.0 < relative_error < 1.0:
+        raise ValueError("relative_error must be between 0 and 1")
+    precision = math.ceil(math.log2((1.04 / relative_error) ** 2))
+    return min(max(precision, MIN_PRECISION), MAX_PRECISION)
+
+
+def hash_lots(values: pd.Series | np.ndarray) -> np.ndarray:
+    """Hash lot IDs to uint64 with pandas' stable, seedless hash.
+
+    Categorical input hashes each category once. Null lots must be removed
+    by the caller (they are not counted as lots).
+
+    Time complexity: O(n) (O(u + n) for categoricals with u categories).
+    Space complexity: O(n).
+    """
+    if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+        category_hashes = pd.util.hash_array(values.cat.categories.to_numpy(dtype=object), categorize=False)
+        return category_hashes[values.cat.codes.to_numpy()]
+    return pd.util.hash_array(np.asarray(values, dtype=object), categorize=False)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Vectorized ``int.bit_length`` for uint64 arrays.
+
+    Time complexity: O(n).
+    Space complexity: O(n).
+    """
+    remaining = values.copy()
+    lengths = np.zeros(values.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        wide = remaining >= np.uint64(1 << shift)
+        lengths[wide] += shift
+        remaining[wide] >>= np.uint64(shift)
+    return lengths + (remaining > 0)
+
+
+def _register_updates(hashes: np.ndarray, precision: int) -> tuple[np.ndarray, np.ndarray]:
+    """Split hashes into register indexes and HLL ranks (leading zeros + 1).
+
+    Time complexity: O(n).
+    Space complexity: O(n).
+    """
+    suffix_bits = 64 - precision
+    index = (hashes >> np.uint64(suffix_bits)).astype(np.int64)
+    suffix = hashes & np.uint64((1 << suffix_bits) - 1)
+    rank = (suffix_bits - _bit_length(suffix) + 1).astype(np.uint8)
+    return index, rank
+
+
+def _estimate_registers(registers: np.ndarray) -> float:
+    """Standard HyperLogLog estimate with linear counting for small ranges.
+
+    Time complexity: O(m), where m is register count.
+    Space complexity: O(1) beyond a 65-bucket histogram.
+    """
+    m = registers.size
+    alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1.0 + 1.079 / m))
+    histogram = np.bincount(registers, minlength=65)
+    harmonic = float(np.dot(histogram, np.exp2(-np.arange(histogram.size, dtype=np.float64))))
+    estimate = alpha * m * m / harmonic
+    zeros = int(histogram[0])
+    if estimate <= 2.5 * m and zeros > 0:
+        return m * math.log(m / zeros)
+    return estimate
+
+
+@dataclass(frozen=True, eq=False)
+class LotSketch:
+    """Mergeable distinct-lot sketch (sparse exact hashes or dense HLL registers).
+
+    Attributes:
+        precision: log2 of the dense register count.
+        hashes: Sorted unique lot hashes while sparse, else None.
+        registers: ``uint8[2**precision]`` HLL registers once dense, else None.
+
+    Space complexity: O(min(k, 2**precision / 8)) hashes, or 2**precision bytes.
+    """
+
+    precision: int
+    hashes: np.ndarray | None = None
+    registers: np.ndarray | None = None
+
+    @property
+    def sparse_limit(self) -> int:
+        """Most hashes kept before switching to registers (same byte size).
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        return (1 << self.precision) // 8
+
+    @property
+    def is_exact(self) -> bool:
+        """True while the sketch still holds every distinct hash.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        return self.registers is None
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of dense-mode counts.
+
+        Time complexity: O(1).
+        Space complexity: O(1).
+        """
+        return 1.04 / math.sqrt(1 << self.precision)
+
+    @classmethod
+    def from_hashes(cls, hashes: np.ndarray, precision: int = 14) -> LotSketch:
+        """Build a sketch from (possibly repeated) lot hashes.
+
+        Time complexity: O(n log n) while sparse, O(n) dense.
+        Space complexity: O(n).
+        """
+        if not MIN_PRECISION <= precision <= MAX_PRECISION:
+            raise ValueError(f"precision must be between {MIN_PRECISION} and {MAX_PRECISION}")
+        unique = np.unique(np.asarray(hashes, dtype=np.uint64))
+        sketch = cls(precision=precision, hashes=unique)
+        return sketch._densify() if unique.size > sketch.sparse_limit else sketch
+
+    def _densify(self) -> LotSketch:
+        """Return the dense (register) form of this sketch.
+
+        Time complexity: O(k + m).
+        Space complexity: O(k + m).
+        """
+        if self.registers is not None:
+            return self
+        registers = np.zeros(1 << self.precision, dtype=np.uint8)
+        index, rank = _register_updates(self.hashes, self.precision)
+        np.maximum.at(registers, index, rank)
+        return LotSketch(precision=self.precision, registers=registers)
+
+    def merge(self, other: LotSketch) -> LotSketch:
+        """Return the sketch of the union of both lot sets.
+
+        Time complexity: O(k1 + k2) sparse, O(m) dense.
+        Space complexity: O(k1 + k2) or O(m).
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        if self.is_exact and other.is_exact:
+            union = np.union1d(self.hashes, other.hashes)
+            merged = LotSketch(precision=self.precision, hashes=union)
+            return merged._densify() if union.size > self.sparse_limit else merged
+        return LotSketch(
+            precision=self.precision,
+            registers=np.maximum(self._densify().registers, other._densify().registers),
+        )
+
+    def count(self) -> int:
+        """Return the distinct lot count: exact while sparse, estimated once dense.
+
+        A dense sketch is known to exceed ``sparse_limit`` lots, so its
+        estimate is clamped above that.
+
+        Time complexity: O(1) sparse, O(m) dense.
+        Space complexity: O(1).
+        """
+        if self.is_exact:
+            return int(self.hashes.size)
+        return max(round(_estimate_registers(self.registers)), self.sparse_limit + 1)
+
+    def to_bytes(self) -> bytes:
+        """Serialize for storage (e.g. a bytes column in a per-week Parquet file).
+
+        Time complexity: O(k) or O(m).
+        Space complexity: O(k) or O(m).
+        """
+        if self.is_exact:
+            return _HEADER.pack(_MAGIC, self.precision, _SPARSE) + self.hashes.astype("<u8").tobytes()
+        return _HEADER.pack(_MAGIC, self.precision, _DENSE) + self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> LotSketch:
+        """Restore a sketch written by ``to_bytes``.
+
+        Time complexity: O(k) or O(m).
+        Space complexity: O(k) or O(m).
+        """
+        magic, precision, kind = _HEADER.unpack_from(payload)
+        if magic != _MAGIC or kind not in (_SPARSE, _DENSE):
+            raise ValueError("Not a serialized LotSketch")
+        body = payload[_HEADER.size :]
+        if kind == _SPARSE:
+            return cls(precision=precision, hashes=np.frombuffer(body, dtype="<u8").astype(np.uint64))
+        registers = np.frombuffer(body, dtype=np.uint8).copy()
+        if registers.size != 1 << precision:
+            raise ValueError("Serialized LotSketch has the wrong register count")
+        return cls(precision=precision, registers=registers)
+
+
+def weekly_lot_sketches(cells: pd.DataFrame, precision: int = 14) -> pd.DataFrame:
+    """Build one serialized lot sketch per (defect_id, severity, week_start).
+
+    ``cells`` is rollup-shaped (``rollup.rollup_events`` or
+    ``db.fetch_defect_week_rollup``), so sketches are built from O(cells)
+    rows rather than raw events. The ``sketch`` column holds bytes and can be
+    stored with ``DataFrame.to_parquet``; merge stored weeks into any window
+    with ``merge_weekly_sketches``.
+
+    Time complexity: O(c log c), where c is rollup cells.
+    Space complexity: O(c).
+    """
+    dated = cells[cells["week_start"].notna() & cells["normalized_lot_id"].notna()]
+    keys = ["defect_id", "severity", "week_start"]
+    hashed = dated[keys].assign(lot_hash=hash_lots(dated["normalized_lot_id"]))
+    rows = []
+    for key, group in hashed.groupby(keys, dropna=False, sort=True, observed=True):
+        rows.append((*key, LotSketch.from_hashes(group["lot_hash"].to_numpy(), precision).to_bytes()))
+    return pd.DataFrame(rows, columns=[*keys, "sketch"]).astype({"defect_id": "string", "severity": "string"})
+
+
+def merge_weekly_sketches(
+    weekly: pd.DataFrame,
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """Merge stored weekly sketches into per-defect lot counts for a window.
+
+    ``start`` and ``end`` bound ``week_start`` inclusively; None leaves that
+    side open. Returns defect_id, severity, impacted_lot_count and
+    ``lot_count_exact`` (True when the count came from sparse, exact hashes).
+
+    Time complexity: O(s * k), where s is sketches in the window and k is
+    their size.
+    Space complexity: O(g * k).
+    """
+    selected = weekly
+    if start is not None:
+        selected = selected[selected["week_start"] >= pd.Timestamp(start)]
+    if end is not None:
+        selected = selected[selected["week_start"] <= pd.Timestamp(end)]
+
+    rows = []
+    for key, group in selected.groupby(["defect_id", "severity"], dropna=False, sort=True, observed=True):
+        payloads = group["sketch"].tolist()
+        merged = LotSketch.from_bytes(payloads[0])
+        for payload in payloads[1:]:
+            merged = merged.merge(LotSketch.from_bytes(payload))
+        rows.append((*key, merged.count(), merged.is_exact))
+    return pd.DataFrame(rows, columns=["defect_id", "severity", "impacted_lot_count", "lot_count_exact"])
+
+
+def _approximate_lot_counts(
+    group_codes: np.ndarray,
+    lots: pd.Series,
+    group_count: int,
+    precision: int,
+    exact_below: int,
+) -> np.ndarray:
+    """Estimate distinct lots per group; recount exactly where the estimate is small.
+
+    All groups share one ``(group_count, 2**precision)`` uint8 register
+    matrix filled by a single scatter-max, instead of one hash set of lot
+    strings per group.
+
+    Time complexity: O(n + g * m), plus O(r) for the r rows recounted exactly.
+    Space complexity: O(n + g * m).
+    """
+    present = lots.notna().to_numpy()
+    codes = group_codes[present]
+    index, rank = _register_updates(hash_lots(lots[present]), precision)
+    width = 1 << precision
+    registers = np.zeros(group_count * width, dtype=np.uint8)
+    np.maximum.at(registers, codes * width + index, rank)
+    registers = registers.reshape(group_count, width)
+
+    counts = np.zeros(group_count, dtype=np.int64)
+    has_lots = np.bincount(codes, minlength=group_count) > 0
+    estimates = np.array([_estimate_registers(row) if used else 0.0 for row, used in zip(registers, has_lots)])
+    counts[:] = np.rint(estimates).astype(np.int64)
+
+    # Exact fallback: only small groups are recounted, so this stays cheap.
+    near_threshold = np.flatnonzero(has_lots & (estimates < exact_below))
+    if near_threshold.size:
+        recount = np.isin(codes, near_threshold)
+        exact = pd.Series(lots[present].to_numpy()[recount]).groupby(codes[recount]).nunique()
+        counts[exact.index.to_numpy()] = exact.to_numpy()
+    return counts
+
+
+def classify_defects_approximate(
+    events: pd.DataFrame | EventStore,
+    relative_error: float = 0.01,
+    exact_below: int = EXACT_FALLBACK_BELOW,
+) -> pd.DataFrame:
+    """Classify like ``classify_defects`` with HyperLogLog lot counts.
+
+    ``impacted_lot_count`` has relative standard error about
+    ``relative_error``, except that buckets estimated below ``exact_below``
+    lots are recounted exactly -- so the AC1/AC2 lot thresholds (1 vs 2+
+    lots) always match the exact engine. Every other column is exact.
+
+    Time complexity: O(n + g * m + g log g), where m = 2**precision_for_error(relative_error).
+    Space complexity: O(n + g * m).
+    """
+    precision = precision_for_error(relative_error)
+    with stage("classify_approximate.normalize", rows=len(events)):
+        if isinstance(events, pd.DataFrame):
+            frame = _normalize_analysis_frame(events)
+            # AC3: Exclude non-defect rows from trend counting.
+            non_zero = frame[(frame["qty_defects"] > 0) & (frame["defect_id"].notna())]
+            enriched = non_zero.assign(week_ordinal=_week_ordinals(non_zero["inspection_timestamp"]))
+        else:
+            frame = events.frame
+            enriched = frame[(frame["qty_defects"] > 0) & (frame["defect_id"].notna())]
+    if enriched.empty:
+        return _empty_summary()
+
+    with stage("classify_approximate.groupby", rows=len(enriched)):
+        groups = enriched.groupby(["defect_id", "severity"], dropna=False, observed=True)
+        grouped = groups.agg(
+            weeks_with_defects=("week_ordinal", "nunique"),
+            first_detected=("inspection_timestamp", "min"),
+            last_detected=("inspection_timestamp", "max"),
+            total_defects=("qty_defects", "sum"),
+        ).reset_index()
+        grouped = grouped.astype({"defect_id": "string", "severity": "string", "total_defects": np.int64})
+        group_codes = groups.ngroup().to_numpy()
+
+    with stage("classify_approximate.lot_sketches", rows=len(grouped)):
+        lot_counts = _approximate_lot_counts(
+            group_codes, enriched["normalized_lot_id"], len(grouped), precision, exact_below
+        )
+        grouped.insert(2, "impacted_lot_count", lot_counts)
+
+    week_ordinals = enriched["week_ordinal"]
+    dated = week_ordinals.notna().to_numpy()
+    missing_periods = _missing_weeks_by_group(
+        group_codes[dated],
+        week_ordinals[dated].to_numpy(dtype=np.int64),
+        len(grouped),
+    )
+    return _finalize_summary(grouped, missing_periods)
@@ -0,0 +1,244 @@
+"""Seeded synthetic inspection histories for benchmarks and tests.
+
+``generate_inspection_history`` produces frames in the exact
+``db.fetch_inspection_events`` shape, so every analysis and DB path can be
+exercised at arbitrary scale without production data;
+``generate_shipment_history`` adds matching shipments for the lot-impact join,
+and ``generate_raw_lot_ids`` produces messy raw lot IDs for normalization.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+# Column order returned by db.fetch_inspection_events.
+SYNTHETIC_COLUMNS = [
+    "event_id",
+    "defect_id",
+    "severity",
+    "normalized_lot_id",
+    "inspection_timestamp",
+    "qty_checked",
+    "qty_defects",
+    "disposition",
+    "notes",
+    "inspector_name",
+    "line_id",
+    "part_number",
+    "shift",
+]
+
+_SEVERITIES = np.array(["Minor", "Major", "Critical", "Cosmetic"], dtype=object)
+_DISPOSITIONS = np.array(["Rework", "Scrap", "Use As Is", "Hold"], dtype=object)
+_INSPECTORS = np.array(["M. Patel", "A. Nguyen", "R. Okafor", "J. Silva", "K. Weber"], dtype=object)
+_LINES = np.array(["Line 1", "Line 2", "Line 3", "Line 4"], dtype=object)
+_SHIFTS = np.array(["Day", "Swing", "Night"], dtype=object)
+_CUSTOMERS = np.array(
+    ["Apex Fabrication", "Northline Auto", "Ridgeway Structural", "Harbor Marine", "Summit Rail", "Keystone HVAC"],
+    dtype=object,
+)
+_CARRIERS = np.array(["Roadway Freight", "Midwest Haulers", "BlueLine Logistics"], dtype=object)
+_SHIP_STATUSES = np.array(["Shipped", "Partial", "On Hold", "Backordered"], dtype=object)
+_PARTS = np.array([f"SW-{number:04d}-{suffix}" for number in (1001, 4420, 8812, 9925) for suffix in "ABC"], dtype=object)
+
+
+def generate_inspection_history(
+    rows: int,
+    lots: int = 2_000,
+    defect_codes: int = 25,
+    weeks: int = 104,
+    zero_defect_ratio: float = 0.6,
+    gap_ratio: float = 0.1,
+    seed: int = 0,
+    start: str = "2024-01-02",
+) -> pd.DataFrame:
+    """Generate a reproducible inspection history.
+
+    Lots are produced in a random week and inspected over the following days;
+    defect codes follow a Zipf-like frequency with one fixed severity each.
+    ``zero_defect_ratio`` of rows are defect-free (null defect reference, as in
+    the real exports), and each defect code is absent in roughly ``gap_ratio``
+    of weeks so missing-period detection (AC8) has gaps to find.
+
+    Time complexity: O(rows log rows) for the chronological event_id order.
+    Space complexity: O(rows).
+    """
+    if rows < 0:
+        raise ValueError("rows must be non-negative")
+    if min(lots, defect_codes, weeks) < 1:
+        raise ValueError("lots, defect_codes and weeks must be at least 1")
+    if not (0.0 <= zero_defect_ratio <= 1.0 and 0.0 <= gap_ratio < 1.0):
+        raise ValueError("zero_defect_ratio must be in [0, 1] and gap_ratio in [0, 1)")
+
+    rng = np.random.default_rng(seed)
+    origin = pd.Timestamp(start)
+
+    # Lot master: each lot belongs to one production week, line, shift and part.
+    lot_ids = np.array([f"LOT-SYN-{index:07d}" for index in range(lots)], dtype=object)
+    lot_week = rng.integers(0, weeks, lots)
+    # Production dimensions use their own stream so adding them did not change
+    # the histories (and benchmark inputs) generated for existing seeds.
+    dimension_rng = np.random.default_rng([seed, 1])
+    lot_line = _LINES[dimension_rng.integers(0, len(_LINES), lots)]
+    lot_shift = _SHIFTS[dimension_rng.integers(0, len(_SHIFTS), lots)]
+    lot_part = _PARTS[dimension_rng.integers(0, len(_PARTS), lots)]
+
+    # Defect dictionary with Zipf-like popularity and a fixed severity.
+    codes = np.array([f"D{index:03d}" for index in range(defect_codes)], dtype=object)
+    popularity = 1.0 / np.arange(1, defect_codes + 1)
+    code_severity = _SEVERITIES[rng.integers(0, len(_SEVERITIES), defect_codes)]
+
+    lot_index = rng.integers(0, lots, rows)
+    week = lot_week[lot_index]
+    seconds = week * 7 * 86_400 + rng.integers(0, 10 * 86_400, rows)
+    timestamps = origin + pd.to_timedelta(seconds, unit="s")
+
+    code_index = rng.choice(defect_codes, size=rows, p=popularity / popularity.sum())
+    # A (code, week) pair is a gap when its defect is absent that week.
+    gapped = rng.random((defect_codes, weeks + 2)) < gap_ratio
+    observed_week = np.minimum(seconds // (7 * 86_400), weeks + 1)
+    has_defect = (rng.random(rows) >= zero_defect_ratio) & ~gapped[code_index, observed_week]
+
+    qty_checked = rng.integers(10, 200, rows).astype(np.int64)
+    qty_defects = np.where(has_defect, np.minimum(rng.geometric(0.4, rows), qty_checked), 0).astype(np.int64)
+
+    frame = pd.DataFrame(
+        {
+            "defect_id": np.where(has_defect, codes[code_index], None),
+            "severity": np.where(has_defect, code_severity[code_index], None),
+            "normalized_lot_id": lot_ids[lot_index],
+            "inspection_timestamp": timestamps,
+            "qty_checked": qty_checked,
+            "qty_defects": qty_defects,
+            "disposition": np.where(has_defect, _DISPOSITIONS[rng.integers(0, len(_DISPOSITIONS), rows)], None),
+            "notes": None,
+            "inspector_name": _INSPECTORS[rng.integers(0, len(_INSPECTORS), rows)],
+            "line_id": lot_line[lot_index],
+            "part_number": lot_part[lot_index],
+            "shift": lot_shift[lot_index],
+        }
+    )
+    # IDs follow load (chronological) order, like inspection_event.id.
+    frame = frame.sort_values("inspection_timestamp", kind="mergesort").reset_index(drop=True)
+    frame.insert(0, "event_id", np.arange(1, rows + 1, dtype=np.int64))
+    return frame[SYNTHETIC_COLUMNS]
+
+
+# Column order of the loader's shipment staging frame (loader._STAGING_COLUMNS).
+SHIPMENT_COLUMNS = [
+    "normalized_lot_id",
+    "sales_order",
+    "customer",
+    "ship_date",
+    "carrier",
+    "bol_number",
+    "qty_shipped",
+    "ship_status",
+]
+
+
+def generate_shipment_history(
+    events: pd.DataFrame,
+    shipped_ratio: float = 0.7,
+    max_shipments_per_lot: int = 3,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Generate shipments for the lots of a synthetic inspection history.
+
+    ``shipped_ratio`` of lots get between one and ``max_shipments_per_lot``
+    shipments (distinct sales orders) dated after the lot's last inspection;
+    the rest have none yet. Statuses skew toward "Shipped".
+
+    Time complexity: O(n + s), where n is events and s is shipments.
+    Space complexity: O(l + s), where l is lots.
+    """
+    if not 0.0 <= shipped_ratio <= 1.0:
+        raise ValueError("shipped_ratio must be in [0, 1]")
+    if max_shipments_per_lot < 1:
+        raise ValueError("max_shipments_per_lot must be at least 1")
+
+    rng = np.random.default_rng([seed, 2])
+    last_inspected = events.groupby("normalized_lot_id", sort=True)["inspection_timestamp"].max()
+    lots = last_inspected.index.to_numpy(dtype=object)
+    shipped = rng.random(len(lots)) < shipped_ratio
+    per_lot = np.where(shipped, rng.integers(1, max_shipments_per_lot + 1, len(lots)), 0)
+
+    # One row per shipment; each lot's shipments are consecutive.
+    lot_index = np.repeat(np.arange(len(lots)), per_lot)
+    count = len(lot_index)
+    order_numbers = np.arange(1, count + 1)
+    ship_dates = last_inspected.to_numpy()[lot_index] + pd.to_timedelta(rng.integers(1, 21, count), unit="D")
+    return pd.DataFrame(
+        {
+            "normalized_lot_id": lots[lot_index],
+            "sales_order": [f"SO-{number:07d}" for number in order_numbers],
+            "customer": _CUSTOMERS[rng.integers(0, len(_CUSTOMERS), count)],
+            "ship_date": pd.DatetimeIndex(ship_dates).normalize(),
+            "carrier": _CARRIERS[rng.integers(0, len(_CARRIERS), count)],
+            "bol_number": [f"BOL-{number:07d}" for number in order_numbers],
+            "qty_shipped": rng.integers(50, 500, count).astype(np.int64),
+            "ship_status": rng.choice(_SHIP_STATUSES, size=count, p=[0.7, 0.15, 0.1, 0.05]),
+        },
+        columns=SHIPMENT_COLUMNS,
+    )
+
+
+# Spellings seen in the ERP exports; all normalize exactly.
+_LOT_ID_SPELLINGS = np.array(["LOT-{}-{}", "L0T-{}-{}", "Lot-{}-{}", "LOT {} {} ", "LOT_{}-{}", "LOT{}{}"], dtype=object)
+# Prefix typos one edit from "LOT" (transposition, doubling, substitution, deletion).
+_PREFIX_TYPOS = ["LTO", "LOTT", "IOT", "LT"]
+
+
+def generate_raw_lot_ids(
+    rows: int,
+    lots: int = 20_000,
+    typo_ratio: float = 0.02,
+    seed: int = 0,
+    start: str = "2024-01-02",
+) -> pd.DataFrame:
+    """Generate messy raw lot IDs as typed into the ERP exports.
+
+    Each row picks one of ``lots`` canonical ``LOT-YYYYMMDD-NNN`` IDs (up to
+    100 lots per production day) and spells it in one of the export
+    variants. ``typo_ratio`` of rows instead carry a near-duplicate typo (a
+    letter O for a zero in the date, or a mangled "LOT" prefix), and one in
+    ten of those is unrecoverable garbage. Columns: ``raw_lot_id`` and the true
+    ``normalized_lot_id``.
+
+    Time complexity: O(rows).
+    Space complexity: O(rows).
+    """
+    if rows < 0:
+        raise ValueError("rows must be non-negative")
+    if lots < 1 or not 0.0 <= typo_ratio <= 1.0:
+        raise ValueError("lots must be at least 1 and typo_ratio in [0, 1]")
+
+    rng = np.random.default_rng([seed, 3])
+    days = pd.date_range(start, periods=(lots + 99) // 100, freq="D").strftime("%Y%m%d").to_numpy(dtype=object)
+    lot_dates = days[np.arange(lots) // 100]
+    lot_sequences = np.array([f"{number:03d}" for number in np.arange(lots) % 100 + 1], dtype=object)
+
+    picked = rng.integers(0, lots, rows)
+    dates = lot_dates[picked]
+    sequences = lot_sequences[picked]
+    spellings = _LOT_ID_SPELLINGS[rng.integers(0, len(_LOT_ID_SPELLINGS), rows)]
+    raw = [spelling.format(day, sequence) for spelling, day, sequence in zip(spellings, dates, sequences)]
+
+    # Typos are applied to a canonical spelling so each stays one edit away.
+    for row in np.flatnonzero(rng.random(rows) < typo_ratio):
+        day, sequence = dates[row], sequences[row]
+        kind = rng.integers(0, 10)
+        if kind == 0:
+            raw[row] = f"PALLET-{day}"
+        elif kind % 2:
+            raw[row] = f"LOT-{day.replace('0', 'O', 1)}-{sequence}"
+        else:
+            raw[row] = f"{_PREFIX_TYPOS[kind // 2 - 1]}-{day}-{sequence}"
+    return pd.DataFrame(
+        {
+            "raw_lot_id": pd.Series(raw, dtype="string"),
+            "normalized_lot_id": pd.Series([f"LOT-{d}-{s}" for d, s in zip(dates, sequences)], dtype="string"),
+        }
+    )
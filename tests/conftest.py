@@ -0,0 +1,244 @@
+"""Shared pytest fixtures.
+
+SQLite stands in for Postgres so DB access helpers can be tested without a
+server. The ``operations`` schema is emulated by attaching an in-memory
+database under that name, including the ``data_version`` counters (with
+row-level triggers, where Postgres uses statement-level ones). Postgres-only paths (COPY, materialized views) use
+``pg_engine``, which is skipped unless ``STEELWORKS_TEST_DATABASE_URL`` is set.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+
+# Minimal SQLite translation of db/schema.sql tables used by db.py queries.
+_SQLITE_SCHEMA = [
+    """
+    CREATE TABLE operations.inspector (
+        id INTEGER PRIMARY KEY,
+        inspector_name TEXT NOT NULL UNIQUE,
+        shift_preference TEXT
+    )
+    """,
+    """
+    CREATE TABLE operations.defect_type (
+        id INTEGER PRIMARY KEY,
+        defect_id TEXT NOT NULL UNIQUE,
+        severity TEXT
+    )
+    """,
+    """
+    CREATE TABLE operations.lot (
+        id INTEGER PRIMARY KEY,
+        normalized_lot_id TEXT NOT NULL UNIQUE,
+        part_number TEXT NOT NULL,
+        production_date TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE operations.production_run (
+        id INTEGER PRIMARY KEY,
+        lot_id INTEGER NOT NULL UNIQUE,
+        raw_lot_id TEXT,
+        line_id TEXT,
+        shift TEXT,
+        units_planned INTEGER,
+        units_actual INTEGER,
+        downtime_minutes INTEGER DEFAULT 0,
+        primary_issue TEXT
+    )
+    """,
+    """
+    CREATE TABLE operations.inspection_event (
+        id INTEGER PRIMARY KEY,
+        lot_id INTEGER NOT NULL,
+        inspector_id INTEGER NOT NULL,
+        defect_type_id INTEGER,
+        inspection_timestamp TEXT NOT NULL,
+        qty_checked INTEGER NOT NULL DEFAULT 0,
+        qty_defects INTEGER NOT NULL DEFAULT 0,
+        disposition TEXT,
+        notes TEXT
+    )
+    """,
+    """
+    CREATE TABLE operations.shipment (
+        id INTEGER PRIMARY KEY,
+        lot_id INTEGER NOT NULL,
+        sales_order TEXT,
+        customer TEXT,
+        ship_date TEXT,
+        carrier TEXT,
+        bol_number TEXT,
+        qty_shipped INTEGER,
+        ship_status TEXT
+    )
+    """,
+    # SQLite stand-in for operations.mv_defect_summary. date(ts, '-6 days',
+    # 'weekday 2') is the Tuesday on or before ts, i.e. the W-MON bucket start.
+    """
+    CREATE VIEW operations.mv_defect_summary AS
+    SELECT
+        dt.defect_id,
+        dt.severity,
+        COUNT(DISTINCT ie.lot_id) AS impacted_lot_count,
+        COUNT(DISTINCT date(ie.inspection_timestamp, '-6 days', 'weekday 2')) AS weeks_with_defects,
+        MIN(ie.inspection_timestamp) AS first_detected,
+        MAX(ie.inspection_timestamp) AS last_detected,
+        SUM(ie.qty_defects) AS total_defects,
+        group_concat(DISTINCT date(ie.inspection_timestamp, '-6 days', 'weekday 2')) AS week_starts
+    FROM inspection_event ie
+    JOIN defect_type dt ON ie.defect_type_id = dt.id
+    WHERE ie.qty_defects > 0
+    GROUP BY dt.defect_id, dt.severity
+    """,
+    """
+    CREATE TABLE operations.data_version (
+        singleton INTEGER PRIMARY KEY CHECK (singleton = 1),
+        version INTEGER NOT NULL,
+        rewrite_version INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "INSERT INTO operations.data_version (singleton, version) VALUES (1, 0)",
+    # SQLite triggers are row-level only and may not qualify table names in
+    # their bodies; they resolve within the trigger's own (operations) schema.
+    *(
+        f"""
+        CREATE TRIGGER operations.trg_data_version_{table}_{event.lower()} AFTER {event} ON {table}
+        BEGIN
+            UPDATE data_version SET version = version + 1;
+        END
+        """
+        for table in ("inspection_event", "lot", "production_run", "shipment", "defect_type", "inspector")
+        for event in ("INSERT", "UPDATE", "DELETE")
+    ),
+    *(
+        f"""
+        CREATE TRIGGER operations.trg_rewrite_{table}_{event.lower()} AFTER {event} ON {table}
+        BEGIN
+            UPDATE data_version SET rewrite_version = rewrite_version + 1;
+        END
+        """
+        for table in ("inspection_event", "lot", "production_run", "defect_type", "inspector")
+        for event in ("UPDATE", "DELETE")
+    ),
+    """
+    CREATE TRIGGER operations.trg_rewrite_production_run_insert AFTER INSERT ON production_run
+    WHEN EXISTS (SELECT 1 FROM inspection_event WHERE lot_id = NEW.lot_id)
+    BEGIN
+        UPDATE data_version SET rewrite_version = rewrite_version + 1;
+    END
+    """,
+]
+
+
+def load_events(engine: Engine, events: pd.DataFrame) -> None:
+    """Insert schema-shaped analysis events into the SQLite stand-in.
+
+    Lots, inspectors and defect types are created from the distinct values in
+    ``events``; each defect_id takes the first severity seen for it. When
+    ``events`` carries ``part_number``, ``line_id`` or ``shift``, each lot
+    takes its first value and gets a production run.
+
+    Time complexity: O(n), where n is event count.
+    Space complexity: O(n).
+    """
+    severities = events.dropna(subset=["defect_id"]).drop_duplicates("defect_id").set_index("defect_id")["severity"]
+    with engine.begin() as connection:
+        for defect_id, severity in severities.items():
+            connection.execute(
+                text("INSERT INTO operations.defect_type (defect_id, severity) VALUES (:d, :s)"),
+                {"d": defect_id, "s": severity},
+            )
+        for name in events["inspector_name"].dropna().unique():
+            connection.execute(text("INSERT INTO operations.inspector (inspector_name) VALUES (:n)"), {"n": name})
+        lots = events.dropna(subset=["normalized_lot_id"]).drop_duplicates("normalized_lot_id")
+        for lot in lots.itertuples(index=False):
+            connection.execute(
+                text(
+                    "INSERT INTO operations.lot (normalized_lot_id, part_number, production_date) "
+                    "VALUES (:lot, :part, '2026-01-01')"
+                ),
+                {"lot": lot.normalized_lot_id, "part": getattr(lot, "part_number", None) or "SW-0000-A"},
+            )
+            if "line_id" in events.columns or "shift" in events.columns:
+                connection.execute(
+                    text(
+                        "INSERT INTO operations.production_run (lot_id, line_id, shift) "
+                        "VALUES ((SELECT id FROM operations.lot WHERE normalized_lot_id = :lot), :line, :shift)"
+                    ),
+                    {"lot": lot.normalized_lot_id, "line": getattr(lot, "line_id", None), "shift": getattr(lot, "shift", None)},
+                )
+        for row in events.itertuples(index=False):
+            connection.execute(
+                text(
+                    """
+                    INSERT INTO operations.inspection_event
+                        (lot_id, inspector_id, defect_type_id, inspection_timestamp, qty_checked, qty_defects, disposition, notes)
+                    VALUES (
+                        (SELECT id FROM operations.lot WHERE normalized_lot_id = :lot),
+                        (SELECT id FROM operations.inspector WHERE inspector_name = :inspector),
+                        (SELECT id FROM operations.defect_type WHERE defect_id = :defect),
+                        :ts, :checked, :defects, :disposition, :notes
+                    )
+                    """
+                ),
+                {
+                    "lot": row.normalized_lot_id,
+                    "inspector": row.inspector_name,
+                    "defect": row.defect_id,
+                    "ts": pd.Timestamp(row.inspection_timestamp).strftime("%Y-%m-%d %H:%M:%S"),
+                    "checked": int(row.qty_checked),
+                    "defects": int(row.qty_defects),
+                    "disposition": row.disposition,
+                    "notes": row.notes,
+                },
+            )
+
+
+@pytest.fixture
+def sqlite_engine() -> Iterator[Engine]:
+    """Yield a SQLite engine with an emulated ``operations`` schema.
+
+    StaticPool keeps a single connection so the attached in-memory schema
+    survives across ``engine.connect()`` calls.
+    """
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+
+    @event.listens_for(engine, "connect")
+    def _attach_operations(dbapi_connection, _record) -> None:
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS operations")
+
+    with engine.begin() as connection:
+        for statement in _SQLITE_SCHEMA:
+            connection.execute(text(statement))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def pg_engine() -> Iterator[Engine]:
+    """Yield an engine on a disposable Postgres database with db/schema.sql applied.
+
+    The ``operations`` schema is dropped and recreated, so point
+    ``STEELWORKS_TEST_DATABASE_URL`` at a scratch database only.
+    """
+    url = os.getenv("STEELWORKS_TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("STEELWORKS_TEST_DATABASE_URL is not set")
+    schema_sql = (Path(__file__).resolve().parents[1] / "db" / "schema.sql").read_text(encoding="utf-8")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA IF EXISTS operations CASCADE"))
+        connection.execute(text(schema_sql))
+    yield engine
+    engine.dispose()
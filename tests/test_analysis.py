@@ -5,9 +5,18 @@ Each test name references one or more AC IDs from the user story.
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
-from steelworks_defect.analysis import classify_defects, drill_down_defect, filter_recurring_only
+from steelworks_defect.analysis import (
+    _compute_missing_weeks,
+    classify_defects,
+    classify_defects_explained,
+    drill_down_defect,
+    filter_recurring_only,
+    paginate_frame,
+    recurring_mask,
+)
 
 
 def _build_events() -> pd.DataFrame:
@@ -137,6 +146,16 @@ def test_ac6_filter_recurring_defects() -> None:
     }
 
 
+def test_ac6_ac9_pages_preserve_sort_order_and_recurring_mask() -> None:
+    """AC6/AC9: pages slice the sorted summary in order; the mask matches the filter."""
+    summary = classify_defects(_build_random_events(3))
+    pages = [paginate_frame(summary, page, 2) for page in range(paginate_frame(summary, 0, 2).page_count)]
+    pd.testing.assert_frame_equal(pd.concat([page.rows for page in pages], ignore_index=True), summary)
+    assert paginate_frame(summary, 99, 2).page == pages[-1].page
+    assert paginate_frame(summary.iloc[0:0], 0, 2).page_count == 1
+    pd.testing.assert_frame_equal(summary[recurring_mask(summary)].reset_index(drop=True), filter_recurring_only(summary))
+
+
 def test_ac7_ac8_drill_down_with_missing_period_message() -> None:
     """AC7/AC8: drill-down returns detail rows and missing period explainability."""
     events = _build_events()
@@ -157,3 +176,141 @@ def test_ac9_default_sorting_prioritizes_recurring() -> None:
         "Recurring - Critical",
         "Recurring - High Frequency",
     }
+
+
+def _legacy_compute_missing_weeks(timestamps: pd.Series) -> list[str]:
+    """Reference copy of the original per-group missing-week loop.
+
+    Time complexity: O(w^2), where w is number of weeks in the covered range.
+    Space complexity: O(w).
+    """
+    valid_ts = timestamps.dropna()
+    if valid_ts.empty:
+        return []
+    observed_weeks = pd.to_datetime(valid_ts.dt.to_period("W-MON").dt.start_time).drop_duplicates().sort_values()
+    all_weeks = pd.date_range(start=observed_weeks.iloc[0], end=observed_weeks.iloc[-1], freq="W-MON")
+    missing = [week for week in all_weeks if week not in set(observed_weeks.tolist())]
+    labels = []
+    for week_start in missing:
+        iso = week_start.isocalendar()
+        labels.append(f"{iso.year}-W{iso.week:02d}")
+    return labels
+
+
+def _legacy_classify_defects(events: pd.DataFrame) -> pd.DataFrame:
+    """Reference copy of the original row-wise classify_defects implementation.
+
+    Time complexity: O(n + g * w^2 + g log g).
+    Space complexity: O(n).
+    """
+    frame = events.copy()
+    frame["inspection_timestamp"] = pd.to_datetime(frame["inspection_timestamp"], errors="coerce")
+    frame["qty_defects"] = pd.to_numeric(frame["qty_defects"], errors="coerce").fillna(0).astype(int)
+    for column in ("defect_id", "severity", "normalized_lot_id"):
+        frame[column] = frame[column].astype("string")
+    enriched = frame[(frame["qty_defects"] > 0) & (frame["defect_id"].notna())].copy()
+    enriched["week_start"] = pd.to_datetime(
+        enriched["inspection_timestamp"].dt.to_period("W-MON").dt.start_time,
+        errors="coerce",
+    )
+    grouped = (
+        enriched.groupby(["defect_id", "severity"], dropna=False)
+        .agg(
+            impacted_lot_count=("normalized_lot_id", "nunique"),
+            weeks_with_defects=("week_start", "nunique"),
+            first_detected=("inspection_timestamp", "min"),
+            last_detected=("inspection_timestamp", "max"),
+            total_defects=("qty_defects", "sum"),
+        )
+        .reset_index()
+    )
+    grouped["days_span"] = (grouped["last_detected"] - grouped["first_detected"]).dt.days
+    missing_map = {
+        (str(defect_id), str(severity)): _legacy_compute_missing_weeks(rows["inspection_timestamp"])
+        for (defect_id, severity), rows in enriched.groupby(["defect_id", "severity"], dropna=False)
+    }
+
+    def classify_row(row: pd.Series) -> str:
+        if pd.isna(row["first_detected"]) or pd.isna(row["last_detected"]):
+            return "Insufficient Data"
+        if row["impacted_lot_count"] >= 2 and row["weeks_with_defects"] >= 2:
+            if str(row["severity"]) == "Critical":
+                return "Recurring - Critical"
+            return "Recurring - High Frequency"
+        if row["impacted_lot_count"] == 1:
+            return "Isolated Incident"
+        return "Insufficient Data"
+
+    grouped["trend_classification"] = grouped.apply(classify_row, axis=1)
+    grouped["missing_periods"] = grouped.apply(
+        lambda row: missing_map.get((str(row["defect_id"]), str(row["severity"])), []),
+        axis=1,
+    )
+    sparse_mask = (grouped["impacted_lot_count"] >= 2) & (grouped["weeks_with_defects"] < 2)
+    grouped.loc[sparse_mask, "trend_classification"] = "Insufficient Data"
+    grouped["_priority"] = grouped["trend_classification"].map(
+        {"Recurring - Critical": 0, "Recurring - High Frequency": 1, "Isolated Incident": 2, "Insufficient Data": 3}
+    ).fillna(99)
+    grouped = grouped.sort_values(
+        by=["_priority", "impacted_lot_count", "last_detected", "total_defects"],
+        ascending=[True, False, False, False],
+        kind="mergesort",
+    ).drop(columns=["_priority"])
+    return grouped.reset_index(drop=True)
+
+
+def _build_random_events(seed: int, rows: int = 400) -> pd.DataFrame:
+    """Create randomized schema-shaped events, including nulls and zero rows.
+
+    Time complexity: O(n), where n is requested row count.
+    Space complexity: O(n).
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = pd.Timestamp("2024-12-01") + pd.to_timedelta(rng.integers(0, 400 * 24, rows), unit="h")
+    timestamps = pd.Series(timestamps).mask(rng.random(rows) < 0.03)
+    return pd.DataFrame(
+        {
+            "defect_id": pd.Series(rng.choice(["BURR", "CRACK", "POR", "WELD", "SCR", "DIM"], rows)).mask(rng.random(rows) < 0.05),
+            "severity": pd.Series(rng.choice(["Minor", "Major", "Critical"], rows)).mask(rng.random(rows) < 0.05),
+            "normalized_lot_id": pd.Series([f"LOT-{value:03d}" for value in rng.integers(0, 40, rows)]).mask(rng.random(rows) < 0.02),
+            "inspection_timestamp": timestamps,
+            "qty_defects": rng.integers(0, 4, rows),
+        }
+    )
+
+
+def test_ac1_ac9_vectorized_classification_matches_legacy_engine() -> None:
+    """AC1-AC9: columnar classify_defects is output-identical to the original loop."""
+    for seed in range(5):
+        events = _build_random_events(seed)
+        pd.testing.assert_frame_equal(classify_defects(events), _legacy_classify_defects(events))
+    pd.testing.assert_frame_equal(classify_defects(_build_events()), _legacy_classify_defects(_build_events()))
+
+
+def test_ac8_missing_weeks_match_legacy_engine() -> None:
+    """AC8: vectorized missing-week detection matches the original date_range loop."""
+    rng = np.random.default_rng(7)
+    for _ in range(25):
+        offsets = rng.integers(-400, 400, rng.integers(1, 12))
+        timestamps = pd.Series(pd.Timestamp("1970-02-01") + pd.to_timedelta(offsets, unit="D"))
+        assert _compute_missing_weeks(timestamps) == _legacy_compute_missing_weeks(timestamps)
+
+
+def test_ac7_ac8_drill_down_index_matches_drill_down_defect() -> None:
+    """AC7/AC8: the classification's drill-down index answers like drill_down_defect."""
+    for events in [_build_events(), *(_build_random_events(seed) for seed in range(3))]:
+        summary, index = classify_defects_explained(events)
+        pd.testing.assert_frame_equal(summary, classify_defects(events))
+        # Random events give some codes several severities, exercising the per-defect recount.
+        for defect_id in [*events["defect_id"].dropna().unique(), "MISSING"]:
+            expected = drill_down_defect(events, defect_id)
+            actual = index.drill_down(defect_id)
+            assert actual.message == expected.message
+            assert actual.missing_weeks == expected.missing_weeks
+            pd.testing.assert_frame_equal(actual.records, expected.records, check_dtype=not expected.records.empty)
+
+    weld = classify_defects_explained(_build_events())[1].explanations["WELD"]
+    assert (weld.distinct_lots, weld.distinct_weeks) == (2, 2)
+    empty_summary, empty_index = classify_defects_explained(_build_events().assign(qty_defects=0))
+    assert empty_summary.empty and empty_index.explanations == {}
+    assert empty_index.drill_down("WELD").records.empty
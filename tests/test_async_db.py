@@ -0,0 +1,105 @@
+"""Tests for the async data-access layer, single-flight and the load test."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from steelworks_defect.async_db import (
+    AsyncDataGateway,
+    SingleFlight,
+    fetch_defect_events_page_async,
+    fetch_defect_occurrences_async,
+    fetch_defect_week_rollup_async,
+    fetch_filter_options_async,
+    fetch_filtered_defect_events_async,
+    fetch_inspection_events_async,
+    probe_data_version_async,
+)
+from steelworks_defect.benchmark import _load_events
+from steelworks_defect.db import (
+    DefectFilters,
+    fetch_defect_events_page,
+    fetch_defect_occurrences,
+    fetch_defect_week_rollup,
+    fetch_filter_options,
+    fetch_filtered_defect_events,
+    fetch_inspection_events,
+    probe_data_version,
+)
+from steelworks_defect.loadtest import run_load_test
+from steelworks_defect.synthetic import generate_inspection_history
+
+
+def test_single_flight_coalesces_concurrent_calls_and_forgets_results() -> None:
+    """Concurrent callers share one run; errors propagate and are not cached."""
+    calls = []
+
+    async def slow(value: int) -> int:
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        if value < 0:
+            raise ValueError("boom")
+        return value
+
+    async def scenario() -> None:
+        flights = SingleFlight()
+        results = await asyncio.gather(*(flights.do("key", lambda: slow(7)) for _ in range(10)))
+        assert results == [7] * 10 and calls == [7]
+        assert (flights.started, flights.joined, len(flights)) == (1, 9, 0)
+
+        # Completed calls are forgotten, so the next call runs again.
+        assert await flights.do("key", lambda: slow(8)) == 8
+        outcomes = await asyncio.gather(*(flights.do("bad", lambda: slow(-1)) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+        assert calls == [7, 8, -1]
+
+    asyncio.run(scenario())
+
+
+def test_async_reads_match_sync_and_gateway_coalesces(pg_engine) -> None:
+    """Postgres: async fetchers return the sync frames; the load test coalesces queries."""
+    _load_events(pg_engine, generate_inspection_history(3_000, lots=80, defect_codes=5, weeks=12, seed=4))
+    url = pg_engine.url.render_as_string(hide_password=False)
+    filters = DefectFilters(shift="Night")
+    gateway = AsyncDataGateway(url, pool_size=2, max_overflow=0)
+    try:
+        engine = gateway.engine
+        pd.testing.assert_frame_equal(gateway.run(fetch_inspection_events_async(engine)), fetch_inspection_events(pg_engine))
+        pd.testing.assert_frame_equal(
+            gateway.run(fetch_filtered_defect_events_async(engine, filters)),
+            fetch_filtered_defect_events(pg_engine, filters),
+        )
+        pd.testing.assert_frame_equal(
+            gateway.run(fetch_defect_occurrences_async(engine, "D001")), fetch_defect_occurrences(pg_engine, "D001")
+        )
+        pd.testing.assert_frame_equal(
+            gateway.run(fetch_defect_week_rollup_async(engine)), fetch_defect_week_rollup(pg_engine)
+        )
+        page, cursor = fetch_defect_events_page(pg_engine, "D001", page_size=25)
+        async_page, async_cursor = gateway.run(fetch_defect_events_page_async(engine, "D001", page_size=25))
+        pd.testing.assert_frame_equal(async_page, page)
+        assert async_cursor == cursor
+        assert gateway.run(fetch_filter_options_async(engine)) == fetch_filter_options(pg_engine)
+        assert gateway.run(probe_data_version_async(engine)) == probe_data_version(pg_engine)
+
+        # Cached per data version: the second load does not call the loader.
+        loads = []
+
+        async def loader(async_engine):
+            loads.append(1)
+            return await fetch_defect_week_rollup_async(async_engine)
+
+        gateway.get_or_load("rollup", loader)
+        gateway.get_or_load("rollup", loader)
+        assert len(loads) == 1
+    finally:
+        gateway.close()
+
+    report = run_load_test(url, sessions=12, rounds=1)
+    modes = report["modes"]
+    assert modes["async"]["statements"] < modes["sync"]["statements"]
+    with pytest.raises(ValueError):
+        run_load_test(url, sessions=0)
@@ -0,0 +1,76 @@
+"""Tests for the synthetic generator and benchmark harness."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from conftest import load_events
+from steelworks_defect.analysis import classify_defects
+from steelworks_defect.benchmark import compare_results, main, run_benchmarks
+from steelworks_defect.db import fetch_inspection_events
+from steelworks_defect.ingest import LotIdNormalizer
+from steelworks_defect.synthetic import SYNTHETIC_COLUMNS, generate_inspection_history, generate_raw_lot_ids
+
+
+def test_generator_is_seeded_and_matches_fetch_schema(sqlite_engine) -> None:
+    """Same seed, same frame; columns and dtypes match fetch_inspection_events."""
+    events = generate_inspection_history(300, lots=40, defect_codes=6, weeks=12, seed=3)
+    pd.testing.assert_frame_equal(events, generate_inspection_history(300, lots=40, defect_codes=6, weeks=12, seed=3))
+    assert list(events.columns) == SYNTHETIC_COLUMNS
+    assert events["event_id"].tolist() == list(range(1, 301))
+    assert events["inspection_timestamp"].is_monotonic_increasing
+
+    load_events(sqlite_engine, events)
+    fetched = fetch_inspection_events(sqlite_engine)
+    assert list(fetched.columns) == list(events.columns)
+    pd.testing.assert_frame_equal(classify_defects(fetched), classify_defects(events))
+
+
+def test_generator_honors_zero_ratio_and_gaps() -> None:
+    """Zero-defect rows have null defect references; gaps yield missing periods."""
+    events = generate_inspection_history(20_000, lots=300, defect_codes=5, weeks=30, zero_defect_ratio=0.5, gap_ratio=0.3)
+    zero = events["qty_defects"].eq(0)
+    assert 0.5 < zero.mean() < 0.75
+    assert events.loc[zero, "defect_id"].isna().all()
+    assert (events["qty_defects"] <= events["qty_checked"]).all()
+    assert classify_defects(events)["missing_periods"].map(len).sum() > 0
+
+    with pytest.raises(ValueError):
+        generate_inspection_history(10, zero_defect_ratio=1.5)
+
+
+def test_raw_lot_id_generator_round_trips_through_normalizer() -> None:
+    """Generated spellings resolve to their true lot; only garbage IDs stay Indeterminate."""
+    raw = generate_raw_lot_ids(20_000, lots=500, typo_ratio=0.05, seed=1)
+    assert raw.equals(generate_raw_lot_ids(20_000, lots=500, typo_ratio=0.05, seed=1))
+    normalized = LotIdNormalizer().normalize(raw["raw_lot_id"])
+    resolved = normalized.notna()
+    assert (normalized[resolved] == raw.loc[resolved, "normalized_lot_id"]).all()
+    assert raw.loc[~resolved, "raw_lot_id"].str.startswith("PALLET").all()
+
+
+def test_benchmark_report_and_regression_compare(tmp_path: Path) -> None:
+    """The CLI writes a JSON report; compare flags only real slowdowns."""
+    output = tmp_path / "bench.json"
+    main(["--rows", "500", "--repeat", "1", "--output", str(output)])
+    report = json.loads(output.read_text(encoding="utf-8"))
+    stages = {item["stage"] for item in report["results"]}
+    assert {"classify_defects", "drill_down_defect", "filter_recurring_only"} <= stages
+    assert all(item["rows"] == 500 and item["peak_bytes"] is not None for item in report["results"])
+
+    slower = json.loads(json.dumps(report))
+    for item in slower["results"]:
+        item["seconds_min"] = item["seconds_min"] * 2 + 0.01
+    regressions = compare_results(report, slower)
+    assert len(regressions) == len(report["results"])
+    assert compare_results(report, report) == []
+
+
+def test_run_benchmarks_without_memory_profile() -> None:
+    """Memory profiling can be disabled for large runs."""
+    report = run_benchmarks([200], repeat=1, profile_memory=False)
+    assert all(item["peak_bytes"] is None for item in report["results"])
@@ -0,0 +1,97 @@
+"""Tests for the UI-independent dashboard cache."""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from conftest import load_events
+from steelworks_defect.cache import DashboardCache, TTLCache, get_shared_engine
+from steelworks_defect.db import DataVersion, probe_data_version
+from test_analysis import _build_events
+
+
+class _FakeClock:
+    """Manually advanced monotonic clock for TTL tests."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries() -> None:
+    """Entries older than the TTL are treated as misses."""
+    clock = _FakeClock()
+    cache = TTLCache(ttl_seconds=10, max_entries=4, clock=clock)
+    cache.set("a", 1)
+    clock.now = 5
+    assert cache.get("a") == (True, 1)
+    clock.now = 11
+    assert cache.get("a") == (False, None)
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    """Size bound evicts the least recently used entry first."""
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+
+
+def test_ttl_cache_rejects_zero_capacity() -> None:
+    """A cache must hold at least one entry."""
+    with pytest.raises(ValueError):
+        TTLCache(ttl_seconds=1, max_entries=0)
+
+
+def test_dashboard_cache_reloads_only_on_new_version() -> None:
+    """Loader runs once per data version; explicit clear forces a reload."""
+    versions = [DataVersion(1, 1, None)]
+    calls: list[int] = []
+    cache = DashboardCache(probe=lambda _engine: versions[-1])
+
+    def loader(_engine: object) -> int:
+        calls.append(versions[-1].max_event_id)
+        return len(calls)
+
+    assert cache.get_or_load("summary", None, loader) == 1
+    assert cache.get_or_load("summary", None, loader) == 1
+    versions.append(DataVersion(2, 2, None))
+    assert cache.get_or_load("summary", None, loader) == 2
+    cache.clear()
+    assert cache.get_or_load("summary", None, loader) == 3
+    assert calls == [1, 2, 2]
+
+
+def test_shared_engine_is_process_singleton() -> None:
+    """The same URL always yields the same engine object."""
+    assert get_shared_engine("sqlite://") is get_shared_engine("sqlite://")
+
+
+def test_probe_data_version_tracks_loads(sqlite_engine) -> None:
+    """The probe reports max id, row count, latest timestamp and the change counter."""
+    assert probe_data_version(sqlite_engine) == DataVersion(0, 0, None, counter=0)
+    load_events(sqlite_engine, _build_events())
+    loaded = probe_data_version(sqlite_engine)
+    assert loaded.counter > 0
+    assert loaded == DataVersion(6, 6, pd.Timestamp("2026-01-15 09:00:00"), counter=loaded.counter)
+
+    # An in-place update keeps id, count and timestamp; only the counter moves.
+    with sqlite_engine.begin() as connection:
+        connection.execute(text("UPDATE operations.inspection_event SET qty_defects = 0 WHERE id = 1"))
+    updated = probe_data_version(sqlite_engine)
+    assert updated.counter > loaded.counter
+    assert (updated.max_event_id, updated.row_count, updated.max_timestamp) == (6, 6, loaded.max_timestamp)
+
+    # Schemas created before the counter still probe, without it.
+    with sqlite_engine.begin() as connection:
+        connection.execute(text("DROP TABLE operations.data_version"))
+    assert probe_data_version(sqlite_engine).counter is None
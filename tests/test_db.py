@@ -0,0 +1,179 @@
+"""Tests for database access helpers against the SQLite stand-in."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from conftest import load_events
+from steelworks_defect.analysis import classify_defect_summary, classify_defects, classify_defects_explained, drill_down_defect
+from steelworks_defect.db import (
+    DefectFilters,
+    fetch_defect_events,
+    fetch_defect_events_page,
+    fetch_defect_occurrences,
+    fetch_filter_options,
+    fetch_filtered_defect_events,
+    fetch_defect_summary,
+    fetch_inspection_events,
+    iter_analysis_event_chunks,
+)
+from steelworks_defect.incremental import DefectAggregateState
+from test_analysis import _build_events, _build_random_events
+
+
+def _build_db_events(seed: int) -> pd.DataFrame:
+    """Create random events that satisfy the relational schema constraints.
+
+    Severity is fixed per defect_id and rows with null lots or timestamps are
+    dropped because the tables declare them NOT NULL.
+
+    Time complexity: O(n).
+    Space complexity: O(n).
+    """
+    events = _build_random_events(seed).dropna(subset=["normalized_lot_id", "inspection_timestamp"])
+    severity_by_defect = {"BURR": "Major", "CRACK": "Major", "POR": "Minor", "WELD": "Critical", "SCR": "Minor", "DIM": "Critical"}
+    rng = np.random.default_rng(seed)
+    return events.assign(
+        severity=events["defect_id"].map(severity_by_defect),
+        qty_checked=50,
+        disposition="Rework",
+        notes=None,
+        inspector_name=rng.choice(["A. Nguyen", "M. Patel"], len(events)),
+    ).reset_index(drop=True)
+
+
+def test_fetch_inspection_events_respects_after_id(sqlite_engine) -> None:
+    """Incremental fetches only return rows above the watermark."""
+    load_events(sqlite_engine, _build_events())
+    full = fetch_inspection_events(sqlite_engine)
+    assert full["event_id"].tolist() == list(range(1, len(full) + 1))
+    newer = fetch_inspection_events(sqlite_engine, after_id=4)
+    assert newer["event_id"].tolist() == [5, 6]
+
+
+def test_ac1_ac9_sql_summary_matches_pandas_engine(sqlite_engine) -> None:
+    """AC1-AC9: classifying SQL aggregates matches classifying raw events."""
+    load_events(sqlite_engine, _build_db_events(3))
+    from_sql = classify_defect_summary(fetch_defect_summary(sqlite_engine))
+    from_events = classify_defects(fetch_inspection_events(sqlite_engine))
+    pd.testing.assert_frame_equal(from_sql, from_events)
+
+
+def test_ac5_sql_summary_empty_table_keeps_columns(sqlite_engine) -> None:
+    """AC5: an empty materialized summary still yields list-view columns."""
+    summary = classify_defect_summary(fetch_defect_summary(sqlite_engine))
+    assert list(summary.columns) == list(classify_defects(_build_events()).columns)
+
+
+def test_ac7_ac8_defect_query_drill_down_matches_full_history(sqlite_engine) -> None:
+    """AC7/AC8: drill-down over the per-defect query equals the full-history path."""
+    load_events(sqlite_engine, _build_db_events(5))
+    full_history = fetch_inspection_events(sqlite_engine)
+    for defect_id in ("WELD", "BURR", "MISSING"):
+        rows = fetch_defect_events(sqlite_engine, defect_id)
+        assert (rows["qty_defects"] > 0).all()
+        from_query = drill_down_defect(rows, defect_id)
+        from_history = drill_down_defect(full_history, defect_id)
+        # Empty query results carry object dtypes, so only compare shape there.
+        pd.testing.assert_frame_equal(from_query.records, from_history.records, check_dtype=not from_query.records.empty)
+        assert from_query.message == from_history.message
+        assert from_query.missing_weeks == from_history.missing_weeks
+
+
+def test_ac1_ac9_streamed_chunks_fold_to_full_classification(sqlite_engine) -> None:
+    """Bounded chunks of defect rows reproduce classify_defects over all rows."""
+    events = _build_db_events(seed=5)
+    load_events(sqlite_engine, events)
+
+    chunks = list(iter_analysis_event_chunks(sqlite_engine, chunksize=40))
+    assert max(len(chunk) for chunk in chunks) <= 40
+    assert "notes" not in chunks[0].columns
+    assert (pd.concat(chunks)["qty_defects"] > 0).all()
+
+    state = DefectAggregateState()
+    state.apply_chunks(iter_analysis_event_chunks(sqlite_engine, chunksize=40))
+    pd.testing.assert_frame_equal(state.summary(), classify_defects(fetch_inspection_events(sqlite_engine)))
+
+    # Nothing new above the watermark: the stream is empty.
+    assert state.apply_chunks(iter_analysis_event_chunks(sqlite_engine, after_id=state.watermark)) == 0
+
+
+def test_filtered_classification_matches_pandas_slice(sqlite_engine) -> None:
+    """Pushed-down filters classify the same rows as slicing the full frame."""
+    events = _build_db_events(seed=6)
+    lots = events["normalized_lot_id"].unique()
+    rng = np.random.default_rng(6)
+    events = events.assign(
+        line_id=events["normalized_lot_id"].map(dict(zip(lots, rng.choice(["Line 1", "Line 2"], len(lots))))),
+        part_number=events["normalized_lot_id"].map(dict(zip(lots, rng.choice(["SW-9925-C", "SW-1001-A"], len(lots))))),
+        shift="Day",
+    )
+    load_events(sqlite_engine, events)
+    full = fetch_inspection_events(sqlite_engine)
+
+    filters = DefectFilters(start=date(2025, 3, 1), end=date(2025, 9, 30), line_id="Line 2", inspector_name="M. Patel")
+    timestamps = full["inspection_timestamp"]
+    expected_rows = full[
+        (timestamps >= "2025-03-01")
+        & (timestamps < "2025-10-01")
+        & (full["line_id"] == "Line 2")
+        & (full["inspector_name"] == "M. Patel")
+    ]
+    filtered = fetch_filtered_defect_events(sqlite_engine, filters)
+    assert (filtered["qty_defects"] > 0).all()
+    pd.testing.assert_frame_equal(classify_defects(filtered), classify_defects(expected_rows))
+
+    part_only = fetch_filtered_defect_events(sqlite_engine, DefectFilters(part_number="SW-9925-C"), defect_id="WELD")
+    assert set(part_only["part_number"]) <= {"SW-9925-C"}
+    assert set(part_only["defect_id"]) <= {"WELD"}
+
+    options = fetch_filter_options(sqlite_engine)
+    assert options["line_id"] == ["Line 1", "Line 2"]
+    assert options["shift"] == ["Day"]
+
+
+def test_keyset_pages_cover_drill_down_order_exactly(sqlite_engine) -> None:
+    """Concatenated keyset pages equal the full drill-down query, ties included."""
+    events = _build_db_events(seed=8)
+    # Day-rounded timestamps create many (timestamp, lot) ties for the event_id tiebreaker.
+    events = events.assign(inspection_timestamp=pd.to_datetime(events["inspection_timestamp"]).dt.floor("D"))
+    events = events.assign(inspector_name=[f"Inspector {index}" for index in range(len(events))])
+    load_events(sqlite_engine, events)
+
+    for defect_id, filters in [("BURR", None), ("WELD", DefectFilters(start=date(2025, 1, 1)))]:
+        expected = (
+            fetch_defect_events(sqlite_engine, defect_id)
+            if filters is None
+            else fetch_filtered_defect_events(sqlite_engine, filters, defect_id=defect_id)
+        )
+        pages, cursor = [], None
+        while True:
+            page, cursor = fetch_defect_events_page(sqlite_engine, defect_id, page_size=7, after=cursor, filters=filters)
+            assert len(page) <= 7
+            pages.append(page)
+            if cursor is None:
+                break
+        assert len(pages) == max(-(-len(expected) // 7), 1)
+        pd.testing.assert_frame_equal(pd.concat(pages, ignore_index=True), expected)
+
+        occurrences = fetch_defect_occurrences(sqlite_engine, defect_id, filters)
+        assert occurrences["event_id"].tolist() == expected["event_id"].tolist()
+        assert drill_down_defect(occurrences, defect_id).message == drill_down_defect(expected, defect_id).message
+        if filters is not None:
+            # The app drills into filtered views through the classification's index.
+            index = classify_defects_explained(fetch_filtered_defect_events(sqlite_engine, filters))[1]
+            indexed = index.drill_down(defect_id)
+            assert indexed.records["event_id"].tolist() == expected["event_id"].tolist()
+            assert indexed.message == drill_down_defect(occurrences, defect_id).message
+
+
+def test_defect_filters_only_emit_set_predicates() -> None:
+    """Unset filters add no predicates; the end date is inclusive."""
+    assert DefectFilters().is_empty()
+    assert DefectFilters().to_sql() == ([], {})
+    predicates, params = DefectFilters(end=date(2026, 1, 31), shift="Night").to_sql()
+    assert predicates == ["ie.inspection_timestamp < :window_end", "pr.shift = :shift"]
+    assert params["window_end"].isoformat() == "2026-02-01T00:00:00"
@@ -0,0 +1,49 @@
+"""Tests for the compact ``EventStore`` representation."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from conftest import load_events
+from steelworks_defect.analysis import classify_defects, classify_defects_explained, drill_down_defect
+from steelworks_defect.db import fetch_inspection_events
+from steelworks_defect.event_store import EventStore
+from test_analysis import _build_events, _build_random_events
+from test_db import _build_db_events
+
+
+def test_ac1_ac9_store_classification_matches_dataframe_engine() -> None:
+    """AC1-AC9: classifying a store is output-identical to classifying the frame."""
+    for seed in range(5):
+        events = _build_random_events(seed)
+        pd.testing.assert_frame_equal(classify_defects(EventStore.from_frame(events)), classify_defects(events))
+    pd.testing.assert_frame_equal(classify_defects(EventStore.from_frame(_build_events())), classify_defects(_build_events()))
+
+
+def test_ac7_ac8_store_drill_down_matches_dataframe_engine() -> None:
+    """AC7/AC8: drill-down on a store returns the same records and message."""
+    events = _build_events()
+    store = EventStore.from_frame(events)
+    for defect_id in ["WELD", "BURR", "MISSING"]:
+        expected = drill_down_defect(events, defect_id)
+        actual = drill_down_defect(store, defect_id)
+        assert actual.message == expected.message
+        assert actual.missing_weeks == expected.missing_weeks
+        pd.testing.assert_frame_equal(actual.records, expected.records, check_dtype=not expected.records.empty)
+        indexed = classify_defects_explained(store)[1].drill_down(defect_id)
+        assert indexed.message == expected.message
+        pd.testing.assert_frame_equal(indexed.records, expected.records, check_dtype=not expected.records.empty)
+
+
+def test_store_round_trips_fetched_frame_and_is_smaller(sqlite_engine) -> None:
+    """A fetched frame survives the round trip and the store uses less memory."""
+    events = pd.concat([_build_db_events(seed) for seed in range(3)], ignore_index=True)
+    load_events(sqlite_engine, events)
+    fetched = fetch_inspection_events(sqlite_engine)
+
+    store = EventStore.from_frame(fetched)
+    pd.testing.assert_frame_equal(store.to_frame(), fetched)
+    assert store.frame["qty_defects"].dtype == np.int32
+    assert isinstance(store.frame["normalized_lot_id"].dtype, pd.CategoricalDtype)
+    assert store.memory_usage() < fetched.memory_usage(deep=True).sum()
@@ -0,0 +1,70 @@
+"""Tests for the EXPLAIN scan-regression harness and monthly partitioning."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import text
+
+from steelworks_defect.analysis import classify_defects
+from steelworks_defect.benchmark import _load_events, _reset_scratch_database
+from steelworks_defect.db import fetch_inspection_events
+from steelworks_defect.explain import format_plans, run_explain_checks, sequential_scans, vacuum_analyze
+from steelworks_defect.synthetic import generate_inspection_history, generate_shipment_history
+
+
+def _scan(relation: str, kept: int, removed: int, loops: int = 1) -> dict[str, object]:
+    """Build a minimal EXPLAIN JSON Seq Scan node."""
+    return {
+        "Node Type": "Seq Scan",
+        "Relation Name": relation,
+        "Actual Rows": kept,
+        "Rows Removed by Filter": removed,
+        "Actual Loops": loops,
+    }
+
+
+def test_sequential_scans_flags_large_filtering_scans_of_guarded_tables() -> None:
+    """Only big, mostly-discarding scans of fact tables (or their partitions) fail."""
+    plan = {
+        "Node Type": "Hash Join",
+        "Plans": [
+            _scan("inspection_event_2026_01", kept=500, removed=40_000),
+            _scan("inspection_event_default", kept=0, removed=0),
+            _scan("inspection_event_2025_12", kept=30_000, removed=5_000),
+            {"Node Type": "Hash", "Plans": [_scan("lot", kept=100, removed=90_000)]},
+            {"Node Type": "Index Scan", "Relation Name": "shipment", "Actual Rows": 10},
+        ],
+    }
+    assert sequential_scans(plan) == ["inspection_event_2026_01"]
+    # Parallel workers report per-loop rows.
+    assert sequential_scans(_scan("shipment", kept=100, removed=3_000, loops=3), min_rows=5_000) == ["shipment"]
+    assert sequential_scans(plan, min_rows=100_000) == []
+
+
+def test_app_queries_use_indexes_plain_and_partitioned(pg_engine) -> None:
+    """Postgres: no workload query seq-scans a fact table, partitioned or not."""
+    events = generate_inspection_history(120_000, lots=3_000, defect_codes=25, weeks=30, seed=11)
+    shipments = generate_shipment_history(events, seed=11)
+    project_root = Path(__file__).resolve().parents[1]
+    expected = classify_defects(events)
+
+    for partitioned in (False, True):
+        _reset_scratch_database(pg_engine, project_root, partitioned=partitioned)
+        _load_events(pg_engine, events, shipments)
+        vacuum_analyze(pg_engine)
+
+        plans = run_explain_checks(pg_engine)
+        assert [plan.name for plan in plans if plan.seq_scans] == [], format_plans(plans)
+        pd.testing.assert_frame_equal(classify_defects(fetch_inspection_events(pg_engine)), expected)
+
+    with pg_engine.connect() as connection:
+        partitions = connection.execute(
+            text("SELECT COUNT(*) FROM pg_inherits WHERE inhparent = 'operations.inspection_event'::regclass")
+        ).scalar()
+        in_default = connection.execute(text("SELECT COUNT(*) FROM operations.inspection_event_default")).scalar()
+    # Every month got a partition and nothing was left in the default one.
+    assert partitions > 6 and in_default == 0
+    window = next(plan for plan in plans if plan.name == "fetch_filtered_defect_events[recent line]")
+    assert sum(relation.startswith("inspection_event_") for relation in window.relations) <= 3
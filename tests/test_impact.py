@@ -0,0 +1,115 @@
+"""Tests for the lot-impact join and shipment exposure summary."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import event, text
+
+from conftest import load_events
+from steelworks_defect.async_db import AsyncDataGateway, fetch_lot_impact_async
+from steelworks_defect.benchmark import _load_events
+from steelworks_defect.db import LOT_IMPACT_COLUMNS, DefectFilters, fetch_lot_impact
+from steelworks_defect.impact import EXPOSURE_COLUMNS, summarize_exposure
+from steelworks_defect.synthetic import generate_inspection_history, generate_shipment_history
+
+
+def _insert_shipments(engine, shipments: pd.DataFrame) -> None:
+    """Insert synthetic shipments into the SQLite stand-in.
+
+    Time complexity: O(s).
+    Space complexity: O(1).
+    """
+    with engine.begin() as connection:
+        for row in shipments.itertuples(index=False):
+            connection.execute(
+                text(
+                    """
+                    INSERT INTO operations.shipment (lot_id, sales_order, customer, ship_date, qty_shipped, ship_status)
+                    VALUES ((SELECT id FROM operations.lot WHERE normalized_lot_id = :lot), :so, :customer, :ship_date, :qty, :status)
+                    """
+                ),
+                {
+                    "lot": row.normalized_lot_id,
+                    "so": row.sales_order,
+                    "customer": row.customer,
+                    "ship_date": row.ship_date.strftime("%Y-%m-%d"),
+                    "qty": int(row.qty_shipped),
+                    "status": row.ship_status,
+                },
+            )
+
+
+def test_lot_impact_joins_runs_and_shipments_in_one_statement(sqlite_engine) -> None:
+    """Every affected (defect, lot, shipment) row comes back from a single query."""
+    events = generate_inspection_history(400, lots=30, defect_codes=5, weeks=8, seed=3)
+    shipments = generate_shipment_history(events, seed=3)
+    load_events(sqlite_engine, events)
+    _insert_shipments(sqlite_engine, shipments)
+
+    statements = []
+    event.listen(sqlite_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    codes = ["D000", "D002"]
+    impact = fetch_lot_impact(sqlite_engine, codes)
+    assert len(statements) == 1
+    assert list(impact.columns) == LOT_IMPACT_COLUMNS
+
+    occurrences = events[(events["qty_defects"] > 0) & events["defect_id"].isin(codes)]
+    affected = occurrences.groupby(["defect_id", "normalized_lot_id"], as_index=False).agg(
+        defect_events=("event_id", "size"), qty_defects=("qty_defects", "sum")
+    )
+    expected = affected.merge(shipments, on="normalized_lot_id", how="left")
+    key = ["defect_id", "normalized_lot_id", "sales_order"]
+
+    def comparable(frame: pd.DataFrame) -> pd.DataFrame:
+        # Unshipped lots carry null shipment columns (None from SQL, NaN from merge).
+        columns = frame[[*key, "defect_events", "qty_defects", "customer"]].fillna({"sales_order": "", "customer": ""})
+        return columns.sort_values(key).reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(comparable(impact), comparable(expected), check_dtype=False)
+    # Production-run dimensions ride along on every row.
+    lines = events.drop_duplicates("normalized_lot_id").set_index("normalized_lot_id")["line_id"]
+    assert (impact["line_id"] == impact["normalized_lot_id"].map(lines)).all()
+
+    window = DefectFilters(end=date(2024, 1, 20), shift="Night")
+    filtered = fetch_lot_impact(sqlite_engine, codes, window)
+    assert set(filtered["shift"]) <= {"Night"}
+    assert set(filtered["normalized_lot_id"]) <= set(impact["normalized_lot_id"])
+    assert fetch_lot_impact(sqlite_engine, []).empty
+
+
+def test_exposure_summary_counts_shipped_and_containable_lots() -> None:
+    """Lots count as shipped if any shipment left the plant; others are containable."""
+    impact = pd.DataFrame(
+        {
+            "defect_id": ["A", "A", "A", "A", "B"],
+            "severity": ["Critical"] * 4 + ["Minor"],
+            "normalized_lot_id": ["L1", "L1", "L2", "L3", "L4"],
+            "customer": ["Zeta", "Acme", "Acme", None, "Acme"],
+            "ship_status": ["Shipped", "On Hold", "Partial", None, "Backordered"],
+            "qty_shipped": pd.array([100, 40, 25, None, 60], dtype="Int64"),
+        }
+    )
+    exposure = summarize_exposure(impact)
+    assert list(exposure.columns) == EXPOSURE_COLUMNS
+    first, second = exposure.to_dict("records")
+    assert (first["affected_lots"], first["shipped_lots"], first["unshipped_lots"]) == (3, 2, 1)
+    assert (first["customer_count"], first["qty_shipped"], first["customers"]) == (2, 125, "Acme, Zeta")
+    assert (second["shipped_lots"], second["unshipped_lots"], second["qty_shipped"], second["customers"]) == (0, 1, 0, "")
+    assert summarize_exposure(impact.iloc[:0]).empty
+
+
+def test_lot_impact_postgres_sync_and_async_agree(pg_engine) -> None:
+    """Postgres: the indexed join returns the same frame through both drivers."""
+    events = generate_inspection_history(3_000, lots=150, defect_codes=6, weeks=12, seed=5)
+    _load_events(pg_engine, events, generate_shipment_history(events, seed=5))
+    codes = ["D000", "D001", "D003"]
+    impact = fetch_lot_impact(pg_engine, codes)
+    assert impact["ship_status"].notna().any() and impact["line_id"].notna().all()
+
+    gateway = AsyncDataGateway(pg_engine.url.render_as_string(hide_password=False), pool_size=1, max_overflow=0)
+    try:
+        pd.testing.assert_frame_equal(gateway.run(fetch_lot_impact_async(gateway.engine, codes)), impact)
+    finally:
+        gateway.close()
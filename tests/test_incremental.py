@@ -0,0 +1,156 @@
+"""Tests for the incremental classification engine.
+
+The incremental state must reproduce ``classify_defects`` exactly regardless of
+how the history is split into load batches.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from conftest import load_events
+from steelworks_defect.analysis import classify_defects
+from steelworks_defect.benchmark import _load_events
+from steelworks_defect.cache import DashboardCache
+from steelworks_defect.db import fetch_inspection_events
+from steelworks_defect.incremental import DefectAggregateState
+from steelworks_defect.synthetic import generate_inspection_history
+from test_analysis import _build_events, _build_random_events
+
+
+def _with_event_ids(events: pd.DataFrame) -> pd.DataFrame:
+    """Attach sequential event IDs like ``inspection_event.id``.
+
+    Time complexity: O(n).
+    Space complexity: O(n).
+    """
+    return events.assign(event_id=np.arange(1, len(events) + 1))
+
+
+def test_ac1_ac9_incremental_summary_matches_full_classification() -> None:
+    """AC1-AC9: batched incremental folds equal one full classify_defects pass."""
+    for seed in range(4):
+        events = _with_event_ids(_build_random_events(seed))
+        state = DefectAggregateState()
+        for batch in np.array_split(np.arange(len(events)), 7):
+            state.apply(events.iloc[batch])
+        pd.testing.assert_frame_equal(state.summary(), classify_defects(events))
+
+
+def test_incremental_handles_older_weeks_arriving_later() -> None:
+    """Late-arriving history that predates the first batch rebases week bitmaps."""
+    # The later WELD row is loaded first; older rows get higher IDs on a later load.
+    events = _with_event_ids(_build_events().iloc[[1, 0, 2, 3, 4, 5]])
+    state = DefectAggregateState()
+    state.apply(events.iloc[:1])
+    state.apply(events.iloc[1:])
+    pd.testing.assert_frame_equal(state.summary(), classify_defects(events))
+
+
+def test_incremental_ignores_rows_at_or_below_watermark() -> None:
+    """Replayed batches are skipped and the watermark tracks the highest ID."""
+    events = _with_event_ids(_build_events())
+    state = DefectAggregateState()
+    assert state.apply(events) == len(events)
+    assert state.watermark == len(events)
+    assert state.apply(events) == 0
+    pd.testing.assert_frame_equal(state.summary(), classify_defects(events))
+
+
+def test_incremental_requires_event_id() -> None:
+    """Rows without event IDs cannot be watermarked and are rejected."""
+    with pytest.raises(ValueError, match="event_id"):
+        DefectAggregateState().apply(_build_events())
+
+
+def test_incremental_empty_state_returns_stable_columns() -> None:
+    """AC5: an empty state still yields the list-view schema."""
+    assert list(DefectAggregateState().summary().columns) == list(classify_defects(_build_events()).columns)
+
+
+def _dashboard_summary(cache: DashboardCache, state: DefectAggregateState, engine: Engine) -> pd.DataFrame:
+    """Load the summary the way the dashboard's incremental source does.
+
+    Time complexity: O(1) on a cache hit; ``DefectAggregateState.sync`` cost on a miss.
+    Space complexity: O(g).
+    """
+
+    def load(connection_engine: Engine) -> pd.DataFrame:
+        state.sync(connection_engine)
+        return state.summary()
+
+    return cache.get_or_load("summary", engine, load)
+
+
+def test_in_place_update_invalidates_cache_and_rebuilds_state(sqlite_engine) -> None:
+    """A row rewritten under its old id changes the cache key and rebuilds the state."""
+    load_events(sqlite_engine, _build_events())
+    cache, state = DashboardCache(), DefectAggregateState()
+    summary = _dashboard_summary(cache, state, sqlite_engine)
+    weld = summary.set_index("defect_id").loc["WELD"]
+    assert (weld["trend_classification"], weld["impacted_lot_count"]) == ("Recurring - Critical", 2)
+
+    # What the loader's ON CONFLICT DO UPDATE does to a re-sent row.
+    with sqlite_engine.begin() as connection:
+        connection.execute(
+            text(
+                "UPDATE operations.inspection_event SET qty_defects = 0 WHERE id = "
+                "(SELECT MIN(ie.id) FROM operations.inspection_event ie "
+                "JOIN operations.defect_type dt ON dt.id = ie.defect_type_id WHERE dt.defect_id = 'WELD')"
+            )
+        )
+    summary = _dashboard_summary(cache, state, sqlite_engine)
+    pd.testing.assert_frame_equal(summary, classify_defects(fetch_inspection_events(sqlite_engine)))
+    weld = summary.set_index("defect_id").loc["WELD"]
+    assert (weld["trend_classification"], weld["impacted_lot_count"]) == ("Isolated Incident", 1)
+
+
+def test_sync_appends_without_rebuilding_until_rows_change(sqlite_engine) -> None:
+    """Appends stream only new rows; deletes rebuild; no counter means always rebuild."""
+    load_events(sqlite_engine, _build_events())
+    state = DefectAggregateState()
+    assert state.sync(sqlite_engine) == 5
+    with sqlite_engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO operations.inspection_event "
+                "(lot_id, inspector_id, defect_type_id, inspection_timestamp, qty_checked, qty_defects) "
+                "SELECT lot_id, inspector_id, defect_type_id, '2026-03-01 08:00:00', qty_checked, qty_defects "
+                "FROM operations.inspection_event WHERE id <= 2"
+            )
+        )
+    assert state.sync(sqlite_engine) == 2
+
+    with sqlite_engine.begin() as connection:
+        connection.execute(text("DELETE FROM operations.inspection_event WHERE id = 7"))
+    assert state.sync(sqlite_engine) == 6
+    pd.testing.assert_frame_equal(state.summary(), classify_defects(fetch_inspection_events(sqlite_engine)))
+
+    with sqlite_engine.begin() as connection:
+        connection.execute(text("DROP TABLE operations.data_version"))
+    assert state.sync(sqlite_engine) == 6
+    assert state.sync(sqlite_engine) == 6
+
+
+def test_redelivered_export_updates_dashboard_summary(pg_engine) -> None:
+    """Postgres: a re-sent export with corrected counts reaches the cached summary."""
+    events = generate_inspection_history(3_000, lots=120, defect_codes=6, weeks=16, seed=4)
+    _load_events(pg_engine, events)
+    cache, state = DashboardCache(), DefectAggregateState()
+    pd.testing.assert_frame_equal(_dashboard_summary(cache, state, pg_engine), classify_defects(events))
+
+    # Re-sending identical rows changes nothing the state depends on: no rebuild.
+    _load_events(pg_engine, events)
+    rewrite_version = state.rewrite_version
+    _dashboard_summary(cache, state, pg_engine)
+    assert state.rewrite_version == rewrite_version
+
+    corrected = events.assign(qty_defects=events["qty_defects"].clip(upper=1).where(events.index % 4 != 0, 0))
+    _load_events(pg_engine, corrected)
+    expected = classify_defects(corrected)
+    assert not expected.equals(classify_defects(events))
+    pd.testing.assert_frame_equal(_dashboard_summary(cache, state, pg_engine), expected)
@@ -0,0 +1,144 @@
+"""Tests for Excel export ingestion and lot ID normalization."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from steelworks_defect.analysis import classify_defects
+from steelworks_defect.ingest import (
+    INSPECTION_EVENT_COLUMNS,
+    LotIdNormalizer,
+    ingest_directory,
+    normalize_lot_id,
+    normalize_lot_ids,
+)
+
+
+SAMPLE_DIR = Path(__file__).resolve().parents[1] / "data" / "sample"
+
+
+_LOT_ID_VARIANTS = [
+    "LOT-20260112-001",
+    " L0T-20260112-001",
+    "Lot-20260112-001",
+    "LOT 20260112 001 ",
+    "LOT 20260112-001",
+    "LOT_20260112-001 ",
+    "LOT20260112001",
+    "lot-20260112-001",
+]
+
+
+@pytest.mark.parametrize("raw", _LOT_ID_VARIANTS)
+def test_normalize_lot_id_variants(raw: str) -> None:
+    """Known typo and separator variants collapse to the canonical form."""
+    assert normalize_lot_id(raw) == "LOT-20260112-001"
+
+
+@pytest.mark.parametrize("raw", [None, "", "BATCH-20260112-001", "LOT-2026011-001"])
+def test_normalize_lot_id_rejects_unrecognized(raw: str | None) -> None:
+    """Unrecognized values are left for fail-soft handling (ADR 004)."""
+    assert normalize_lot_id(raw) is None
+
+
+def test_vectorized_normalization_matches_scalar() -> None:
+    """The pyarrow path accepts and rejects exactly what ``normalize_lot_id`` does."""
+    unrecognized = [None, "", "BATCH-20260112-001", "LOT-2026011-001", "LOT-20260112-001x"]
+    raw = pd.Series([*_LOT_ID_VARIANTS, *unrecognized, "\u00a0LOT\u00a020260112-001", "LOT--20260112__001"])
+    expected = [normalize_lot_id(value) for value in raw]
+    assert normalize_lot_ids(raw).tolist() == [pd.NA if value is None else value for value in expected]
+
+
+def test_normalizer_resolves_near_duplicates_within_date_block() -> None:
+    """Typos one edit from a single known lot resolve; ambiguous or unknown ones are Indeterminate."""
+    normalizer = LotIdNormalizer()
+    raw = pd.Series(
+        [
+            "LOT-20260101-001",
+            "LOT-20260101-010",
+            "LOT-2O260101-001",  # letter O in the date
+            "LOT-20260101-0001",  # extra digit
+            "LT-20260101-010",  # mangled prefix
+            "LOT-20260101-00",  # one edit from both -001 and -010
+            "LOT-20260102-001",  # exact, but a different date block
+            "LOT-20260105-0007",  # nothing known on that date
+            None,
+        ]
+    )
+    normalized = normalizer.normalize(raw)
+    assert normalized.tolist() == [
+        "LOT-20260101-001",
+        "LOT-20260101-010",
+        "LOT-20260101-001",
+        "LOT-20260101-001",
+        "LOT-20260101-010",
+        pd.NA,
+        "LOT-20260102-001",
+        pd.NA,
+        pd.NA,
+    ]
+    statuses = normalizer.resolutions().set_index("raw_lot_id")["lot_id_status"]
+    assert statuses["LOT-2O260101-001"] == "Near duplicate"
+    assert statuses["LOT-20260101-00"] == "Indeterminate"
+    assert len(statuses) == 8
+
+    # A later batch that introduces the lot resolves the earlier Indeterminate ID.
+    assert normalizer.normalize(pd.Series(["LOT-20260105-007"])).tolist() == ["LOT-20260105-007"]
+    assert normalizer.normalize(pd.Series(["LOT-20260105-0007"])).tolist() == ["LOT-20260105-007"]
+    assert LotIdNormalizer(["LOT-20260105-007"]).normalize(pd.Series(["L0T-2026O105-007"])).tolist() == [
+        "LOT-20260105-007"
+    ]
+
+
+def test_ingest_sample_exports_matches_seed_rows() -> None:
+    """Sample exports ingest with day-first order sniffed per file."""
+    result = ingest_directory(SAMPLE_DIR, workers=1)
+    assert list(result.inspections.columns[: len(INSPECTION_EVENT_COLUMNS)]) == INSPECTION_EVENT_COLUMNS
+    assert set(result.lot_ids["lot_id_status"]) == {"Exact"}
+    assert result.inspections["event_id"].is_unique
+    assert result.skipped_files == []
+    # Weekly log "05-01-2026 16:40" is day-first; seed.sql records the same event.
+    weld = result.inspections[
+        (result.inspections["normalized_lot_id"] == "LOT-20251231-002") & (result.inspections["defect_id"] == "WELD")
+    ]
+    assert weld["inspection_timestamp"].tolist() == [pd.Timestamp("2026-01-05 16:40:00")]
+    assert not classify_defects(result.inspections).empty
+
+
+def test_ingest_parallel_matches_serial() -> None:
+    """Process-pool parsing yields exactly the serial result."""
+    serial = ingest_directory(SAMPLE_DIR, workers=1)
+    parallel = ingest_directory(SAMPLE_DIR, workers=2)
+    pd.testing.assert_frame_equal(serial.inspections, parallel.inspections)
+    pd.testing.assert_frame_equal(serial.production_runs, parallel.production_runs)
+    pd.testing.assert_frame_equal(serial.shipments, parallel.shipments)
+
+
+def test_ingest_flags_indeterminate_rows_and_unknown_files(tmp_path: Path) -> None:
+    """Bad lot IDs and dates are reported instead of aborting ingestion."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Ship Date", "Lot ID", "Customer", "Qty Shipped", "Ship Status"])
+    sheet.append(["01/05/2026", "LOT-20260101-001", "Acme Rail", 10.0, "Shipped"])
+    sheet.append(["01/06/2026", "PALLET-7", "Acme Rail", 5.0, "Shipped"])
+    sheet.append(["01/07/2026", "LOT-2O260101-001", "Acme Rail", 2.0, "Shipped"])
+    sheet.append(["not a date", "LOT-20260101-002", "Acme Rail", 5.0, "Shipped"])
+    sheet.append([None, None, None, None, None])
+    workbook.save(tmp_path / "shipping.xlsx")
+
+    other = Workbook()
+    other.active.append(["Unrelated", "Headers"])
+    other.save(tmp_path / "other.xlsx")
+
+    result = ingest_directory(tmp_path, workers=1)
+    # The mistyped "2O26" row is a near-duplicate of the lot on the first row.
+    assert result.shipments["normalized_lot_id"].tolist() == ["LOT-20260101-001", "LOT-20260101-001"]
+    statuses = result.lot_ids.set_index("raw_lot_id")["lot_id_status"]
+    assert (statuses["LOT-2O260101-001"], statuses["PALLET-7"]) == ("Near duplicate", "Indeterminate")
+    assert sorted(result.indeterminate["reason"]) == ["unparseable ship_date", "unrecognized lot ID"]
+    assert result.skipped_files == ["other.xlsx"]
+    assert result.inspections.empty
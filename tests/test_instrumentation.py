@@ -0,0 +1,84 @@
+"""Tests for stage timing and profiling instrumentation."""
+
+from __future__ import annotations
+
+import json
+import logging
+
+import pytest
+
+from steelworks_defect.analysis import classify_defects, drill_down_defect
+from steelworks_defect.instrumentation import PerformanceRecorder, stage
+from test_analysis import _build_events
+
+
+def test_stages_nest_in_start_order_and_accept_late_row_counts() -> None:
+    """Stages record depth, rows and wall time; outside a recorder they are no-ops."""
+    with stage("outside") as timing:
+        timing.rows = 3
+
+    recorder = PerformanceRecorder()
+    with recorder.activate():
+        with stage("outer", rows=10):
+            with stage("inner") as timing:
+                timing.rows = 4
+        with stage("sibling"):
+            pass
+
+    breakdown = recorder.breakdown()
+    assert breakdown["stage"].tolist() == ["outer", "inner", "sibling"]
+    assert breakdown["depth"].tolist() == [0, 1, 0]
+    assert breakdown["rows"].tolist()[:2] == [10, 4]
+    assert (breakdown["seconds"] >= 0).all() and recorder.total_seconds >= breakdown["seconds"].iloc[0]
+    assert breakdown["peak_bytes"].isna().all()
+
+
+def test_classification_and_drill_down_report_their_stages() -> None:
+    """classify_defects and drill_down_defect expose their internal stages."""
+    events = _build_events()
+    recorder = PerformanceRecorder()
+    with recorder.activate():
+        classify_defects(events)
+        drill_down_defect(events, "BURR")
+
+    stages = recorder.breakdown()["stage"].tolist()
+    assert stages == [
+        "classify.normalize",
+        "classify.groupby",
+        "classify.missing_weeks",
+        "classify.finalize",
+        "drill_down.select",
+        "drill_down.missing_weeks",
+    ]
+    assert recorder.timings[0].rows == len(events)
+
+
+def test_profile_modes_capture_memory_profile_and_structured_log(caplog: pytest.LogCaptureFixture) -> None:
+    """tracemalloc peaks propagate to parents; cProfile text and JSON log are produced."""
+    recorder = PerformanceRecorder(profile_mode="tracemalloc")
+    with recorder.activate():
+        with stage("outer"):
+            with stage("allocate"):
+                payload = bytearray(2_000_000)
+            del payload
+    outer, allocate = recorder.timings
+    # peak_bytes is net growth over the stage's start reading. Temporaries of
+    # entering the stage (the reading's own tuple, context-manager frames) are
+    # counted in that reading and freed before the body runs, so a 2 MB
+    # allocation can read a few dozen bytes short; 1 KiB bounds that slack.
+    assert allocate.peak_bytes >= 2_000_000 - 1_024
+    assert outer.peak_bytes >= allocate.peak_bytes
+
+    profiled = PerformanceRecorder(profile_mode="cprofile")
+    with profiled.activate():
+        classify_defects(_build_events())
+    assert "classify_defects" in profiled.profile_text
+
+    with caplog.at_level(logging.INFO, logger="steelworks_defect.performance"):
+        profiled.log()
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["profile_mode"] == "cprofile"
+    assert [item["stage"] for item in record["stages"]][0] == "classify.normalize"
+
+    with pytest.raises(ValueError):
+        PerformanceRecorder(profile_mode="perf")
@@ -0,0 +1,93 @@
+"""Tests for the COPY-based bulk loader."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from steelworks_defect.analysis import classify_defect_summary, classify_defects
+from steelworks_defect.db import fetch_defect_summary, fetch_inspection_events
+from steelworks_defect.ingest import ingest_directory
+from steelworks_defect.ingest.cli import main as ingest_main
+from steelworks_defect.loader import (
+    LoadReport,
+    _defect_type_rows,
+    _lot_master_rows,
+    load_ingest_result,
+    read_load_source,
+)
+
+
+SAMPLE_DIR = Path(__file__).resolve().parents[1] / "data" / "sample"
+
+
+def test_lot_master_rows_prefer_production_part_and_earliest_date() -> None:
+    """Lots take the production log's part number and the earliest date seen."""
+    result = ingest_directory(SAMPLE_DIR, workers=1)
+    lots = _lot_master_rows(result).set_index("normalized_lot_id")
+    assert lots.index.is_unique
+    assert lots["part_number"].notna().all()
+
+    production = result.production_runs.drop_duplicates("normalized_lot_id").set_index("normalized_lot_id")
+    shared = production.index.intersection(lots.index)
+    assert (lots.loc[shared, "part_number"] == production.loc[shared, "part_number"]).all()
+    assert (pd.to_datetime(lots.loc[shared, "production_date"]) <= production.loc[shared, "production_date"]).all()
+
+
+def test_defect_type_rows_use_most_frequent_valid_severity() -> None:
+    """Invalid severities are dropped and ties resolve to the first frequent value."""
+    inspections = pd.DataFrame(
+        {
+            "defect_id": ["BURR", "BURR", "BURR", "SCRATCH", None],
+            "severity": ["Minor", "Major", "Minor", "Unknown", "Minor"],
+        }
+    )
+    rows = _defect_type_rows(inspections).set_index("defect_id")["severity"]
+    assert rows["BURR"] == "Minor"
+    assert pd.isna(rows["SCRATCH"])
+    assert len(rows) == 2
+
+
+def test_read_load_source_round_trips_ingest_csvs(tmp_path: Path) -> None:
+    """CSVs written by ``ingest --output-dir`` load back to the same rows."""
+    ingest_main([str(SAMPLE_DIR), "--workers", "1", "--output-dir", str(tmp_path)])
+    from_csv = read_load_source(tmp_path)
+    from_xlsx = read_load_source(SAMPLE_DIR)
+    assert len(from_csv.inspections) == len(from_xlsx.inspections)
+    assert len(from_csv.shipments) == len(from_xlsx.shipments)
+    pd.testing.assert_series_equal(
+        from_csv.inspections["inspection_timestamp"], from_xlsx.inspections["inspection_timestamp"]
+    )
+
+    with pytest.raises(ValueError, match="Unsupported load source"):
+        read_load_source(tmp_path / "inspections.parquet")
+
+
+def test_load_report_rates() -> None:
+    """Rejected counts and throughput derive from staged/upserted totals."""
+    report = LoadReport(staged={"lot": 10, "shipment": 30}, upserted={"lot": 10, "shipment": 25}, elapsed_seconds=2.0)
+    assert report.rejected == {"lot": 0, "shipment": 5}
+    assert report.rows_per_second == 20.0
+
+
+def test_bulk_load_is_idempotent_and_matches_pandas(pg_engine) -> None:
+    """Loading twice upserts the same rows; SQL and pandas summaries agree."""
+    source = ingest_directory(SAMPLE_DIR, workers=1)
+    count_sql = text("SELECT COUNT(*) FROM operations.inspection_event")
+
+    first = load_ingest_result(pg_engine, source, batch_size=50)
+    with pg_engine.connect() as connection:
+        first_count = connection.execute(count_sql).scalar_one()
+    second = load_ingest_result(pg_engine, source, batch_size=50)
+    with pg_engine.connect() as connection:
+        second_count = connection.execute(count_sql).scalar_one()
+
+    assert first.staged == second.staged
+    assert 0 < first_count == second_count <= first.staged["inspection_event"]
+
+    expected = classify_defects(fetch_inspection_events(pg_engine))
+    actual = classify_defect_summary(fetch_defect_summary(pg_engine))
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
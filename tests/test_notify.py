@@ -0,0 +1,104 @@
+"""Tests for the data-version counter and its change-notification listener."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+from sqlalchemy import event, text
+
+from steelworks_defect.benchmark import _load_events
+from steelworks_defect.cache import DashboardCache
+from steelworks_defect.db import fetch_defect_summary, get_data_version, probe_data_version, refresh_defect_summary
+from steelworks_defect.notify import DataVersionListener, data_version_probe
+from steelworks_defect.synthetic import generate_inspection_history
+
+
+def test_data_version_probe_selects_source() -> None:
+    """Each DATA_VERSION_SOURCE maps to its probe; notify needs a listener."""
+    listener = DataVersionListener("postgresql+psycopg://localhost:1/unused")
+    assert data_version_probe("probe") is probe_data_version
+    assert data_version_probe("counter") is get_data_version
+    assert data_version_probe("notify", listener) == listener.probe
+    with pytest.raises(ValueError):
+        data_version_probe("notify")
+    with pytest.raises(ValueError):
+        data_version_probe("poll")
+
+
+def test_listener_reports_each_new_version_once() -> None:
+    """Stale notifications and reconnects to unchanged data do not fire subscribers."""
+    listener = DataVersionListener("postgresql+psycopg://localhost:1/unused")
+    seen: list[int] = []
+    listener.subscribe(seen.append)
+
+    listener._set_version(3)
+    listener._set_version(5)
+    listener._set_version(4)
+    assert listener.version == 5
+    # Disconnect, then reconnect to the same counter value.
+    listener._set_version(None)
+    assert listener.version is None
+    listener._set_version(5)
+    listener._set_version(6)
+    assert seen == [3, 5, 6]
+    assert listener.wait_for(lambda version: version == 6, timeout=0)
+
+
+def test_listener_keeps_cache_warm_until_a_load_commits(pg_engine) -> None:
+    """Postgres: cache hits issue no SQL; a committed load bumps, notifies and clears."""
+    events = generate_inspection_history(500, lots=20, defect_codes=4, weeks=6, seed=2)
+    listener = DataVersionListener(pg_engine.url.render_as_string(hide_password=False), poll_seconds=0.1).start()
+    try:
+        assert listener.wait_for(lambda version: version is not None, timeout=10)
+        start = listener.version
+        assert start == get_data_version(pg_engine)
+
+        cache = DashboardCache(probe=listener.probe)
+        cleared = threading.Event()
+        listener.subscribe(lambda version: (cache.clear(), cleared.set()))
+        loads: list[int] = []
+        assert cache.get_or_load("rows", pg_engine, lambda engine: loads.append(1) or len(loads)) == 1
+
+        statements: list[str] = []
+        event.listen(pg_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        assert cache.get_or_load("rows", pg_engine, lambda engine: loads.append(1) or len(loads)) == 1
+        assert statements == []
+
+        # Reads do not bump the counter; every write statement does.
+        with pg_engine.begin() as connection:
+            connection.execute(text("SELECT COUNT(*) FROM operations.inspection_event"))
+        assert get_data_version(pg_engine) == start
+        _load_events(pg_engine, events)
+        current = get_data_version(pg_engine)
+        assert current > start
+
+        assert listener.wait_for(lambda version: version == current, timeout=10)
+        assert cleared.wait(10)
+        assert cache.get_or_load("rows", pg_engine, lambda engine: loads.append(1) or len(loads)) == 2
+    finally:
+        listener.stop(timeout=5)
+
+
+@pytest.mark.parametrize("probe", [probe_data_version, get_data_version])
+def test_refresh_invalidates_summary_cached_between_load_and_refresh(pg_engine, probe) -> None:
+    """Postgres: a view read after the load commits but before the refresh is not kept."""
+    _load_events(pg_engine, generate_inspection_history(500, lots=20, defect_codes=4, weeks=6, seed=3))
+    cache = DashboardCache(probe=probe)
+
+    # The load's batches commit (bumping the version) before the view is refreshed.
+    with pg_engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO operations.inspection_event "
+                "(lot_id, inspector_id, defect_type_id, inspection_timestamp, qty_checked, qty_defects) "
+                "SELECT lot_id, inspector_id, defect_type_id, inspection_timestamp + INTERVAL '70 days', "
+                "qty_checked, qty_defects FROM operations.inspection_event"
+            )
+        )
+    stale = cache.get_or_load("summary", pg_engine, fetch_defect_summary)
+
+    refresh_defect_summary(pg_engine)
+    fresh = cache.get_or_load("summary", pg_engine, fetch_defect_summary)
+    assert not fresh.equals(stale)
+    assert fresh.equals(fetch_defect_summary(pg_engine))
@@ -0,0 +1,33 @@
+"""Tests for the sharded, process-parallel classification engine."""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from steelworks_defect.analysis import classify_defects
+from steelworks_defect.parallel import classify_defects_parallel
+from steelworks_defect.synthetic import generate_inspection_history
+from test_analysis import _build_events, _build_random_events
+
+
+def test_ac1_ac9_parallel_classification_matches_serial_engine() -> None:
+    """AC1-AC9: sharded results merge to exactly the serial summary and order."""
+    for seed in range(3):
+        events = _build_random_events(seed)
+        pd.testing.assert_frame_equal(classify_defects_parallel(events, workers=3), classify_defects(events))
+    pd.testing.assert_frame_equal(classify_defects_parallel(_build_events(), workers=2), classify_defects(_build_events()))
+
+
+def test_parallel_matches_serial_on_synthetic_history() -> None:
+    """More defect codes than shards, with gaps and zero-defect rows."""
+    events = generate_inspection_history(20_000, lots=500, defect_codes=40, weeks=52, seed=11)
+    pd.testing.assert_frame_equal(classify_defects_parallel(events, workers=4), classify_defects(events))
+
+
+def test_parallel_handles_empty_input_and_rejects_bad_worker_count() -> None:
+    """AC5: empty results keep stable columns; non-positive workers are invalid."""
+    zero_only = _build_events().assign(qty_defects=0)
+    pd.testing.assert_frame_equal(classify_defects_parallel(zero_only, workers=2), classify_defects(zero_only))
+    with pytest.raises(ValueError):
+        classify_defects_parallel(_build_events(), workers=0)
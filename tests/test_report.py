@@ -0,0 +1,67 @@
+"""Tests for the headless batch report."""
+
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from conftest import load_events
+from steelworks_defect.analysis import classify_defects, recurring_mask
+from steelworks_defect.benchmark import _load_events
+from steelworks_defect.db import DefectFilters, fetch_filtered_defect_events, iter_analysis_event_chunks
+from steelworks_defect.report import build_report, main, write_report_files
+from steelworks_defect.synthetic import generate_inspection_history
+from test_db import _build_db_events
+
+
+def test_report_matches_filtered_classification_and_round_trips_files(sqlite_engine, tmp_path: Path) -> None:
+    """Streamed report == classify_defects on the window; files read back intact."""
+    load_events(sqlite_engine, _build_db_events(5))
+    window = DefectFilters(start=date(2026, 1, 10), end=date(2026, 2, 20))
+    events = fetch_filtered_defect_events(sqlite_engine, window)
+
+    report = build_report(sqlite_engine, window, chunksize=7)
+    pd.testing.assert_frame_equal(report.summary.drop(columns="drill_down_message"), classify_defects(events))
+    recurring = set(report.summary.loc[recurring_mask(report.summary), "defect_id"])
+    assert set(report.drill_downs["defect_id"]) == recurring
+    assert len(report.drill_downs) == events["defect_id"].isin(recurring).sum()
+    assert report.summary["drill_down_message"].notna().sum() == len(recurring)
+
+    for output_format in ("csv", "parquet"):
+        summary_path, drill_path = write_report_files(report, tmp_path / output_format, output_format)
+        reader = pd.read_csv if output_format == "csv" else pd.read_parquet
+        assert reader(summary_path)["defect_id"].tolist() == report.summary["defect_id"].tolist()
+        assert len(reader(drill_path)) == len(report.drill_downs)
+
+    assert build_report(sqlite_engine, window, drill_downs="none").drill_downs.empty
+    with pytest.raises(ValueError):
+        build_report(sqlite_engine, drill_downs="some")
+
+
+def test_stream_honors_dimension_filters(sqlite_engine) -> None:
+    """Filtered streaming returns the filtered fetch's rows that carry a defect code."""
+    load_events(sqlite_engine, _build_db_events(6))
+    filters = DefectFilters(inspector_name="M. Patel", end=date(2026, 2, 1))
+    streamed = pd.concat(iter_analysis_event_chunks(sqlite_engine, chunksize=10, filters=filters))
+    expected = fetch_filtered_defect_events(sqlite_engine, filters).dropna(subset=["defect_id"])
+    assert sorted(streamed["event_id"]) == sorted(expected["event_id"])
+
+
+def test_cli_writes_postgres_results(pg_engine, monkeypatch, capsys) -> None:
+    """Postgres: --format postgres bulk-writes one run with its summary and drill-downs."""
+    _load_events(pg_engine, generate_inspection_history(4_000, lots=120, defect_codes=6, weeks=16, seed=9))
+    monkeypatch.setenv("DATABASE_URL", pg_engine.url.render_as_string(hide_password=False))
+    main(["--format", "postgres", "--drill-downs", "all", "--chunk-size", "500"])
+    output = capsys.readouterr().out
+    assert "report.classify" in output and "rows/sec" in output
+
+    with pg_engine.connect() as connection:
+        run = connection.execute(text("SELECT run_id, event_rows FROM operations.defect_report_run")).one()
+        summary_rows = connection.execute(text("SELECT COUNT(*) FROM operations.defect_report_summary")).scalar()
+        drill_rows = connection.execute(text("SELECT COUNT(*) FROM operations.defect_report_drill_down")).scalar()
+    assert summary_rows == 6
+    assert drill_rows == run.event_rows > 0
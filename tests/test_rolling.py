@@ -0,0 +1,100 @@
+"""Tests for rolling (trailing-window) recurrence classification."""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from steelworks_defect.analysis import _week_ordinals, classify_defects
+from steelworks_defect.event_store import EventStore
+from steelworks_defect.rolling import NO_RECENT_DEFECTS, rolling_recurrence, status_transitions
+from steelworks_defect.synthetic import generate_inspection_history
+from test_analysis import _build_events, _build_random_events
+
+
+def _brute_force_timeline(events: pd.DataFrame, window_weeks: int) -> pd.DataFrame:
+    """Classify each week's trailing window from scratch with ``classify_defects``."""
+    timestamps = pd.to_datetime(events["inspection_timestamp"], errors="coerce")
+    ordinals = _week_ordinals(timestamps)
+    defect_rows = (pd.to_numeric(events["qty_defects"], errors="coerce").fillna(0) > 0) & events["defect_id"].notna()
+    last_week = int(ordinals[defect_rows].max())
+    first_week = int(ordinals[defect_rows].min())
+
+    rows = []
+    for week in range(first_week, last_week + 1):
+        in_window = (ordinals > week - window_weeks) & (ordinals <= week)
+        summary = classify_defects(events[in_window.fillna(False).to_numpy()])
+        for record in summary.to_dict("records"):
+            counts = (record["impacted_lot_count"], record["weeks_with_defects"], record["trend_classification"])
+            rows.append((record["defect_id"], record["severity"], week, *counts))
+    return pd.DataFrame(rows, columns=["defect_id", "severity", "week", "lots", "weeks", "status"])
+
+
+def test_rolling_timeline_matches_per_week_classification() -> None:
+    """AC1/AC2: every non-empty window equals a from-scratch classification."""
+    synthetic = generate_inspection_history(3_000, lots=60, defect_codes=5, weeks=20, gap_ratio=0.3, seed=9)
+    cases = [(_build_random_events(0), 1), (_build_random_events(1), 2), (synthetic, 3), (synthetic, 8)]
+    for events, window_weeks in cases:
+        timeline = rolling_recurrence(events, window_weeks=window_weeks)
+        active = timeline[timeline["trend_classification"] != NO_RECENT_DEFECTS]
+        expected = _brute_force_timeline(events, window_weeks)
+
+        week_index = (active["week_start"] - pd.Timestamp("1970-01-06")).dt.days // 7
+        actual = pd.DataFrame(
+            {
+                "defect_id": active["defect_id"].astype(object),
+                "severity": active["severity"].astype(object).where(active["severity"].notna(), None),
+                "week": week_index.to_numpy(),
+                "lots": active["impacted_lot_count"].to_numpy(),
+                "weeks": active["weeks_with_defects"].to_numpy(),
+                "status": active["trend_classification"].to_numpy(),
+            }
+        )
+        expected["severity"] = expected["severity"].astype(object).where(expected["severity"].notna(), None)
+        key = ["defect_id", "severity", "week"]
+        pd.testing.assert_frame_equal(
+            actual.sort_values(key, na_position="last").reset_index(drop=True),
+            expected.sort_values(key, na_position="last").reset_index(drop=True),
+            check_dtype=False,
+        )
+
+
+def test_rolling_timeline_records_transitions_and_decay() -> None:
+    """A defect becomes recurring, then decays once it leaves the window."""
+    events = pd.DataFrame(
+        {
+            "defect_id": ["CRK"] * 3,
+            "severity": ["Critical"] * 3,
+            "normalized_lot_id": ["L1", "L2", "L2"],
+            "inspection_timestamp": ["2026-01-06", "2026-01-13", "2026-02-24"],
+            "qty_defects": [1, 2, 1],
+        }
+    )
+    timeline = rolling_recurrence(events, window_weeks=2)
+
+    assert timeline["week_start"].min() == pd.Timestamp("2026-01-06")
+    assert timeline["week_start"].max() == pd.Timestamp("2026-02-24")
+    transitions = status_transitions(timeline)
+    assert transitions["trend_classification"].tolist() == [
+        "Isolated Incident",
+        "Recurring - Critical",
+        "Isolated Incident",
+        NO_RECENT_DEFECTS,
+        "Isolated Incident",
+    ]
+    assert transitions["previous_classification"].tolist()[:2] == [None, "Isolated Incident"]
+    recurring_week = timeline[timeline["week_start"] == pd.Timestamp("2026-01-13")].iloc[0]
+    assert recurring_week["impacted_lot_count"] == 2
+    assert recurring_week["total_defects"] == 3
+
+
+def test_rolling_timeline_accepts_event_store_and_validates_input() -> None:
+    """EventStore input is equivalent; empty input and bad windows are handled."""
+    events = generate_inspection_history(5_000, lots=200, defect_codes=8, weeks=30, seed=4)
+    pd.testing.assert_frame_equal(
+        rolling_recurrence(EventStore.from_frame(events), window_weeks=6),
+        rolling_recurrence(events, window_weeks=6),
+    )
+    assert rolling_recurrence(_build_events().assign(qty_defects=0)).empty
+    with pytest.raises(ValueError):
+        rolling_recurrence(_build_events(), window_weeks=0)
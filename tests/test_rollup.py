@@ -0,0 +1,59 @@
+"""Tests for weekly rollup classification and the trigger-maintained rollup table."""
+
+from __future__ import annotations
+
+import pandas as pd
+from sqlalchemy import text
+
+from steelworks_defect.analysis import classify_defects
+from steelworks_defect.benchmark import _load_events
+from steelworks_defect.db import fetch_defect_week_rollup, fetch_inspection_events, refresh_defect_week_rollup
+from steelworks_defect.event_store import EventStore
+from steelworks_defect.rollup import classify_rollup, rollup_events
+from steelworks_defect.synthetic import generate_inspection_history
+from test_analysis import _build_events, _build_random_events
+
+
+def test_ac1_ac9_rollup_classification_matches_event_engine() -> None:
+    """AC1-AC9: classifying rollup cells equals classifying the raw events."""
+    for seed in range(4):
+        events = _build_random_events(seed)
+        pd.testing.assert_frame_equal(classify_rollup(rollup_events(events)), classify_defects(events))
+    pd.testing.assert_frame_equal(classify_rollup(rollup_events(_build_events())), classify_defects(_build_events()))
+
+
+def test_rollup_is_much_smaller_and_accepts_event_store() -> None:
+    """Cells collapse repeated (defect, week, lot) events; EventStore input is equivalent."""
+    events = generate_inspection_history(50_000, lots=300, defect_codes=10, weeks=52, seed=3)
+    cells = rollup_events(events)
+    assert len(cells) < len(events) / 2
+    assert cells["event_count"].sum() == (events["qty_defects"] > 0).sum()
+    pd.testing.assert_frame_equal(rollup_events(EventStore.from_frame(events)), cells)
+    pd.testing.assert_frame_equal(classify_rollup(cells), classify_defects(events))
+    assert classify_rollup(rollup_events(_build_events().assign(qty_defects=0))).empty
+
+
+def test_triggers_keep_rollup_current_through_upserts_and_deletes(pg_engine) -> None:
+    """Postgres: loads, re-delivered upserts and deletes keep the rollup exact."""
+    events = generate_inspection_history(5_000, lots=150, defect_codes=8, weeks=20, seed=5)
+    _load_events(pg_engine, events)
+    # A re-delivered export takes the ON CONFLICT DO UPDATE path.
+    _load_events(pg_engine, events.assign(qty_defects=events["qty_defects"].clip(upper=1)))
+
+    def assert_rollup_matches_events() -> None:
+        expected = classify_defects(fetch_inspection_events(pg_engine))
+        pd.testing.assert_frame_equal(classify_rollup(fetch_defect_week_rollup(pg_engine)), expected)
+
+    assert_rollup_matches_events()
+    with pg_engine.begin() as connection:
+        connection.execute(text("UPDATE operations.inspection_event SET qty_defects = 0 WHERE id % 3 = 0"))
+        connection.execute(
+            text("UPDATE operations.inspection_event SET inspection_timestamp = inspection_timestamp + INTERVAL '9 days' WHERE id % 5 = 0")
+        )
+        connection.execute(text("DELETE FROM operations.inspection_event WHERE id % 7 = 0"))
+    assert_rollup_matches_events()
+
+    with pg_engine.begin() as connection:
+        connection.execute(text("DELETE FROM operations.defect_week_rollup"))
+    assert refresh_defect_week_rollup(pg_engine) > 0
+    assert_rollup_matches_events()
@@ -0,0 +1,94 @@
+"""Tests for HyperLogLog lot sketches and approximate classification."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from steelworks_defect.analysis import classify_defects
+from steelworks_defect.event_store import EventStore
+from steelworks_defect.rollup import rollup_events
+from steelworks_defect.sketch import (
+    LotSketch,
+    classify_defects_approximate,
+    hash_lots,
+    merge_weekly_sketches,
+    precision_for_error,
+    weekly_lot_sketches,
+)
+from steelworks_defect.synthetic import generate_inspection_history
+from test_analysis import _build_events, _build_random_events
+
+
+def _lot_hashes(start: int, stop: int) -> np.ndarray:
+    """Hash synthetic lot IDs ``LOT-start`` .. ``LOT-(stop-1)``."""
+    return hash_lots(np.array([f"LOT-{index}" for index in range(start, stop)], dtype=object))
+
+
+def test_sketch_is_exact_when_small_and_within_error_when_dense() -> None:
+    """Sparse sketches count exactly; dense estimates stay within a few standard errors."""
+    small = LotSketch.from_hashes(np.concatenate([_lot_hashes(0, 2), _lot_hashes(0, 2)]), precision=12)
+    assert small.is_exact and small.count() == 2
+
+    precision = precision_for_error(0.02)
+    large = LotSketch.from_hashes(_lot_hashes(0, 50_000), precision=precision)
+    assert not large.is_exact
+    assert abs(large.count() - 50_000) / 50_000 < 4 * large.relative_error
+    assert large.to_bytes().__len__() <= (1 << precision) + 8
+
+    with pytest.raises(ValueError):
+        precision_for_error(0.0)
+
+
+def test_sketches_merge_losslessly_and_round_trip_bytes() -> None:
+    """Merging equals sketching the union; serialization preserves both modes."""
+    for precision, sizes in [(12, (100, 150)), (10, (2_000, 3_000))]:
+        left = LotSketch.from_hashes(_lot_hashes(0, sizes[0]), precision)
+        right = LotSketch.from_hashes(_lot_hashes(sizes[0] // 2, sizes[1]), precision)
+        union = LotSketch.from_hashes(_lot_hashes(0, sizes[1]), precision)
+        merged = left.merge(right)
+        assert merged.count() == union.count()
+        restored = LotSketch.from_bytes(merged.to_bytes())
+        assert restored.is_exact == merged.is_exact and restored.count() == merged.count()
+
+    with pytest.raises(ValueError):
+        LotSketch.from_hashes(_lot_hashes(0, 3), 10).merge(LotSketch.from_hashes(_lot_hashes(0, 3), 12))
+    with pytest.raises(ValueError):
+        LotSketch.from_bytes(b"nope")
+
+
+def test_approximate_classification_keeps_statuses_and_bounds_lot_error() -> None:
+    """AC1/AC2: statuses match the exact engine; large lot counts are close."""
+    for seed in range(3):
+        events = _build_random_events(seed)
+        pd.testing.assert_frame_equal(
+            classify_defects_approximate(events).drop(columns="impacted_lot_count"),
+            classify_defects(events).drop(columns="impacted_lot_count"),
+        )
+    pd.testing.assert_frame_equal(classify_defects_approximate(_build_events()), classify_defects(_build_events()))
+
+    events = generate_inspection_history(60_000, lots=20_000, defect_codes=5, weeks=52, seed=2)
+    exact = classify_defects(events).set_index("defect_id")
+    approximate = classify_defects_approximate(EventStore.from_frame(events), relative_error=0.02).set_index("defect_id")
+    relative = (approximate["impacted_lot_count"] - exact["impacted_lot_count"]).abs() / exact["impacted_lot_count"]
+    assert (relative < 0.08).all()
+    assert (approximate["trend_classification"] == exact["trend_classification"]).all()
+
+
+def test_weekly_sketches_persist_and_merge_into_windows(tmp_path: Path) -> None:
+    """Per-week sketches stored as Parquet merge into exact small-window counts."""
+    events = generate_inspection_history(20_000, lots=400, defect_codes=6, weeks=20, seed=7)
+    cells = rollup_events(events)
+    weekly = weekly_lot_sketches(cells, precision=12)
+    weekly.to_parquet(tmp_path / "weekly_lot_sketches.parquet")
+    stored = pd.read_parquet(tmp_path / "weekly_lot_sketches.parquet")
+
+    start, end = stored["week_start"].sort_values().iloc[[3, 8]]
+    merged = merge_weekly_sketches(stored, start=start, end=end).set_index("defect_id")
+    window = cells[(cells["week_start"] >= start) & (cells["week_start"] <= end)]
+    expected = window.groupby("defect_id")["normalized_lot_id"].nunique()
+    assert merged["lot_count_exact"].all()
+    assert merged["impacted_lot_count"].to_dict() == expected.to_dict()
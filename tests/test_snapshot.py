@@ -0,0 +1,77 @@
+"""Tests for the week-partitioned Parquet event snapshot."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import text
+
+from conftest import load_events
+from steelworks_defect.db import fetch_inspection_events
+from steelworks_defect.snapshot import EventSnapshot
+from test_db import _build_db_events
+
+
+# Copies the first rows one day later so new IDs arrive above the watermark.
+_INSERT_LATER_ROWS = """
+    INSERT INTO operations.inspection_event
+        (lot_id, inspector_id, defect_type_id, inspection_timestamp, qty_checked, qty_defects, disposition, notes)
+    SELECT lot_id, inspector_id, defect_type_id, datetime(inspection_timestamp, '+1 day'),
+           qty_checked, qty_defects, disposition, notes
+    FROM operations.inspection_event
+    WHERE id <= :limit
+"""
+
+
+def test_snapshot_cold_start_then_fetches_only_newer_rows(sqlite_engine, tmp_path: Path) -> None:
+    """First sync builds week partitions; later syncs append the delta."""
+    load_events(sqlite_engine, _build_db_events(seed=2))
+    snapshot = EventSnapshot(tmp_path / "events")
+
+    pd.testing.assert_frame_equal(snapshot.sync(sqlite_engine), fetch_inspection_events(sqlite_engine))
+    assert any(path.name.startswith("iso_week=") for path in (tmp_path / "events").iterdir())
+    first = snapshot.manifest()
+
+    with sqlite_engine.begin() as connection:
+        connection.execute(text(_INSERT_LATER_ROWS), {"limit": 15})
+    synced = snapshot.sync(sqlite_engine)
+    pd.testing.assert_frame_equal(synced, fetch_inspection_events(sqlite_engine))
+    assert snapshot.manifest().row_count == first.row_count + 15
+    assert list(snapshot.load(columns=["defect_id"]).columns) == ["event_id", "defect_id"]
+
+
+def test_snapshot_rebuilds_after_deletes(sqlite_engine, tmp_path: Path) -> None:
+    """A lower row count than the manifest means rows were deleted upstream."""
+    load_events(sqlite_engine, _build_db_events(seed=3))
+    snapshot = EventSnapshot(tmp_path / "events")
+    snapshot.sync(sqlite_engine)
+
+    with sqlite_engine.begin() as connection:
+        connection.execute(text("DELETE FROM operations.inspection_event WHERE id IN (2, 5)"))
+    pd.testing.assert_frame_equal(snapshot.sync(sqlite_engine), fetch_inspection_events(sqlite_engine))
+
+
+def test_snapshot_ignores_parts_above_manifest_watermark(sqlite_engine, tmp_path: Path) -> None:
+    """Parts from an append that never committed its manifest stay invisible."""
+    load_events(sqlite_engine, _build_db_events(seed=4))
+    events = fetch_inspection_events(sqlite_engine)
+    snapshot = EventSnapshot(tmp_path / "events")
+    snapshot.rebuild(events.iloc[:100])
+
+    # Simulate a crash after writing parts but before replacing the manifest.
+    EventSnapshot._write_parts(snapshot.directory, events.iloc[100:], tag="crashed")
+    pd.testing.assert_frame_equal(snapshot.load(), events.iloc[:100])
+
+
+def test_snapshot_rebuilds_after_in_place_update(sqlite_engine, tmp_path: Path) -> None:
+    """A rewrite keeps ids and row count, so only the rewrite counter reveals it."""
+    load_events(sqlite_engine, _build_db_events(seed=5))
+    snapshot = EventSnapshot(tmp_path / "events")
+    snapshot.sync(sqlite_engine)
+    first = snapshot.manifest()
+
+    with sqlite_engine.begin() as connection:
+        connection.execute(text("UPDATE operations.inspection_event SET qty_defects = 0 WHERE id <= 10"))
+    pd.testing.assert_frame_equal(snapshot.sync(sqlite_engine), fetch_inspection_events(sqlite_engine))
+    assert snapshot.manifest().rewrite_version > first.rewrite_version